@@ -4,10 +4,29 @@ Enhances the presentation of AI-generated analysis
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 import logging
-from PySide6.QtGui import QTextCursor, QColor, QTextCharFormat
-from PySide6.QtWidgets import QTextEdit
+
+from instrumentation import timed
+
+# Qt is only needed for type hints; keep the formatter importable headless
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QTextEdit
+
+# Keyword class -> highlight color, matched together in one pass by highlight_keywords
+_KEYWORD_COLORS = {
+    'positive': "#4CAF50",    # Green
+    'negative': "#F44336",    # Red
+    'neutral': "#FFD700",     # Yellow
+    'technical': "#BB86FC"    # Purple
+}
+_KEYWORD_PATTERN = re.compile(
+    r'\b(?:(?P<positive>buy|bullish|uptrend|growth|increase|positive|strong|opportunity)'
+    r'|(?P<negative>sell|bearish|downtrend|decline|decrease|negative|weak|risk)'
+    r'|(?P<neutral>hold|neutral|sideways|consolidation|cautious|monitor|watch)'
+    r'|(?P<technical>resistance|support|moving average|MACD|RSI|volume|indicator))\b',
+    re.IGNORECASE
+)
 
 class AnalysisFormatter:
     """Format AI analysis text with enhanced formatting and structure"""
@@ -23,29 +42,10 @@ class AnalysisFormatter:
     @staticmethod
     def highlight_keywords(text: str) -> str:
         """Highlight important keywords"""
-        keywords = {
-            # Positive terms - green
-            r'\b(buy|bullish|uptrend|growth|increase|positive|strong|opportunity)\b': 
-                r'<span style="color: #4CAF50; font-weight: bold;">\1</span>',
-            
-            # Negative terms - red
-            r'\b(sell|bearish|downtrend|decline|decrease|negative|weak|risk)\b': 
-                r'<span style="color: #F44336; font-weight: bold;">\1</span>',
-                
-            # Neutral/cautious terms - yellow
-            r'\b(hold|neutral|sideways|consolidation|cautious|monitor|watch)\b': 
-                r'<span style="color: #FFD700; font-weight: bold;">\1</span>',
-                
-            # Technical terms - purple - fix potential invalid color
-            r'\b(resistance|support|moving average|MACD|RSI|volume|indicator)\b': 
-                r'<span style="color: #BB86FC; font-weight: bold;">\1</span>',
-        }
-        
-        result = text
-        for pattern, replacement in keywords.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-            
-        return result
+        return _KEYWORD_PATTERN.sub(
+            lambda match: f'<span style="color: {_KEYWORD_COLORS[match.lastgroup]}; font-weight: bold;">{match.group(0)}</span>',
+            text
+        )
     
     @staticmethod
     def create_progress_bar(value: float, max_value: float, width: int = 10) -> str:
@@ -101,6 +101,7 @@ class AnalysisFormatter:
         return panel
     
     @staticmethod
+    @timed("formatter.format_stock_analysis")
     def format_stock_analysis(analysis: str, ticker: str) -> str:
         """Apply comprehensive formatting to stock analysis text"""
         # First apply basic formatting to the raw text
@@ -118,7 +119,7 @@ class AnalysisFormatter:
         return formatted
     
     @staticmethod
-    def apply_formatting_to_textedit(editor: QTextEdit, analysis: str, ticker: str):
+    def apply_formatting_to_textedit(editor: "QTextEdit", analysis: str, ticker: str):
         """Apply rich text formatting to a QTextEdit widget"""
         # Get sentiment from content
         sentiment = "positive" if re.search(r'\b(buy|bullish|uptrend)\b', analysis, re.IGNORECASE) else \
@@ -188,6 +189,7 @@ class AnalysisFormatter:
             """
     
     @staticmethod
+    @timed("formatter.format_enhanced_analysis")
     def format_enhanced_analysis(analysis_text: str, ticker: str, financial_data: Dict) -> str:
         """
         Format analysis with enhanced visual structure and sections
@@ -483,7 +485,7 @@ class AnalysisFormatter:
         return metrics_html
             
     @staticmethod
-    def apply_enhanced_formatting(editor: QTextEdit, analysis: str, ticker: str, financial_data: Dict = None):
+    def apply_enhanced_formatting(editor: "QTextEdit", analysis: str, ticker: str, financial_data: Dict = None):
         """Apply enhanced rich text formatting to a QTextEdit widget"""
         # Use the new formatter with financial data if provided
         if financial_data is None:
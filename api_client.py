@@ -1,35 +1,46 @@
 import os
 import requests
 import re  # Add this import for regex operations
-import pandas as pd
-import numpy as np  # Add NumPy import for dummy data generation
-from datetime import datetime, timedelta
-from tradingview_ta import TA_Handler, Interval
-from typing import Dict, List, Optional, Union
-from config import OLLAMA_MODEL, NEWS_API_URL, NEWS_API_KEY  # Add NEWS_API_URL import here
-import ollama
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from config import OLLAMA_MODEL, NEWS_API_KEY, FINNHUB_API_URL, NEWS_STORE_CONFIG
 import time
 import threading
 import logging
-from api_request_manager import ApiRequestManager
 
 # Import the rate limiter
 from rate_limiter import (
     execute_finnhub_request, 
-    execute_news_api_request, 
     execute_ollama_request
 )
+from instrumentation import metrics, timed
+from logging_setup import SAMPLED
+from news_store import get_news_store
+from news_aggregator import NewsAggregator
+
+# pandas, numpy, tradingview_ta and ollama are imported where they are used so
+# headless callers (quotes, news) don't pay for them at import time
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Initialize global request manager with 10 seconds between requests
-api_request_manager = ApiRequestManager(min_request_interval=10.0)
-
 # Use environment variables for API keys
 FINNHUB_KEY = os.getenv("FINNHUB_KEY", "your_fallback_key")
 # Use the imported NEWS_API_KEY from config instead of getting from env directly
 
+# Chart timeframe -> (seconds of history, Finnhub candle resolution)
+CHART_TIMEFRAMES = {
+    "1D": (60 * 60 * 24, "5"),             # 5 minutes
+    "1W": (60 * 60 * 24 * 7, "15"),        # 15 minutes
+    "1M": (60 * 60 * 24 * 30, "60"),       # 60 minutes
+    "3M": (60 * 60 * 24 * 90, "D"),        # Daily
+    "6M": (60 * 60 * 24 * 180, "D"),       # Daily
+    "1Y": (60 * 60 * 24 * 365, "W"),       # Weekly
+    "5Y": (60 * 60 * 24 * 365 * 5, "M")    # Monthly
+}
+
 class StockAPIError(Exception):
     """Custom exception for Stock API errors"""
     pass
@@ -46,10 +57,23 @@ class StockAPI:
         self.max_requests_per_second = max_requests_per_second
         self.cache = {}  # Simple memory cache
         self.cache_ttl = 300  # Cache TTL in seconds (5 minutes)
+        self.news_aggregator = None  # Created with the news store on first use
+
+    def _get_cached(self, cache_key: str, use_cache: bool = True):
+        """Fresh cached value for cache_key, or None; counts hits and misses for diagnostics"""
+        if not use_cache:
+            return None
+        cache_entry = self.cache.get(cache_key)
+        if cache_entry and time.time() - cache_entry['timestamp'] < self.cache_ttl:
+            metrics.increment("stock_api.cache_hit")
+            return cache_entry['data']
+        metrics.increment("stock_api.cache_miss")
+        return None
 
+    @timed("http.finnhub")
     def _make_finnhub_request(self, url, params):
         """Helper method to make the actual API request to Finnhub with detailed logging and validation"""
-        logging.info(f"Making Finnhub request: {url}")
+        logging.debug(f"Making Finnhub request: {url}", extra=SAMPLED)
         
         try:
             response = requests.get(url, params=params, timeout=10)
@@ -68,6 +92,7 @@ class StockAPI:
             logging.error(f"Finnhub API error: {str(e)}")
             raise
 
+    @timed("stock_api.get_stock")
     def get_stock(self, ticker: str, retries: int = 3, backoff_factor: float = 0.3, use_cache: bool = True) -> Dict:
         """Fetch stock data using Finnhub API with rate limiting, caching and retry logic"""
         ticker = ticker.upper()  # Normalize ticker to uppercase
@@ -76,11 +101,10 @@ class StockAPI:
         cache_key = f"stock_data_{ticker}"
         
         # Check cache first if enabled
-        if use_cache and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                logging.info(f"Using cached stock data for {ticker} from cache key: {cache_key}")
-                return cache_entry['data']
+        cached = self._get_cached(cache_key, use_cache)
+        if cached is not None:
+            logging.debug(f"Using cached stock data for {ticker} from cache key: {cache_key}", extra=SAMPLED)
+            return cached
         
         if self.request_counter:
             self.request_counter.increment_api()
@@ -98,13 +122,13 @@ class StockAPI:
                     time.sleep(delay)
                 
                 # Use the direct approach as in the example
-                base_url = "https://finnhub.io/api/v1/quote"
+                base_url = f"{FINNHUB_API_URL}/quote"
                 params = {"symbol": ticker, "token": FINNHUB_KEY}
                 
-                response = requests.get(base_url, params=params)
+                response = execute_finnhub_request(requests.get, base_url, params=params, timeout=10)
                 response.raise_for_status()
                 data = response.json()
-                
+
                 # Validate the response
                 if not data:
                     raise StockAPIError(f"Empty response for ticker: {ticker}")
@@ -136,6 +160,7 @@ class StockAPI:
         else:
             raise StockAPIError(f"Failed to fetch data for {ticker} after {retries} retries")
 
+    @timed("http.newsapi")
     def _make_news_api_request(self, url, params):
         """Helper method to make the actual API request to News API with proper authentication"""
         # Use headers for authentication instead of query parameters
@@ -145,7 +170,7 @@ class StockAPI:
         if 'apiKey' in params:
             del params['apiKey']
         
-        logging.info(f"Making News API request: {url} with params {params}")
+        logging.debug(f"Making News API request: {url}", extra=SAMPLED)
         
         try:
             response = requests.get(url, params=params, headers=headers, timeout=10)
@@ -177,77 +202,50 @@ class StockAPI:
                     }
             raise
 
+    @timed("stock_api.get_news")
     def get_news(self, ticker: str, days_back: int = 3, num_articles: int = 3, use_cache: bool = True) -> List[Dict]:
-        """Fetch news articles with rate limiting and caching"""
-        # Check cache first if enabled
-        cache_key = f"news_{ticker}_{days_back}_{num_articles}"
-        if use_cache and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                logging.info(f"Using cached news data for {ticker}")
-                return cache_entry['data']
-        
-        # Increment the appropriate counter if available
-        if self.request_counter:
-            self.request_counter.increment('news_api')
-            
+        """
+        News articles about a ticker or topic, newest first
+
+        Answered from the local news store. The news providers are only asked,
+        for articles newer than the newest stored one, when the query hasn't
+        been fetched for NEWS_STORE_CONFIG["refresh_interval"] seconds or
+        use_cache is False.
+        """
+        store = get_news_store()
+        now = time.time()
+        since = now - days_back * 86400
+        if use_cache and now - store.last_fetched(ticker) < NEWS_STORE_CONFIG["refresh_interval"]:
+            metrics.increment("news_store.hit")
+            logging.debug(f"Using stored news for {ticker}", extra=SAMPLED)
+            return store.articles_for(ticker, since, num_articles)
+        metrics.increment("news_store.miss")
+
         try:
-            # Calculate a valid past date (not future date)
-            from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
-            
-            # Build parameters with correct names and proper separation
-            params = {
-                'q': ticker,  # Correct parameter name for query
-                'from': from_date,  # Valid past date
-                'sortBy': 'relevancy',  # Correct parameter name
-                'language': 'en',  # Separate parameter
-                'pageSize': num_articles  # Correct parameter name and separate
-            }
-            
-            # Log the URL being used with parameters
-            logging.info(f"Making news request to: {NEWS_API_URL} with query: {ticker}, from: {from_date}")
-            
-            # Execute with rate limiting
-            data = execute_news_api_request(
-                self._make_news_api_request,
-                NEWS_API_URL,
-                params
+            # Only what was published after the newest stored article
+            from_time = max(since, store.latest(ticker) + 1)
+            # Everything is stored for later queries, so ask for a full page
+            articles = self._get_news_aggregator().fetch(
+                ticker, from_time, max(num_articles, NEWS_STORE_CONFIG["page_size"])
             )
-            
-            # Check status - data might be an error response from _make_news_api_request
-            if data.get('status') == 'error':
-                # Return the error message from the request function
-                return [{"title": "Error", "description": data.get('message', 'Unknown error'), "source": {"name": "System"}}]
-            
-            if data['status'] != 'ok':
-                logging.error(f"News API error: {data.get('message', 'Unknown error')}")
-                return [{"title": "Error", "description": f"News API error: {data.get('message', 'Unknown error')}", "source": {"name": "System"}}]
-            
-            articles = data.get('articles', [])
-            
-            # Enhance articles with properly formatted dates
-            for article in articles:
-                if 'publishedAt' in article:
-                    try:
-                        # Convert ISO date to more readable format
-                        date_obj = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00'))
-                        article['formatted_date'] = date_obj.strftime('%b %d, %Y')
-                    except:
-                        article['formatted_date'] = article['publishedAt']
-            
-            # Cache the result
-            if use_cache:
-                self.cache[cache_key] = {
-                    'timestamp': time.time(),
-                    'data': articles
-                }
-            
-            return articles
+            added = store.add(articles, query=ticker)
+            store.mark_fetched(ticker, now)
+            logging.debug(f"Stored {added} new of {len(articles)} articles for {ticker}")
+            return store.articles_for(ticker, since, num_articles)
         except Exception as e:
             logging.error(f"News processing error: {str(e)}")
-            return [{"title": "News Unavailable", 
-                    "description": f"Could not retrieve news at this time: {str(e)}", 
-                    "source": {"name": "System"}}]
+            metrics.increment("news_store.fallback")
+            # Stored articles beat an error message
+            stored = store.articles_for(ticker, since, num_articles)
+            return stored or [{"title": "News Unavailable",
+                               "description": f"Could not retrieve news at this time: {str(e)}",
+                               "source": {"name": "System"}}]
+
+    def _get_news_aggregator(self) -> NewsAggregator:
+        with self.lock:
+            if self.news_aggregator is None:
+                self.news_aggregator = NewsAggregator(get_news_store(), self._make_news_api_request, self.request_counter)
+            return self.news_aggregator
 
     def _finnhub_get_candles(self, ticker, resolution, from_time, to_time):
         """Get historical candle data from Finnhub API"""
@@ -258,12 +256,12 @@ class StockAPI:
             'to': to_time,
             'token': FINNHUB_KEY
         }
-        url = "https://finnhub.io/api/v1/stock/candle"
+        url = f"{FINNHUB_API_URL}/stock/candle"
         response = requests.get(url, params=params)
         response.raise_for_status()
         return response.json()
 
-    def get_chart_data(self, ticker: str, timeframe: str = "3M", use_cache: bool = True) -> pd.DataFrame:
+    def get_chart_data(self, ticker: str, timeframe: str = "3M", use_cache: bool = True) -> "pd.DataFrame":
         """
         Get chart data using Finnhub instead of yfinance
         Args:
@@ -273,45 +271,37 @@ class StockAPI:
         Returns:
             DataFrame with OHLCV data
         """ 
+        # Default to 3 months
+        span, resolution = CHART_TIMEFRAMES.get(timeframe, CHART_TIMEFRAMES["3M"])
+        return self.get_candles(ticker, resolution, span, use_cache)
+
+    @timed("stock_api.get_chart_data")
+    def get_candles(self, ticker: str, resolution: str, span: int, use_cache: bool = True) -> "pd.DataFrame":
+        """
+        Get candles at a Finnhub resolution for the last `span` seconds
+        Args:
+            ticker: Stock symbol
+            resolution: Finnhub resolution (1, 5, 15, 30, 60, D, W, M)
+            span: Seconds of history up to now
+            use_cache: Whether to use cached data
+        Returns:
+            DataFrame with OHLCV data (generated fallback data if Finnhub fails)
+        """
+        import pandas as pd
+
         # Check cache first if enabled
-        cache_key = f"chart_{ticker}_{timeframe}"
-        if use_cache and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                logging.info(f"Using cached chart data for {ticker}")
-                return cache_entry['data']
+        cache_key = f"chart_{ticker}_{resolution}_{span}"
+        cached = self._get_cached(cache_key, use_cache)
+        if cached is not None:
+            logging.debug(f"Using cached chart data for {ticker}", extra=SAMPLED)
+            return cached
                 
-        # Calculate from and to timestamps based on timeframe
+        # Calculate from and to timestamps
         to_time = int(time.time())  # Current time in seconds
-        
-        if timeframe == "1D":
-            from_time = to_time - (60 * 60 * 24)  # 1 day back
-            resolution = "5"  # 5 minutes
-        elif timeframe == "1W":
-            from_time = to_time - (60 * 60 * 24 * 7)  # 1 week back
-            resolution = "15"  # 15 minutes
-        elif timeframe == "1M":
-            from_time = to_time - (60 * 60 * 24 * 30)  # 30 days back
-            resolution = "60"  # 60 minutes
-        elif timeframe == "3M":
-            from_time = to_time - (60 * 60 * 24 * 90)  # 90 days back
-            resolution = "D"  # Daily
-        elif timeframe == "6M":
-            from_time = to_time - (60 * 60 * 24 * 180)  # 180 days back
-            resolution = "D"  # Daily
-        elif timeframe == "1Y":
-            from_time = to_time - (60 * 60 * 24 * 365)  # 365 days back
-            resolution = "W"  # Weekly
-        elif timeframe == "5Y":
-            from_time = to_time - (60 * 60 * 24 * 365 * 5)  # 5 years back
-            resolution = "M"  # Monthly
-        else:
-            # Default to 3 months
-            from_time = to_time - (60 * 60 * 24 * 90)  # 90 days back
-            resolution = "D"  # Daily
+        from_time = to_time - span
         
         # Debug log timestamps
-        logging.info(f"Chart request time range: from={from_time} ({datetime.fromtimestamp(from_time).strftime('%Y-%m-%d')}), "
+        logging.debug(f"Chart request time range: from={from_time} ({datetime.fromtimestamp(from_time).strftime('%Y-%m-%d')}), "
                     f"to={to_time} ({datetime.fromtimestamp(to_time).strftime('%Y-%m-%d')})")
         
         # Use proper Finnhub symbol format - ensure uppercase and handle special cases
@@ -321,7 +311,7 @@ class StockAPI:
             # Try to get data from Finnhub
             try:
                 # First check if we can get valid data from Finnhub
-                logging.info(f"Attempting to fetch chart data from Finnhub for {ticker}")
+                logging.debug(f"Attempting to fetch chart data from Finnhub for {ticker}")
                 data = self._finnhub_get_candles(finnhub_ticker, resolution, from_time, to_time)
                 
                 # Check if data is valid
@@ -338,8 +328,8 @@ class StockAPI:
                     'Close': data.get('c', []),
                     'Volume': data.get('v', [])
                 })
-                timestamps = [datetime.fromtimestamp(t) for t in data.get('t', [])]
-                df.index = pd.DatetimeIndex(timestamps)
+                # Naive UTC, so the chart's epoch seconds match streamed trade times in any timezone
+                df.index = pd.to_datetime(data.get('t', []), unit='s')
                 
                 # Cache the valid data
                 if not df.empty and use_cache:
@@ -362,6 +352,9 @@ class StockAPI:
 
     def _generate_dummy_chart_data(self, ticker, from_time, to_time):
         """Generate dummy chart data when API fails"""
+        import numpy as np
+        import pandas as pd
+
         logging.warning(f"Generating dummy chart data for {ticker} as fallback")
         
         # Calculate number of days in the range
@@ -391,7 +384,8 @@ class StockAPI:
         
         while current <= to_time:
             # Skip weekends
-            dt = datetime.fromtimestamp(current)
+            # Daily candles are labelled at midnight UTC, like Finnhub's
+            dt = datetime.fromtimestamp(current, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
             if dt.weekday() < 5:  # Monday=0, Sunday=6
                 daily_volatility = np.random.normal(0, volatility)
                 daily_trend = trend * (1 + np.random.normal(0, 0.5))
@@ -422,6 +416,8 @@ class StockAPI:
             'Close': closes,
             'Volume': volumes
         }, index=pd.DatetimeIndex(dates))
+        # Lets callers keep generated data for less time than real candles
+        df.attrs['dummy'] = True
         
         return df
 
@@ -430,12 +426,15 @@ class StockAPI:
         ticker: str,
         exchange: str = "NASDAQ",
         screener: str = "america",
-        interval: Interval = Interval.INTERVAL_1_DAY
+        interval: str = "1d"
     ) -> Dict:
         """
         Get technical analysis recommendations from TradingView
         """
         try:
+            from tradingview_ta import TA_Handler
+
+
             handler = TA_Handler(
                 symbol=ticker,
                 screener=screener,
@@ -458,6 +457,7 @@ class StockAPI:
                 'moving_avgs': {}
             }
 
+    @timed("stock_api.get_market_news")
     def get_market_news(self, days_back: int = 3, num_articles: int = 5, use_cache: bool = True) -> List[Dict]:
         """
         Fetch general market news (not specific to a ticker)
@@ -506,21 +506,21 @@ class StockAPI:
                     return [{"title": "News Unavailable", "description": "Unable to retrieve market news at this time.", "source": {"name": "System"}}]
 
     # Added Finnhub function for company profile information (previously might have used Alpha Vantage)
+    @timed("stock_api.get_company_info")
     def get_company_info(self, ticker: str, use_cache: bool = True) -> Dict:
         """Get company information using Finnhub API"""
         # Check cache first if enabled
         cache_key = f"company_info_{ticker}"
-        if use_cache and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                logging.info(f"Using cached company info for {ticker}")
-                return cache_entry['data']
+        cached = self._get_cached(cache_key, use_cache)
+        if cached is not None:
+            logging.debug(f"Using cached company info for {ticker}", extra=SAMPLED)
+            return cached
         try:
             params = {
                 'symbol': ticker,
                 'token': FINNHUB_KEY
             }
-            url = "https://finnhub.io/api/v1/stock/profile2"
+            url = f"{FINNHUB_API_URL}/stock/profile2"
             response = requests.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -546,22 +546,22 @@ class StockAPI:
             raise StockAPIError(f"Error retrieving company information: {str(e)}")
 
     # Add function to get financial metrics using Finnhub
+    @timed("stock_api.get_financial_metrics")
     def get_financial_metrics(self, ticker: str, use_cache: bool = True) -> Dict:
         """Get financial metrics using Finnhub API"""
         # Check cache first if enabled
         cache_key = f"financial_metrics_{ticker}"
-        if use_cache and cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                logging.info(f"Using cached financial metrics for {ticker}")
-                return cache_entry['data']
+        cached = self._get_cached(cache_key, use_cache)
+        if cached is not None:
+            logging.debug(f"Using cached financial metrics for {ticker}", extra=SAMPLED)
+            return cached
         try:
             params = {
                 'symbol': ticker,
                 'metric': 'all',
                 'token': FINNHUB_KEY
             }
-            url = "https://finnhub.io/api/v1/stock/metric"
+            url = f"{FINNHUB_API_URL}/stock/metric"
             response = execute_finnhub_request(
                 requests.get, 
                 url, 
@@ -608,30 +608,47 @@ class StockAPI:
             }
 
 class AIClient:
+    # Models confirmed available, shared by all clients so the check runs once per process
+    _available_models = set()
+    _model_check_lock = threading.Lock()
+
     def __init__(self, model=OLLAMA_MODEL, request_counter=None, max_requests_per_minute=10):
         self.default_model = model
         self.request_counter = request_counter
         self.max_requests_per_minute = max_requests_per_minute
         self.lock = threading.Lock()
         self.requests = []
-        self._ensure_model_available(model)
+        # The model check talks to the Ollama server, so it is deferred to the first analyze()
 
     def _ensure_model_available(self, model_name: str) -> None:
         """
         Ensure the model is available locally, pull if not.
+        Only the first call per model contacts the Ollama server.
         Args:
             model_name (str): Name of the Ollama model to check/pull
         """
+        with AIClient._model_check_lock:
+            if model_name in AIClient._available_models:
+                return
+            self._check_model(model_name)
+
+    def _check_model(self, model_name: str) -> None:
         try:
+            import ollama
+
             # Try to get model info
             ollama.list()
             logging.info(f"Ollama models are available")
+            AIClient._available_models.add(model_name)
         except Exception as e:
             logging.error(f"Error checking model {model_name}: {e}")
             try:
+                import ollama
+
                 logging.info(f"Pulling model {model_name}...")
                 ollama.pull(model_name)
                 logging.info(f"Successfully pulled model {model_name}")
+                AIClient._available_models.add(model_name)
             except Exception as pull_error:
                 logging.error(f"Error pulling model: {pull_error}")
                 # Don't raise here, as we want to be able to continue even if model pulling fails
@@ -646,21 +663,26 @@ class AIClient:
                 time.sleep(wait_time)
             self.requests.append(current_time)
 
+    @timed("ai.generate")
     def _execute_ollama_request(self, model, messages):
         """Execute the actual Ollama request with robust error handling"""
-        logging.info(f"Making Ollama request with model {model}")
+        logging.debug(f"Making Ollama request with model {model}", extra=SAMPLED)
         try:
+            import ollama
+
             response = ollama.chat(model=model, messages=messages)
             return response
         except Exception as e:
             logging.error(f"Ollama request failed: {str(e)}")
             # Return a fallback response to avoid crashing the UI
             return {
+                'error': True,
                 'message': {
                     'content': f"I apologize, but I'm having trouble processing your request right now due to high demand. Please wait a moment and try again. (Error: {str(e)})"
                 }
             }
 
+    @timed("ai.analyze")
     def analyze(self, prompt, role, model=None, retries=2, backoff_factor=2.0):
         """Analyzes the given prompt using the specified AI model with rate limiting"""
         model_to_use = model or self.default_model
@@ -699,6 +721,7 @@ class AIClient:
         # If we got here, all retries failed
         error_message = str(last_error) if last_error else "Unknown error"
         return {
+            'error': True,
             'message': {
                 'content': f"Analysis failed after {retries+1} attempts. The system might be experiencing high load. Please try again later. (Error: {error_message})"
             }
@@ -740,6 +763,8 @@ class AIClient:
         """
         Internal method with retry logic for Ollama requests
         """
+        import ollama
+
         for attempt in range(max_retries):
             try:
                 response = ollama.chat(model=model, messages=messages)
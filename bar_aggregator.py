@@ -0,0 +1,136 @@
+"""
+Bar Aggregator Module
+Builds coarser OHLCV bars from finer ones, or from raw trades, at any
+Finnhub resolution. Bars are assigned to buckets with integer arithmetic on
+epoch seconds and grouped with numpy's reduceat, so aggregation is a handful
+of vectorised passes however many input bars there are.
+
+Buckets are aligned the way Finnhub labels its own candles, in UTC: minute
+resolutions on multiples of the bar length, days at midnight, weeks on
+Monday and months on the 1st. Times are true epoch seconds, so chart
+frames (indexed in naive UTC) and streamed trades share one clock.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Finnhub resolution -> bar length in seconds (W and M are only used for ordering)
+RESOLUTION_SECONDS = {
+    "1": 60,
+    "5": 5 * 60,
+    "15": 15 * 60,
+    "30": 30 * 60,
+    "60": 60 * 60,
+    "D": 24 * 60 * 60,
+    "W": 7 * 24 * 60 * 60,
+    "M": 30 * 24 * 60 * 60
+}
+
+DAY = 24 * 60 * 60
+# 1970-01-01 was a Thursday; shifting by 3 days puts week starts on Monday
+_WEEK_OFFSET = 3 * DAY
+
+
+def can_aggregate(source: str, target: str) -> bool:
+    """Whether bars at resolution source can be combined into bars at target"""
+    if source not in RESOLUTION_SECONDS or target not in RESOLUTION_SECONDS:
+        return False
+    if source == target:
+        return True
+    source_seconds, target_seconds = RESOLUTION_SECONDS[source], RESOLUTION_SECONDS[target]
+    if target in ("W", "M"):
+        return source_seconds <= DAY
+    # Intraday and daily targets need whole source bars per bucket
+    return source_seconds < target_seconds and target_seconds % source_seconds == 0
+
+
+def bucket_starts(times: np.ndarray, resolution: str) -> np.ndarray:
+    """
+    Start of the bar each timestamp falls in
+
+    Args:
+        times: Epoch seconds
+        resolution: Finnhub resolution of the bars being built
+
+    Returns:
+        np.ndarray: int64 epoch seconds, one per input time
+    """
+    times = np.asarray(times, dtype=np.int64)
+    if resolution == "M":
+        months = times.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64)
+    if resolution == "W":
+        return (times + _WEEK_OFFSET) // (7 * DAY) * (7 * DAY) - _WEEK_OFFSET
+    seconds = RESOLUTION_SECONDS[resolution]
+    return times // seconds * seconds
+
+
+def bucket_start(time: float, resolution: str) -> int:
+    """bucket_starts() for a single timestamp, e.g. one live trade"""
+    return int(bucket_starts(np.array([int(time)]), resolution)[0])
+
+
+def aggregate(times, opens, highs, lows, closes, volumes, resolution: str) -> Dict[str, np.ndarray]:
+    """
+    Combine time-ordered bars (or trades, with open = high = low = close = price) into coarser bars
+
+    Args:
+        times: Epoch seconds of each input bar, ascending
+        opens, highs, lows, closes: Input prices
+        volumes: Input volumes (None for no volume)
+        resolution: Finnhub resolution of the output bars
+
+    Returns:
+        Dict[str, np.ndarray]: 't' (bucket starts), 'o', 'h', 'l', 'c' and 'v' (if volumes were given)
+    """
+    buckets = bucket_starts(times, resolution)
+    if not len(buckets):
+        empty = np.array([], dtype=float)
+        return {'t': buckets, 'o': empty, 'h': empty, 'l': empty, 'c': empty, 'v': empty}
+
+    # Index of the first input bar in each bucket (inputs are time-ordered)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    bars = {
+        't': buckets[starts],
+        'o': np.asarray(opens, dtype=float)[starts],
+        'h': np.maximum.reduceat(np.asarray(highs, dtype=float), starts),
+        'l': np.minimum.reduceat(np.asarray(lows, dtype=float), starts),
+        'c': np.asarray(closes, dtype=float)[ends]
+    }
+    if volumes is not None:
+        bars['v'] = np.add.reduceat(np.nan_to_num(np.asarray(volumes, dtype=float)), starts)
+    return bars
+
+
+def aggregate_ticks(times, prices, volumes, resolution: str) -> Dict[str, np.ndarray]:
+    """Bars at resolution from time-ordered trades; see aggregate()"""
+    return aggregate(times, prices, prices, prices, prices, volumes, resolution)
+
+
+def aggregate_frame(frame: pd.DataFrame, resolution: str, source: Optional[str] = None) -> pd.DataFrame:
+    """
+    Coarser bars from an OHLCV DataFrame as returned by StockAPI.get_chart_data
+
+    Args:
+        frame: Open/High/Low/Close[/Volume] columns on a DatetimeIndex, oldest first
+        resolution: Finnhub resolution of the output bars
+        source: Resolution of frame; if it equals resolution the frame is returned as is
+
+    Returns:
+        pd.DataFrame: Same columns, indexed by bucket start
+    """
+    if source == resolution or frame.empty:
+        return frame
+    # Same epoch-seconds convention the chart uses for the index
+    times = frame.index.values.astype('datetime64[s]').astype(np.int64)
+    bars = aggregate(times, frame['Open'].values, frame['High'].values, frame['Low'].values,
+                     frame['Close'].values, frame['Volume'].values if 'Volume' in frame else None, resolution)
+    columns = {'Open': bars['o'], 'High': bars['h'], 'Low': bars['l'], 'Close': bars['c']}
+    if 'Volume' in frame:
+        columns['Volume'] = bars['v']
+    result = pd.DataFrame(columns, index=pd.DatetimeIndex(bars['t'].astype('datetime64[s]')))
+    result.attrs.update(frame.attrs)
+    return result
@@ -0,0 +1,314 @@
+"""
+Batch Analysis Module
+Analyzes a list of tickers (quote, metrics, news and AI analysis) on a bounded
+worker pool. Progress is checkpointed to disk so an interrupted run can resume,
+and every finished ticker is written to a local result store the UI can open
+without waiting on any provider.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from config import BATCH_CONFIG, OLLAMA_MODEL
+from helpers import build_analysis_prompt, remove_think_tags
+from ticker_utils import validate_ticker
+
+# File paths
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+BATCH_DIR = os.path.join(DATA_DIR, "batch")
+RESULTS_DIR = os.path.join(BATCH_DIR, "results")
+CHECKPOINT_FILE = os.path.join(BATCH_DIR, "checkpoint.json")
+
+
+def _atomic_write_json(path: str, data: Dict) -> None:
+    """Write JSON to a temporary file and move it into place"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _result_path(ticker: str) -> str:
+    return os.path.join(RESULTS_DIR, f"{ticker}.json")
+
+
+def load_batch_result(ticker: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """
+    Load the stored batch result for a ticker
+
+    Args:
+        ticker: Stock symbol
+        max_age: Ignore results older than this many seconds (None = any age)
+
+    Returns:
+        Optional[Dict]: Stored result, or None if missing or stale
+    """
+    path = _result_path(ticker.upper())
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            result = json.load(f)
+    except Exception as e:
+        logging.error(f"Error reading batch result for {ticker}: {e}")
+        return None
+    if max_age is not None and time.time() - result.get('timestamp', 0) > max_age:
+        return None
+    return result
+
+
+def list_batch_results() -> List[str]:
+    """Return the tickers that have a stored batch result"""
+    if not os.path.exists(RESULTS_DIR):
+        return []
+    return sorted(name[:-5] for name in os.listdir(RESULTS_DIR) if name.endswith('.json'))
+
+
+class BatchAnalyzer:
+    """
+    Runs the full analysis pipeline for many tickers.
+
+    Each ticker is one task on a bounded thread pool. The provider calls made
+    by a task go through the shared rate-limited queues in rate_limiter.py, so
+    the pool size only bounds how many tickers are in flight at once.
+    """
+
+    def __init__(self, tickers: List[str], max_workers: int = None, include_ai: bool = True,
+                 stock_api=None, ai_client=None,
+                 progress_callback: Optional[Callable[[str, int, int], None]] = None):
+        """
+        Initialize a batch run.
+
+        Args:
+            tickers: Ticker symbols to analyze
+            max_workers: Tickers processed concurrently (default: BATCH_CONFIG)
+            include_ai: Whether to generate the LLM analysis for each ticker
+            stock_api: StockAPI instance to use (created on demand if None)
+            ai_client: AIClient instance to use (created on demand if None)
+            progress_callback: Called as callback(ticker, done, total) after each ticker
+        """
+        self.tickers = self._normalize_tickers(tickers)
+        self.max_workers = max_workers or BATCH_CONFIG["max_workers"]
+        self.include_ai = include_ai
+        self.progress_callback = progress_callback
+        self._stock_api = stock_api
+        self._ai_client = ai_client
+
+        self.run_id = uuid.uuid4().hex[:8]
+        self.started = time.time()
+        self.completed: List[str] = []
+        self.failed: Dict[str, str] = {}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def resume(cls, **kwargs) -> Optional["BatchAnalyzer"]:
+        """
+        Recreate the batch run recorded in the checkpoint file.
+
+        Returns:
+            Optional[BatchAnalyzer]: Analyzer with completed tickers restored, or
+            None if there is no unfinished run to resume
+        """
+        checkpoint = cls._read_checkpoint()
+        if not checkpoint or checkpoint.get('finished'):
+            return None
+
+        analyzer = cls(checkpoint.get('tickers', []), **kwargs)
+        analyzer.run_id = checkpoint.get('run_id', analyzer.run_id)
+        analyzer.started = checkpoint.get('started', analyzer.started)
+        analyzer.completed = list(checkpoint.get('completed', []))
+        logging.info(f"Resuming batch run {analyzer.run_id}: "
+                     f"{len(analyzer.completed)}/{len(analyzer.tickers)} tickers already done")
+        return analyzer
+
+    @staticmethod
+    def _normalize_tickers(tickers: List[str]) -> List[str]:
+        """Validate tickers and drop duplicates while keeping order"""
+        normalized = []
+        for raw in tickers:
+            ticker, is_valid, suggestion = validate_ticker(raw)
+            if not is_valid:
+                logging.warning(f"Skipping invalid ticker {raw}" + (f" (did you mean {suggestion}?)" if suggestion else ""))
+                continue
+            if ticker not in normalized:
+                normalized.append(ticker)
+        return normalized
+
+    @property
+    def stock_api(self):
+        if self._stock_api is None:
+            from api_client import StockAPI
+            self._stock_api = StockAPI()
+        return self._stock_api
+
+    @property
+    def ai_client(self):
+        if self._ai_client is None:
+            from api_client import AIClient
+            self._ai_client = AIClient()
+        return self._ai_client
+
+    @property
+    def pending(self) -> List[str]:
+        """Tickers that still need to be analyzed"""
+        done = set(self.completed)
+        return [t for t in self.tickers if t not in done]
+
+    def stop(self):
+        """Request the run to stop; tickers already in flight will finish"""
+        self._stop_event.set()
+
+    def run(self) -> Dict[str, Dict]:
+        """
+        Analyze every pending ticker.
+
+        Returns:
+            Dict[str, Dict]: Results for the tickers processed in this call
+        """
+        pending = self.pending
+        total = len(self.tickers)
+        results = {}
+
+        logging.info(f"Batch run {self.run_id}: {len(pending)} of {total} tickers pending, "
+                     f"{self.max_workers} workers")
+        self._write_checkpoint()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="BatchWorker") as executor:
+            futures = {executor.submit(self._run_ticker, ticker): ticker for ticker in pending}
+            try:
+                self._collect(futures, results, total)
+            except KeyboardInterrupt:
+                # Let in-flight tickers finish; queued ones are dropped and stay pending
+                self.stop()
+                executor.shutdown(wait=True, cancel_futures=True)
+                self._write_checkpoint()
+                raise
+
+        finished = not self.pending
+        self._write_checkpoint(finished=finished)
+        logging.info(f"Batch run {self.run_id} {'finished' if finished else 'stopped'}: "
+                     f"{len(self.completed)}/{total} done, {len(self.failed)} failed")
+        return results
+
+    def _collect(self, futures: Dict, results: Dict[str, Dict], total: int):
+        """Record each ticker's outcome as its task completes"""
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Batch analysis failed for {ticker}: {e}")
+                with self._lock:
+                    self.failed[ticker] = str(e)
+                continue
+            if result is None:
+                continue
+
+            results[ticker] = result
+            with self._lock:
+                self.completed.append(ticker)
+                self.failed.pop(ticker, None)
+                self._write_checkpoint()
+                done = len(self.completed)
+
+            if self.progress_callback:
+                try:
+                    self.progress_callback(ticker, done, total)
+                except Exception as e:
+                    logging.error(f"Batch progress callback error: {e}")
+
+    def analyze_ticker(self, ticker: str) -> Dict:
+        """
+        Analyze a single ticker outside of a batch run.
+
+        The result is stored like any batch result, but the checkpoint of an
+        unfinished batch run is left untouched.
+
+        Raises:
+            Exception: If the quote cannot be fetched
+        """
+        return self._run_ticker(ticker)
+
+    def _run_ticker(self, ticker: str) -> Optional[Dict]:
+        """Run every stage for one ticker and store the result"""
+        if self._stop_event.is_set():
+            return None
+
+        result = {
+            'ticker': ticker,
+            'run_id': self.run_id,
+            'quote': None,
+            'metrics': None,
+            'news': [],
+            'analysis': None,
+            'errors': {}
+        }
+
+        # Quote is required - without a price there is nothing to analyze
+        result['quote'] = self.stock_api.get_stock(ticker)
+
+        try:
+            result['metrics'] = self.stock_api.get_financial_metrics(ticker)
+        except Exception as e:
+            result['errors']['metrics'] = str(e)
+
+        try:
+            result['news'] = self.stock_api.get_news(ticker, num_articles=BATCH_CONFIG["news_articles"])
+        except Exception as e:
+            result['errors']['news'] = str(e)
+
+        if self.include_ai and not self._stop_event.is_set():
+            try:
+                prompt = build_analysis_prompt(ticker, result['quote']['c'], result.get('news'), result.get('metrics'))
+                response = self.ai_client.analyze(prompt, "financial analyst", model=OLLAMA_MODEL)
+                content = remove_think_tags(response['message']['content'])
+                # analyze() answers an Ollama failure with an apology instead of raising;
+                # leave analysis empty so the app runs it again rather than showing that
+                if response.get('error'):
+                    result['errors']['analysis'] = content
+                else:
+                    result['analysis'] = content
+            except Exception as e:
+                result['errors']['analysis'] = str(e)
+
+        result['timestamp'] = time.time()
+        result['updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        _atomic_write_json(_result_path(ticker), result)
+        return result
+
+    @staticmethod
+    def _read_checkpoint() -> Optional[Dict]:
+        if not os.path.exists(CHECKPOINT_FILE):
+            return None
+        try:
+            with open(CHECKPOINT_FILE, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"Error reading batch checkpoint: {e}")
+            return None
+
+    def _write_checkpoint(self, finished: bool = False):
+        """Persist run progress; called with self._lock held or from the run thread"""
+        try:
+            _atomic_write_json(CHECKPOINT_FILE, {
+                'run_id': self.run_id,
+                'started': self.started,
+                'tickers': self.tickers,
+                'completed': self.completed,
+                'failed': self.failed,
+                'finished': finished,
+                'timestamp': time.time()
+            })
+        except Exception as e:
+            logging.error(f"Error writing batch checkpoint: {e}")
+
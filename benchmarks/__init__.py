@@ -0,0 +1,13 @@
+"""
+Benchmarks Package
+Offline benchmarks for the data, analysis, rendering and live stream paths. Provider
+traffic is served by http_recorder's stand-in server from a synthetic
+recording, so no API keys or network are needed:
+
+    python -m benchmarks.run                      # everything, JSON to benchmarks/results/
+    python -m benchmarks.run --quick --only data  # smaller sizes, one group
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+Each result carries a headline `value`, its `unit` and whether lower or
+higher is better, so two result files can be compared run-to-run.
+"""
@@ -0,0 +1,44 @@
+"""
+Chart Data Benchmark
+Candle response -> DataFrame conversion at 1k, 100k and 1M bars, both the
+fetch_data helper and StockAPI.get_chart_data (with the candle fetch
+replaced by the prepared response, so only the conversion is timed), and
+aggregation of the resulting one-minute bars to hourly and daily bars.
+"""
+
+from typing import Dict
+
+from benchmarks.common import BENCH_TICKER, measure, synthetic_candles
+
+SIZES = [1_000, 100_000, 1_000_000]
+QUICK_SIZES = [1_000, 100_000]
+
+
+def _repeats(bars: int) -> int:
+    return 5 if bars <= 100_000 else 2
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from api_client import StockAPI
+    from bar_aggregator import aggregate_frame
+    from fetch_data import format_candle_data_to_dataframe
+
+    results = {}
+    for bars in (QUICK_SIZES if quick else SIZES):
+        candles = synthetic_candles(bars, step=60)
+
+        stats = measure(lambda: format_candle_data_to_dataframe(candles), repeat=_repeats(bars))
+        results[f"data.format_candle_data_to_dataframe.{bars}"] = dict(stats, bars=bars)
+
+        api = StockAPI()
+        api._finnhub_get_candles = lambda *args: candles
+        frame = api.get_chart_data(BENCH_TICKER, "1D", use_cache=False)
+        if len(frame) != bars:
+            raise RuntimeError(f"get_chart_data returned {len(frame)} rows for {bars} bars")
+        stats = measure(lambda: api.get_chart_data(BENCH_TICKER, "1D", use_cache=False), repeat=_repeats(bars))
+        results[f"data.get_chart_data.{bars}"] = dict(stats, bars=bars)
+
+        for resolution in ("60", "D"):
+            stats = measure(lambda: aggregate_frame(frame, resolution, "1"), repeat=_repeats(bars))
+            results[f"data.aggregate_frame.{resolution}.{bars}"] = dict(stats, bars=bars)
+    return results
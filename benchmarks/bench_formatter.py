@@ -0,0 +1,46 @@
+"""
+Formatter Benchmark
+AnalysisFormatter on analysis texts from a typical LLM answer up to 1 MB,
+and batch sentiment scoring of news articles.
+"""
+
+from typing import Dict
+
+from benchmarks.common import BENCH_TICKER, measure, synthetic_analysis
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUICK_SIZES = [10_000, 100_000]
+ARTICLE_COUNTS = [100, 1_000]
+
+FINANCIAL_DATA = {
+    "metric": {
+        "peNormalizedAnnual": 29.1, "peTTM": 30.4, "pbAnnual": 45.2, "psTTM": 7.6,
+        "dividendYieldIndicatedAnnual": 0.52, "52WeekHigh": 199.6, "52WeekLow": 164.1
+    }
+}
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    from ai_formatter import AnalysisFormatter
+    from sentiment import score_articles
+
+    results = {}
+    for size in (QUICK_SIZES if quick else SIZES):
+        text = synthetic_analysis(size)
+        repeat = 5 if size <= 100_000 else 2
+
+        stats = measure(lambda: AnalysisFormatter.format_enhanced_analysis(text, BENCH_TICKER, FINANCIAL_DATA),
+                        repeat=repeat)
+        results[f"formatter.format_enhanced_analysis.{size}"] = dict(stats, chars=len(text))
+
+        stats = measure(lambda: AnalysisFormatter.format_stock_analysis(text, BENCH_TICKER), repeat=repeat)
+        results[f"formatter.format_stock_analysis.{size}"] = dict(stats, chars=len(text))
+
+    for count in ARTICLE_COUNTS:
+        articles = [
+            {'title': f"{BENCH_TICKER} shares surge after it beat estimates, analysts upgrade #{i}",
+             'description': "Investors weigh growth against the risk of weak demand; the stock did not fall."}
+            for i in range(count)
+        ]
+        results[f"sentiment.score_articles.{count}"] = dict(measure(lambda: score_articles(articles)), articles=count)
+    return results
@@ -0,0 +1,126 @@
+"""
+Pipeline Benchmark
+Quote, metrics and news throughput through StockAPI, the request queues and
+the rate limiters, against the stand-in server. By default the limiters are
+opened up so the numbers show what the queue, HTTP and parsing layers cost;
+with real_limits the configured rates apply and throughput should sit at
+the provider limit.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict
+
+from benchmarks.common import BENCH_TICKER, result
+
+# Concurrent callers, like the home page poller and an analysis running at once
+CALLERS = 4
+
+
+@contextmanager
+def _limits_lifted(*limiters):
+    """Temporarily give the limiters effectively unlimited rate and burst"""
+    saved = [(limiter, limiter.max_rate, limiter.burst_limit, limiter.tokens) for limiter in limiters]
+    for limiter in limiters:
+        with limiter.lock:
+            limiter.max_rate = limiter.burst_limit = limiter.tokens = 1e9
+    try:
+        yield
+    finally:
+        for limiter, max_rate, burst_limit, tokens in saved:
+            with limiter.lock:
+                limiter.max_rate, limiter.burst_limit, limiter.tokens = max_rate, burst_limit, tokens
+                limiter.last_refill = time.time()
+
+
+@contextmanager
+def _news_quota_lifted():
+    """
+    Temporarily lift the news aggregator's own quotas, which otherwise make
+    pipeline.news depend on the time of day (NewsAPI's daily quota is paced by
+    UTC hour)
+    """
+    from config import NEWS_AGGREGATOR_CONFIG
+
+    saved = dict(NEWS_AGGREGATOR_CONFIG)
+    NEWS_AGGREGATOR_CONFIG.update(newsapi_daily=10**9, finnhub_per_minute=10**9)
+    try:
+        yield
+    finally:
+        NEWS_AGGREGATOR_CONFIG.update(saved)
+
+
+def _throughput(call, requests: int, is_error) -> Dict:
+    """
+    Run `requests` calls spread over CALLERS threads and summarise them
+
+    Calls answered from stored articles because no provider could be asked
+    count as errors too.
+    """
+    from instrumentation import metrics
+
+    metrics.reset()
+    errors = []
+    per_caller = [requests // CALLERS + (1 if i < requests % CALLERS else 0) for i in range(CALLERS)]
+
+    def caller(count):
+        for _ in range(count):
+            try:
+                if is_error(call()):
+                    errors.append(1)
+            except Exception:
+                errors.append(1)
+
+    threads = [threading.Thread(target=caller, args=(count,)) for count in per_caller]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    errors.extend([1] * metrics.counters.get("news_store.fallback", 0))
+
+    stages = {}
+    for name, stats in metrics.snapshot().items():
+        if stats.get('count') and name.split(".")[0] in ("queue", "limiter", "http", "stock_api"):
+            stages[name] = {key: stats[key] for key in ('count', 'p50', 'p95', 'max')}
+    return result(
+        requests / elapsed, "req/s", better="higher",
+        requests=requests,
+        errors=len(errors),
+        seconds=round(elapsed, 3),
+        stages_ms=stages
+    )
+
+
+def _no_articles(articles) -> bool:
+    """Whether get_news answered with its error article instead of news"""
+    return not articles or articles[0].get('source', {}).get('name') == "System"
+
+
+def run(quick: bool = False, real_limits: bool = False) -> Dict[str, Dict]:
+    from api_client import StockAPI
+    from rate_limiter import finnhub_limiter, news_api_limiter
+
+    api = StockAPI()
+    # Under real limits a handful of requests already spans several refills
+    requests = 12 if real_limits else (100 if quick else 500)
+    cases = {
+        "quote": (lambda: api.get_stock(BENCH_TICKER, retries=0, use_cache=False),
+                  lambda data: 'c' not in data),
+        "metrics": (lambda: api.get_financial_metrics(BENCH_TICKER, use_cache=False),
+                    lambda data: data['metric'].get('peTTM') is None),
+        "news": (lambda: api.get_news(BENCH_TICKER, use_cache=False), _no_articles)
+    }
+
+    results = {}
+    # The quotas are lifted even under real limits, which are about the rate limiters
+    with _news_quota_lifted(), nullcontext() if real_limits else _limits_lifted(finnhub_limiter, news_api_limiter):
+        # Otherwise pipeline.news would time the failure path
+        articles = api.get_news(BENCH_TICKER, use_cache=False)
+        assert not _no_articles(articles), f"News request returned no articles: {articles}"
+        for name, (call, is_error) in cases.items():
+            results[f"pipeline.{name}"] = _throughput(call, requests, is_error)
+            results[f"pipeline.{name}"]['limits'] = "real" if real_limits else "lifted"
+    return results
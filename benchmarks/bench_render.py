@@ -0,0 +1,57 @@
+"""
+Chart Render Benchmark
+widgets.StockChart.update_chart for each timeframe on an offscreen Qt
+platform, with candles served by the stand-in server. A cold update (chart
+store emptied, so fetch, item creation and overlays), the first paint of
+the result, a repeat update served from loaded data and a chart type
+switch are timed separately.
+"""
+
+import os
+from typing import Dict
+
+from benchmarks.common import BENCH_TICKER, TIMEFRAME_RESOLUTIONS, measure
+
+CHART_SIZE = (1200, 600)
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+
+    from instrumentation import metrics
+    from widgets import StockChart
+
+    chart = StockChart()
+    chart.resize(*CHART_SIZE)
+    chart.show()
+    app.processEvents()
+
+    results = {}
+    timeframes = ["1D", "3M", "5Y"] if quick else list(TIMEFRAME_RESOLUTIONS)
+    for timeframe in timeframes:
+        metrics.reset()
+        stats = measure(lambda: chart.update_chart(BENCH_TICKER, timeframe, "Both"),
+                        repeat=3 if quick else 5, setup=chart.store.invalidate)
+        fetch = metrics.snapshot().get("stock_api.get_chart_data", {})
+        # grab() renders the scene into a pixmap, which is what a repaint costs
+        paint = measure(chart.grab, repeat=3, warmup=0)
+        results[f"render.update_chart.{timeframe}"] = dict(
+            stats,
+            resolution=TIMEFRAME_RESOLUTIONS[timeframe],
+            items=len(chart.getPlotItem().items),
+            fetch_p50_ms=fetch.get('p50'),
+            paint_ms=paint['value']
+        )
+        results[f"render.update_chart_loaded.{timeframe}"] = measure(
+            lambda: chart.update_chart(BENCH_TICKER, timeframe, "Both"), repeat=5 if quick else 20)
+        results[f"render.chart_type_switch.{timeframe}"] = measure(
+            lambda: (chart.update_chart(BENCH_TICKER, timeframe, "Line"),
+                     chart.update_chart(BENCH_TICKER, timeframe, "Both")), repeat=5 if quick else 20)
+
+    chart.close()
+    chart.deleteLater()
+    app.processEvents()
+    return results
@@ -0,0 +1,71 @@
+"""
+Live Stream Benchmark
+Cost of one streamed trade (folding it into the pending per-ticker update)
+and of applying a flushed update to the shown chart at 1k and 100k bars,
+both within the last bar and starting a new one. The in-bar update should
+not grow with the number of bars.
+"""
+
+import os
+import time
+from typing import Dict
+
+import pandas as pd
+
+from benchmarks.common import BENCH_TICKER, measure, result, synthetic_candles
+
+BAR_COUNTS = [1_000, 100_000]
+TRADES = 200_000
+
+
+def _frame(bars: int) -> pd.DataFrame:
+    candles = synthetic_candles(bars, step=300)
+    return pd.DataFrame({
+        'Open': candles['o'], 'High': candles['h'], 'Low': candles['l'],
+        'Close': candles['c'], 'Volume': candles['v']
+    }, index=pd.to_datetime(candles['t'], unit='s'))
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+
+    from market_stream import MarketStream
+    from widgets import StockChart
+
+    results = {}
+    stream = MarketStream()
+    trades = TRADES // 10 if quick else TRADES
+    start = time.perf_counter()
+    for i in range(trades):
+        stream._add_trade(BENCH_TICKER, 100.0 + (i % 50) * 0.01, 10, 1_700_000_000_000 + i)
+    elapsed = time.perf_counter() - start
+    results["stream.fold_trade"] = result(elapsed / trades * 1e6, "us", trades=trades)
+
+    chart = StockChart()
+    chart.resize(1200, 600)
+    chart.show()
+    app.processEvents()
+    for bars in BAR_COUNTS:
+        entry = chart._build_series(BENCH_TICKER, _frame(bars), "5")
+        chart._attach_series(entry)
+        lookup = entry['bars']
+        in_bar = {'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 10,
+                  'time': lookup.times[-1] + 1}
+        results[f"stream.apply_trades.{bars}"] = dict(
+            measure(lambda: chart.apply_trades(BENCH_TICKER, in_bar), repeat=50 if quick else 200),
+            bars=bars
+        )
+
+        def new_bar():
+            update = dict(in_bar, time=lookup.times[-1] + lookup.spacing)
+            chart.apply_trades(BENCH_TICKER, update)
+        results[f"stream.apply_trades_new_bar.{bars}"] = dict(measure(new_bar, repeat=5 if quick else 20), bars=bars)
+        chart._detach_series()
+
+    chart.close()
+    chart.deleteLater()
+    app.processEvents()
+    return results
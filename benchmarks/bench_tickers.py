@@ -0,0 +1,78 @@
+"""
+Ticker Lookup Benchmark
+find_similar_ticker against a 50k-symbol universe: building the symbol index
+and per-query latency for near misses (one or two edits from a real symbol)
+and for queries with no close symbol.
+"""
+
+import random
+import string
+import time
+from typing import Dict, List
+
+from benchmarks.common import measure, percentile, result, synthetic_symbols
+
+UNIVERSE = 50_000
+QUERIES = 500
+
+
+def _queries(symbols: List[str], count: int, seed: int = 7) -> List[str]:
+    """Half near misses of real symbols, half random strings"""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        if i % 2:
+            queries.append("".join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 6))))
+            continue
+        chars = list(rng.choice(symbols))
+        for _ in range(rng.randint(1, 2)):
+            position = rng.randrange(len(chars))
+            edit = rng.choice(("replace", "insert", "delete") if len(chars) > 1 else ("replace", "insert"))
+            if edit == "replace":
+                chars[position] = rng.choice(string.ascii_uppercase)
+            elif edit == "insert":
+                chars.insert(position, rng.choice(string.ascii_uppercase))
+            else:
+                del chars[position]
+        queries.append("".join(chars))
+    return queries
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    import ticker_utils
+    from symbol_index import SymbolIndex
+
+    universe = synthetic_symbols(UNIVERSE)
+    results = {
+        "tickers.build_index": dict(measure(lambda: SymbolIndex(universe), repeat=1 if quick else 3, warmup=0),
+                                    symbols=len(universe))
+    }
+
+    index = SymbolIndex(universe)
+    queries = _queries(sorted(universe), QUERIES // 5 if quick else QUERIES)
+
+    # Swap the benchmark universe in for the app's index
+    with ticker_utils._symbol_index_lock:
+        saved = ticker_utils._symbol_index
+        ticker_utils._symbol_index = index
+    try:
+        timings = []
+        matched = 0
+        for query in queries:
+            start = time.perf_counter()
+            match = ticker_utils.find_similar_ticker(query)
+            timings.append((time.perf_counter() - start) * 1000)
+            matched += match is not None
+    finally:
+        with ticker_utils._symbol_index_lock:
+            ticker_utils._symbol_index = saved
+
+    results["tickers.find_similar_ticker"] = result(
+        percentile(timings, 50), "ms",
+        queries=len(queries),
+        matched=matched,
+        p95_ms=round(percentile(timings, 95), 4),
+        max_ms=round(max(timings), 4),
+        symbols=len(universe)
+    )
+    return results
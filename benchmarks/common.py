@@ -0,0 +1,223 @@
+"""
+Benchmark Helpers
+Timing, result records and the synthetic data shared by the benchmarks.
+"""
+
+import gc
+import json
+import math
+import random
+import string
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Symbol the synthetic recording answers for
+BENCH_TICKER = "AAPL"
+
+# Chart timeframes as offered in the UI, with the Finnhub resolution
+# StockAPI.get_chart_data requests for each
+TIMEFRAME_RESOLUTIONS = {
+    "1D": "5",
+    "1W": "15",
+    "1M": "60",
+    "3M": "D",
+    "6M": "D",
+    "1Y": "W",
+    "5Y": "M"
+}
+
+# Bars a real response holds for each resolution over the longest timeframe
+# using it (US session: 78 five-minute bars a day)
+RESOLUTION_BARS = {"5": 78, "15": 130, "60": 154, "D": 126, "W": 52, "M": 60}
+RESOLUTION_SECONDS = {"5": 300, "15": 900, "60": 3600, "D": 86400, "W": 7 * 86400, "M": 30 * 86400}
+
+
+def result(value: float, unit: str, better: str = "lower", **details) -> Dict:
+    """
+    Benchmark result record
+
+    Args:
+        value: Headline number compared between runs
+        unit: Unit of value, e.g. "ms" or "req/s"
+        better: "lower" or "higher"
+        **details: Extra measurements kept alongside
+
+    Returns:
+        Dict: The record written to the results file
+    """
+    return dict(value=round(value, 4), unit=unit, better=better, **details)
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(p / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func: Callable, repeat: int = 5, warmup: int = 1, setup: Optional[Callable] = None) -> Dict:
+    """
+    Time func() and summarise the runs in milliseconds
+
+    Garbage is collected before each run so one run's garbage isn't billed
+    to the next.
+
+    Args:
+        func: Callable to time
+        repeat: Timed runs
+        warmup: Untimed runs first (imports, caches, JIT-like warmups in numpy/Qt)
+        setup: Called before every run, outside the timing
+
+    Returns:
+        Dict: result() record with median as the headline and min/mean/max
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return result(
+        statistics.median(times), "ms",
+        runs=repeat,
+        min_ms=round(min(times), 3),
+        mean_ms=round(statistics.fmean(times), 3),
+        max_ms=round(max(times), 3)
+    )
+
+
+def synthetic_candles(bars: int, step: int = 86400, seed: int = 7) -> Dict:
+    """
+    Finnhub /stock/candle response with a random-walk price series
+
+    Args:
+        bars: Number of bars
+        step: Seconds between bars
+        seed: Random seed, so every run sees the same data
+
+    Returns:
+        Dict: {'s': 'ok', 't', 'o', 'h', 'l', 'c', 'v'} with plain lists, as json.loads gives
+    """
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    opens = np.concatenate(([closes[0]], closes[:-1]))
+    spread = np.abs(rng.normal(0, 0.005, bars)) * closes
+    end = int(time.time()) // step * step
+    return {
+        's': 'ok',
+        't': list(range(end - (bars - 1) * step, end + 1, step)),
+        'o': np.round(opens, 4).tolist(),
+        'h': np.round(np.maximum(opens, closes) + spread, 4).tolist(),
+        'l': np.round(np.minimum(opens, closes) - spread, 4).tolist(),
+        'c': np.round(closes, 4).tolist(),
+        'v': rng.integers(100_000, 5_000_000, bars).tolist()
+    }
+
+
+def synthetic_analysis(size: int, ticker: str = BENCH_TICKER, seed: int = 7) -> str:
+    """
+    LLM-style analysis text of about `size` characters
+
+    The text has the five headed sections format_enhanced_analysis looks for,
+    each one paragraph long, with the numbers, keywords and bullets the
+    highlighters act on.
+    """
+    rng = random.Random(seed)
+    words = ("the stock shows strong growth with support near resistance while volume and RSI "
+             "indicate a bullish but cautious outlook amid risk of decline in weak markets").split()
+    sections = ["OVERVIEW", "FINANCIAL SITUATION", "NEWS IMPACT", "TRAJECTORY", "PREDICTION"]
+    per_section = max(1, size // len(sections))
+
+    parts = []
+    for section in sections:
+        lines = []
+        length = 0
+        while length < per_section:
+            sentence = " ".join(rng.choice(words) for _ in range(12))
+            line = (f"- {ticker} {sentence} at ${rng.uniform(50, 500):.2f}, "
+                    f"up {rng.uniform(0, 10):.1f}% over {rng.randint(2, 90)} days")
+            if section == "PREDICTION" and len(lines) < 3:
+                line = f"- End of {('week', 'month', 'year')[len(lines)]}: ${rng.uniform(50, 500):.2f}"
+            lines.append(line)
+            length += len(line) + 1
+        parts.append(f"{section}:\n" + "\n".join(lines))
+    return "\n\n".join(parts)
+
+
+def synthetic_symbols(count: int, seed: int = 7) -> Dict[str, str]:
+    """
+    Unique exchange-style symbols (1-5 letters, some with a class suffix)
+
+    Returns:
+        Dict[str, str]: symbol -> company name
+    """
+    rng = random.Random(seed)
+    symbols = {}
+    while len(symbols) < count:
+        symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.choice((1, 2, 3, 3, 4, 4, 4, 5))))
+        if rng.random() < 0.02:
+            symbol += "." + rng.choice("ABU")
+        symbols.setdefault(symbol, f"{symbol.title()} Holdings Inc")
+    return symbols
+
+
+def write_recording(path: str, latency: float = 0.0, ticker: str = BENCH_TICKER):
+    """
+    Write a synthetic http_recorder recording covering the endpoints StockAPI uses
+
+    Args:
+        path: Recording file to create
+        latency: Recorded upstream latency in seconds (replayed when the
+            stand-in server's latency_scale is set)
+        ticker: Symbol the responses are for
+    """
+    def entry(path, params, body):
+        return {
+            'method': 'GET', 'path': path, 'params': params, 'status': 200,
+            'content_type': 'application/json', 'body': json.dumps(body),
+            'elapsed': latency, 'recorded': now
+        }
+
+    now = time.time()
+    entries = [
+        entry("/finnhub/quote", [["symbol", ticker]],
+              {"c": 187.44, "d": 1.21, "dp": 0.65, "h": 188.1, "l": 185.9, "o": 186.2, "pc": 186.23, "t": int(time.time())}),
+        entry("/finnhub/stock/metric", [["metric", "all"], ["symbol", ticker]],
+              {"metric": {"peNormalizedAnnual": 29.1, "peTTM": 30.4, "pbAnnual": 45.2, "psTTM": 7.6,
+                          "dividendYieldIndicatedAnnual": 0.52, "52WeekHigh": 199.6, "52WeekLow": 164.1},
+               "symbol": ticker}),
+        # News requests ask for a full NEWS_STORE_CONFIG page since a few days ago,
+        # so the articles are recent ones
+        entry("/newsapi/everything", [["language", "en"], ["pageSize", "50"], ["q", ticker], ["sortBy", "publishedAt"]],
+              {"status": "ok", "totalResults": 3, "articles": [
+                  {"source": {"name": "Wire"}, "title": f"{ticker} headline {i}", "description": "Synthetic article",
+                   "url": f"https://example.com/newsapi/{i}",
+                   "publishedAt": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now - (i + 1) * 3600))}
+                  for i in range(3)]}),
+        entry("/finnhub/company-news", [["limit", "50"], ["symbol", ticker]],
+              [{"category": "company", "datetime": int(now - (i + 1) * 1800), "headline": f"{ticker} company story {i}",
+                "id": i, "image": "", "related": ticker, "source": "Newswire", "summary": "Synthetic company news",
+                "url": f"https://example.com/finnhub/{ticker.lower()}/{i}"}
+               for i in range(3)]),
+        entry("/finnhub/news", [["category", "general"], ["limit", "50"]],
+              [{"category": "top news", "datetime": int(now - (i + 1) * 1800), "headline": f"Market story {i}",
+                "id": 100 + i, "image": "", "related": "", "source": "Newswire", "summary": "Synthetic market news",
+                "url": f"https://example.com/finnhub/market/{i}"}
+               for i in range(3)])
+    ]
+    for resolution, bars in RESOLUTION_BARS.items():
+        entries.append(entry("/finnhub/stock/candle", [["resolution", resolution], ["symbol", ticker]],
+                             synthetic_candles(bars, RESOLUTION_SECONDS[resolution])))
+
+    with open(path, 'w') as f:
+        for item in entries:
+            f.write(json.dumps(item) + "\n")
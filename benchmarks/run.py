@@ -0,0 +1,167 @@
+"""
+Benchmark Runner
+Runs the benchmark groups offline and writes the results as JSON:
+
+    python -m benchmarks.run [--quick] [--only GROUP ...] [--out FILE]
+                             [--compare BASELINE] [--threshold 0.1]
+                             [--upstream-latency MS] [--real-limits]
+
+The stand-in server is started, and its URLs exported, before any app
+module is imported, because config.py reads them at import time. The app's
+persistent stores are pointed at the same scratch directory as the
+recording.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import tempfile
+import traceback
+from typing import Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+GROUPS = ["pipeline", "data", "render", "stream", "formatter", "tickers"]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _isolate_stores(data_dir: str):
+    """
+    Point the app's persistent stores at a scratch directory, as the stand-in
+    server does for the provider URLs, so a run neither reads nor changes the
+    user's news, quota counters, ticker validity or cached pages
+    """
+    import cache
+    import news_store
+    import ticker_utils
+
+    cache.CACHE_DIR = os.path.join(data_dir, "cache")
+    news_store.NEWS_STORE_FILE = os.path.join(data_dir, "news_store.jsonl")
+    ticker_utils.TICKER_STORE_FILE = os.path.join(data_dir, "ticker_store.jsonl")
+    # Nothing to migrate into the fresh ticker store
+    ticker_utils.VALID_TICKERS_CACHE_FILE = os.path.join(data_dir, "valid_tickers.json")
+    ticker_utils.INVALID_TICKERS_CACHE_FILE = os.path.join(data_dir, "invalid_tickers.json")
+    ticker_utils.API_CHECKS_FILE = os.path.join(data_dir, "api_checks.json")
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.1) -> bool:
+    """
+    Print each shared result next to the baseline
+
+    Args:
+        current: Results of this run
+        baseline: Results file contents of an earlier run
+        threshold: Relative change in the wrong direction counted as a regression
+
+    Returns:
+        bool: True if any result regressed
+    """
+    regressed = False
+    old_results = baseline.get('results', {})
+    print(f"\n{'benchmark':<50} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, new in sorted(current['results'].items()):
+        old = old_results.get(name)
+        if not old or 'value' not in old or 'value' not in new or not old['value']:
+            continue
+        change = (new['value'] - old['value']) / old['value']
+        worse = change > threshold if new['better'] == "lower" else change < -threshold
+        regressed |= worse
+        print(f"{name:<50} {old['value']:>12.3f} {new['value']:>12.3f} {change:>+7.1%}"
+              f" {new['unit']}{'  REGRESSION' if worse else ''}")
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Stoxalotl benchmarks offline")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer runs")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, help="Benchmark groups to run")
+    parser.add_argument("--out", help="Results file (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown reported as a regression (default: 0.1)")
+    parser.add_argument("--upstream-latency", type=float, default=0.0,
+                        help="Simulated provider latency in ms for the stand-in server")
+    parser.add_argument("--real-limits", action="store_true",
+                        help="Keep the configured rate limits in the pipeline benchmark")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.path.insert(0, APP_DIR)
+
+    from http_recorder import StandInServer
+    from benchmarks.common import write_recording
+
+    scratch = tempfile.mkdtemp(prefix="stoxalotl_bench_")
+    recording = os.path.join(scratch, "recording.jsonl")
+    write_recording(recording, latency=args.upstream_latency / 1000)
+    server = StandInServer(recording, "replay", latency_scale=1.0 if args.upstream_latency else 0.0).start()
+    os.environ.update(server.env())
+    _isolate_stores(os.path.join(scratch, "data"))
+
+    started = time.time()
+    output = {
+        'meta': {
+            'started': started,
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'quick': args.quick,
+            'upstream_latency_ms': args.upstream_latency,
+            'real_limits': args.real_limits
+        },
+        'results': {},
+        'errors': {}
+    }
+
+    try:
+        for group in args.only or GROUPS:
+            print(f"Running {group} benchmarks...", flush=True)
+            try:
+                module = __import__(f"benchmarks.bench_{group}", fromlist=["run"])
+                if group == "pipeline":
+                    results = module.run(quick=args.quick, real_limits=args.real_limits)
+                else:
+                    results = module.run(quick=args.quick)
+            except Exception as e:
+                output['errors'][group] = f"{type(e).__name__}: {e}"
+                logging.debug(traceback.format_exc())
+                print(f"  {group} failed: {output['errors'][group]}")
+                continue
+            for name, stats in results.items():
+                print(f"  {name:<48} {stats['value']:>12.3f} {stats['unit']}")
+            output['results'].update(results)
+    finally:
+        server.stop()
+
+    output['meta']['seconds'] = round(time.time() - started, 1)
+    path = args.out or os.path.join(RESULTS_DIR, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    status = 1 if output['errors'] else 0
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(output, json.load(f), args.threshold):
+                status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,11 @@
+import os
+import json
 import time
+import logging
+import threading
+
+# Persistent caches live under data/cache
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache")
 
 class Cache:
     def __init__(self, ttl=600):  # Increase TTL to 10 minutes
@@ -19,3 +26,64 @@ class Cache:
 
     def clear(self):
         self.cache.clear()
+
+
+class PersistentCache(Cache):
+    """
+    Cache backed by a JSON file so entries survive a restart.
+
+    Values must be JSON serializable. Expired entries are kept on disk, so
+    callers can still show stale data (via get_entry) while they refresh it.
+    """
+
+    def __init__(self, name, ttl=600):
+        super().__init__(ttl)
+        self.path = os.path.join(CACHE_DIR, f"{name}.json")
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.cache = json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading cache {self.path}: {e}")
+            self.cache = {}
+
+    def _save(self):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.error(f"Error saving cache {self.path}: {e}")
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        if entry and time.time() - entry['time'] < self.ttl:
+            return entry['value']
+        return None
+
+    def get_entry(self, key):
+        """Return {'value', 'time'} for key regardless of age, or None"""
+        with self.lock:
+            return self.cache.get(key)
+
+    def age(self, key):
+        """Seconds since key was stored, or None if it isn't cached"""
+        entry = self.get_entry(key)
+        return time.time() - entry['time'] if entry else None
+
+    def set(self, key, value):
+        with self.lock:
+            super().set(key, value)
+            self._save()
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self._save()
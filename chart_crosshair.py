@@ -0,0 +1,189 @@
+"""
+Chart Crosshair Module
+Crosshair and OHLC readout for the price chart. The hovered bar is found by
+binary search over the sorted bar times, each bar's readout text is built
+once and cached, and the text item is only touched when the hovered bar
+changes, so hovering stays cheap on long (100k+ bar) histories.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import Qt
+
+from config import COLOR_PALETTES
+
+# Bars closer together than this are intraday, and their readout shows the time
+INTRADAY_SPACING = 86400
+
+
+class BarLookup:
+    """
+    OHLCV bars indexed by time for nearest-bar queries.
+
+    Times are kept as one sorted float array; nearest() is a searchsorted
+    plus a comparison with the neighbouring bar, with no per-query
+    allocation. The chart builds one per update and hands the same arrays to
+    the crosshair and every pane (see chart_panes).
+    """
+
+    def __init__(self, times, opens, highs, lows, closes, volumes=None):
+        times = np.asarray(times, dtype=float)
+        order = None
+        if len(times) > 1 and np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="stable")
+            times = times[order]
+
+        def column(values):
+            if values is None:
+                return None
+            # Copied, so live updates never write into the caller's (e.g. a cached DataFrame's) data
+            values = np.array(values, dtype=float)
+            return values[order] if order is not None else values
+
+        self.times = times
+        self.opens = column(opens)
+        self.highs = column(highs)
+        self.lows = column(lows)
+        self.closes = column(closes)
+        self.volumes = column(volumes)
+        self.spacing = float(np.median(np.diff(times))) if len(times) > 1 else 0.0
+        self.intraday = len(times) > 1 and self.spacing < INTRADAY_SPACING
+        self._labels: Dict[int, str] = {}
+
+    @classmethod
+    def from_dataframe(cls, times, frame) -> "BarLookup":
+        """Build from plot x values and an OHLCV DataFrame (Open/High/Low/Close[/Volume] columns)"""
+        return cls(times, frame['Open'].values, frame['High'].values, frame['Low'].values,
+                   frame['Close'].values, frame['Volume'].values if 'Volume' in frame else None)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def nearest(self, x: float) -> Optional[int]:
+        """Index of the bar closest in time to x, or None if there are no bars"""
+        count = len(self.times)
+        if not count:
+            return None
+        index = int(np.searchsorted(self.times, x))
+        if index <= 0:
+            return 0
+        if index >= count:
+            return count - 1
+        return index - 1 if x - self.times[index - 1] <= self.times[index] - x else index
+
+    def update_last(self, high: float, low: float, close: float, volume: float = 0.0):
+        """Fold trades into the last (still open) bar in place"""
+        index = len(self.times) - 1
+        if high > self.highs[index]:
+            self.highs[index] = high
+        if low < self.lows[index]:
+            self.lows[index] = low
+        self.closes[index] = close
+        if self.volumes is not None:
+            self.volumes[index] = np.nan_to_num(self.volumes[index]) + volume
+        self._labels.pop(index, None)
+
+    def append(self, time: float, open: float, high: float, low: float, close: float, volume: float = 0.0):
+        """Start a new last bar; this copies the arrays, so it is for bar boundaries, not every trade"""
+        self.times = np.append(self.times, time)
+        self.opens = np.append(self.opens, open)
+        self.highs = np.append(self.highs, high)
+        self.lows = np.append(self.lows, low)
+        self.closes = np.append(self.closes, close)
+        if self.volumes is not None:
+            self.volumes = np.append(self.volumes, volume)
+
+    def label(self, index: int) -> str:
+        """Readout text for a bar, formatted on first use"""
+        text = self._labels.get(index)
+        if text is None:
+            # Intraday bars in local time; daily and longer bars are dated in UTC, as Finnhub labels them
+            when = datetime.fromtimestamp(self.times[index], None if self.intraday else timezone.utc)
+            lines = [
+                when.strftime("%d/%m/%Y %H:%M" if self.intraday else "%d/%m/%Y"),
+                f"Open: ${self.opens[index]:.2f}",
+                f"High: ${self.highs[index]:.2f}",
+                f"Low: ${self.lows[index]:.2f}",
+                f"Close: ${self.closes[index]:.2f}"
+            ]
+            if self.volumes is not None and self.volumes[index] == self.volumes[index]:
+                lines.append(f"Volume: {self.volumes[index]:,.0f}")
+            text = "\n".join(lines)
+            self._labels[index] = text
+        return text
+
+
+class ChartCrosshair:
+    """
+    Crosshair lines and a fixed OHLC readout on a pyqtgraph plot.
+
+    The items are attached to the ViewBox rather than added through the
+    PlotItem, so PlotItem.clear() (called on every chart update) leaves them
+    in place. Feed it scene positions from the widget's mouse move handler.
+    """
+
+    def __init__(self, plot_item: pg.PlotItem, theme: Dict = None):
+        theme = theme or COLOR_PALETTES["Dark"]
+        self.view_box = plot_item.getViewBox()
+        self.bars: Optional[BarLookup] = None
+        self._index: Optional[int] = None
+
+        pen = pg.mkPen(theme['text-secondary'], width=1, style=Qt.DashLine)
+        self.v_line = pg.InfiniteLine(angle=90, movable=False, pen=pen)
+        self.h_line = pg.InfiniteLine(angle=0, movable=False, pen=pen)
+        for line in (self.v_line, self.h_line):
+            line.setZValue(50)
+            self.view_box.addItem(line, ignoreBounds=True)
+
+        # Parented to the ViewBox itself, so it stays in the top-right corner
+        # (below the chart's toggle buttons) whatever the data range
+        self.readout = pg.TextItem(color=theme['text'], fill=pg.mkBrush(30, 30, 30, 200), anchor=(1, 0))
+        self.readout.setParentItem(self.view_box)
+        self.readout.setZValue(60)
+        self.view_box.sigResized.connect(self._place_readout)
+        self._place_readout()
+        self.hide()
+
+    def _place_readout(self, *args):
+        self.readout.setPos(self.view_box.width() - 10, 50)
+
+    def set_bars(self, bars: Optional[BarLookup]):
+        """Replace the hovered data (None while the chart has no data)"""
+        self.bars = bars
+        self._index = None
+        if not bars:
+            self.hide()
+
+    def refresh(self, index: int):
+        """Rebuild the readout if it shows bar index (e.g. the live bar just changed)"""
+        if index == self._index and self.bars:
+            self.readout.setText(self.bars.label(index))
+
+    def hide(self):
+        self.v_line.hide()
+        self.h_line.hide()
+        self.readout.hide()
+        self._index = None
+
+    def mouse_moved(self, scene_pos):
+        """Move the crosshair to a scene position, updating the readout if the bar changed"""
+        if not self.bars or not self.view_box.sceneBoundingRect().contains(scene_pos):
+            self.hide()
+            return
+
+        point = self.view_box.mapSceneToView(scene_pos)
+        index = self.bars.nearest(point.x())
+        self.h_line.setPos(point.y())
+        if index != self._index:
+            self._index = index
+            # Snap the vertical line to the bar the readout describes
+            self.v_line.setPos(self.bars.times[index])
+            self.readout.setText(self.bars.label(index))
+
+        if not self.readout.isVisible():
+            self.v_line.show()
+            self.h_line.show()
+            self.readout.show()
@@ -0,0 +1,256 @@
+"""
+Chart Panes Module
+Candles, volume and oscillator panes for the price chart. Every item draws
+from the same BarLookup the crosshair uses, so a chart update builds one set
+of bar arrays and the items only hold references to them.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyqtgraph as pg
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QPainterPath
+
+from chart_crosshair import BarLookup
+
+# Bar body width as a fraction of the typical bar spacing
+BAR_WIDTH = 0.8
+
+RSI_PERIOD = 14
+RSI_LEVELS = (30, 70)
+
+
+def relative_strength_index(closes: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """
+    Wilder's RSI of a close series
+
+    Args:
+        closes: Close prices, oldest first
+        period: Smoothing period
+
+    Returns:
+        np.ndarray: RSI values (NaN until `period` bars are available)
+    """
+    delta = pd.Series(closes, copy=False).diff()
+    gains = delta.clip(lower=0).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    losses = (-delta.clip(upper=0)).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + gains.values / losses.values)
+    # No losses in the window means RSI 100, not NaN
+    rsi[(losses.values == 0) & (gains.values > 0)] = 100.0
+    return rsi
+
+
+def _bar_spacing(times: np.ndarray) -> float:
+    return float(np.median(np.diff(times))) if len(times) > 1 else 1.0
+
+
+def _bars_path(x: np.ndarray, bottom: np.ndarray, top: np.ndarray, width: float) -> QPainterPath:
+    """One QPainterPath holding a closed rectangle per bar, built without a Python loop"""
+    if not len(x):
+        return QPainterPath()
+    left = x - width / 2
+    right = x + width / 2
+    xs = np.column_stack((left, left, right, right, left)).ravel()
+    ys = np.column_stack((bottom, top, top, bottom, bottom)).ravel()
+    # Connect the five corners of each bar, but not one bar to the next
+    connect = np.ones((len(x), 5), dtype=np.int32)
+    connect[:, -1] = 0
+    return pg.arrayToQPath(xs, ys, connect=connect.ravel(), finiteCheck=False)
+
+
+def _wicks_path(x: np.ndarray, lows: np.ndarray, highs: np.ndarray) -> QPainterPath:
+    """One QPainterPath holding a low-to-high segment per bar"""
+    if not len(x):
+        return QPainterPath()
+    xs = np.repeat(x, 2)
+    ys = np.column_stack((lows, highs)).ravel()
+    return pg.arrayToQPath(xs, ys, connect="pairs", finiteCheck=False)
+
+
+class CandlestickSeriesItem(pg.GraphicsObject):
+    """
+    Candlesticks for every bar in a BarLookup as a single graphics item.
+
+    Closed bars are drawn from one path of wick segments and two filled body
+    paths (one per colour), so a series costs three paths however many bars
+    it has, and showing or hiding the candles is one setVisible() call. The
+    last bar is drawn on its own, so live trades only redraw that bar.
+    """
+
+    def __init__(self, bars: BarLookup, up_color: str, down_color: str, border_color: str):
+        super().__init__()
+        self.bars = bars
+        self.up_brush = pg.mkBrush(up_color)
+        self.down_brush = pg.mkBrush(down_color)
+        self.pen = pg.mkPen(border_color)
+        self.pen.setCosmetic(True)
+        self.width = _bar_spacing(bars.times) * BAR_WIDTH
+
+        times, opens, closes = bars.times[:-1], bars.opens[:-1], bars.closes[:-1]
+        up = closes >= opens
+        self._wicks = _wicks_path(times, bars.lows[:-1], bars.highs[:-1])
+        self._up_path = _bars_path(times[up], opens[up], closes[up], self.width)
+        self._down_path = _bars_path(times[~up], closes[~up], opens[~up], self.width)
+        if len(bars):
+            self._low, self._high = float(np.nanmin(bars.lows)), float(np.nanmax(bars.highs))
+        self._bounds = QRectF()
+        self._update_bounds()
+
+    def _update_bounds(self):
+        times = self.bars.times
+        if not len(times):
+            return
+        index = len(times) - 1
+        self._low = min(self._low, self.bars.lows[index])
+        self._high = max(self._high, self.bars.highs[index])
+        bounds = QRectF(times[0] - self.width, self._low, times[-1] - times[0] + 2 * self.width, self._high - self._low)
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+            self.informViewBoundsChanged()
+
+    def bar_updated(self):
+        """The last bar changed in place; only it is redrawn"""
+        self._update_bounds()
+        self.update()
+
+    def bar_added(self):
+        """A new last bar was appended: the previous one joins the closed-bar paths"""
+        index = len(self.bars) - 2
+        if index >= 0:
+            x, open_, close = self.bars.times[index], self.bars.opens[index], self.bars.closes[index]
+            self._wicks.moveTo(x, self.bars.lows[index])
+            self._wicks.lineTo(x, self.bars.highs[index])
+            path = self._up_path if close >= open_ else self._down_path
+            path.addRect(QRectF(x - self.width / 2, min(open_, close), self.width, abs(close - open_)))
+        self.bar_updated()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        """Data range for auto-ranging; the y range only covers bars inside orthoRange"""
+        if not len(self.bars):
+            return None, None
+        if ax == 0:
+            return self._bounds.left(), self._bounds.right()
+        lows, highs = self.bars.lows, self.bars.highs
+        if orthoRange is not None:
+            start, end = np.searchsorted(self.bars.times, orthoRange)
+            lows, highs = lows[start:end], highs[start:end]
+        if not len(lows):
+            return None, None
+        return float(np.nanmin(lows)), float(np.nanmax(highs))
+
+    def paint(self, p, *args):
+        p.setPen(self.pen)
+        p.drawPath(self._wicks)
+        p.setBrush(self.up_brush)
+        p.drawPath(self._up_path)
+        p.setBrush(self.down_brush)
+        p.drawPath(self._down_path)
+
+        index = len(self.bars) - 1
+        if index >= 0:
+            x, open_, close = self.bars.times[index], self.bars.opens[index], self.bars.closes[index]
+            p.drawLine(QPointF(x, self.bars.lows[index]), QPointF(x, self.bars.highs[index]))
+            p.setBrush(self.up_brush if close >= open_ else self.down_brush)
+            p.drawRect(QRectF(x - self.width / 2, min(open_, close), self.width, abs(close - open_)))
+
+    def boundingRect(self):
+        return self._bounds
+
+
+class VolumeBarItem(pg.GraphicsObject):
+    """
+    Volume bars for every bar in a BarLookup as a single graphics item.
+
+    Up/down colouring is a vectorised close >= open mask, and closed bars are
+    drawn as two filled paths (one per colour) instead of one item or brush
+    per bar. As with the candles, the last bar is drawn on its own.
+    """
+
+    def __init__(self, up_color: str, down_color: str):
+        super().__init__()
+        self.up_brush = pg.mkBrush(up_color)
+        self.down_brush = pg.mkBrush(down_color)
+        self.bars: Optional[BarLookup] = None
+        self.width = 0.0
+        self._up_path = QPainterPath()
+        self._down_path = QPainterPath()
+        self._bounds = QRectF()
+
+    def set_bars(self, bars: Optional[BarLookup]):
+        self.prepareGeometryChange()
+        self.bars = bars
+        if not bars or bars.volumes is None:
+            self._up_path = QPainterPath()
+            self._down_path = QPainterPath()
+            self._bounds = QRectF()
+        else:
+            times, volumes = bars.times[:-1], np.nan_to_num(bars.volumes[:-1])
+            self.width = _bar_spacing(bars.times) * BAR_WIDTH
+            up = bars.closes[:-1] >= bars.opens[:-1]
+            zeros = np.zeros_like(volumes)
+            self._up_path = _bars_path(times[up], zeros[up], volumes[up], self.width)
+            self._down_path = _bars_path(times[~up], zeros[~up], volumes[~up], self.width)
+            self._bounds = QRectF(bars.times[0] - self.width, 0, bars.times[-1] - bars.times[0] + 2 * self.width,
+                                  float(np.nanmax(bars.volumes)) or 1.0)
+        self.informViewBoundsChanged()
+        self.update()
+
+    def _update_bounds(self):
+        times, volume = self.bars.times, float(np.nan_to_num(self.bars.volumes[-1]))
+        bounds = QRectF(times[0] - self.width, 0, times[-1] - times[0] + 2 * self.width,
+                        max(self._bounds.height(), volume))
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+            self.informViewBoundsChanged()
+
+    def bar_updated(self):
+        """The last bar changed in place; only it is redrawn"""
+        if not self.bars or self.bars.volumes is None:
+            return
+        self._update_bounds()
+        self.update()
+
+    def bar_added(self):
+        """A new last bar was appended: the previous one joins the closed-bar paths"""
+        if not self.bars or self.bars.volumes is None:
+            return
+        index = len(self.bars) - 2
+        if index >= 0:
+            path = self._up_path if self.bars.closes[index] >= self.bars.opens[index] else self._down_path
+            path.addRect(QRectF(self.bars.times[index] - self.width / 2, 0, self.width,
+                                float(np.nan_to_num(self.bars.volumes[index]))))
+        self.bar_updated()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        """Data range for auto-ranging; the y range only covers bars inside orthoRange"""
+        if not self.bars or self.bars.volumes is None:
+            return None, None
+        if ax == 0:
+            return self._bounds.left(), self._bounds.right()
+        volumes = self.bars.volumes
+        if orthoRange is not None:
+            start, end = np.searchsorted(self.bars.times, orthoRange)
+            volumes = volumes[start:end]
+        if not len(volumes):
+            return None, None
+        return 0.0, float(np.nanmax(volumes))
+
+    def paint(self, p, *args):
+        p.setPen(Qt.NoPen)
+        p.setBrush(self.up_brush)
+        p.drawPath(self._up_path)
+        p.setBrush(self.down_brush)
+        p.drawPath(self._down_path)
+
+        if self.bars and self.bars.volumes is not None and len(self.bars):
+            p.setBrush(self.up_brush if self.bars.closes[-1] >= self.bars.opens[-1] else self.down_brush)
+            p.drawRect(QRectF(self.bars.times[-1] - self.width / 2, 0, self.width,
+                              float(np.nan_to_num(self.bars.volumes[-1]))))
+
+    def boundingRect(self):
+        return self._bounds
@@ -0,0 +1,134 @@
+"""
+Chart Store Module
+Candle data for the price chart, kept per (ticker, resolution) so switching
+timeframe or chart type only fetches what is not already loaded. Each
+ticker needs at most two downloads: an intraday base that serves 1D, 1W
+and 1M, and a daily base that serves 3M and longer. Every timeframe is a
+slice of its base, aggregated to the timeframe's resolution by
+bar_aggregator.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from api_client import StockAPI, CHART_TIMEFRAMES
+from bar_aggregator import aggregate_frame, can_aggregate
+from config import CHART_CONFIG
+from instrumentation import metrics
+
+
+def base_download(resolution: str, span: int) -> Tuple[str, int]:
+    """
+    The download that serves a timeframe's resolution and span
+
+    Returns:
+        Tuple[str, int]: Finnhub resolution and seconds of history to fetch
+    """
+    if CHART_CONFIG["aggregate"]:
+        for base, base_span in ((CHART_CONFIG["intraday_base"], CHART_CONFIG["intraday_base_span"]),
+                                (CHART_CONFIG["daily_base"], CHART_CONFIG["daily_base_span"])):
+            if base_span >= span and can_aggregate(base, resolution):
+                return base, base_span
+    return resolution, span
+
+
+class ChartSeriesStore:
+    """
+    Loaded chart frames with their age and the history they cover.
+
+    get() returns the same DataFrame object for a (ticker, timeframe) until
+    its data is refetched, so callers can compare by identity to decide
+    whether anything they built from it is still current.
+    """
+
+    def __init__(self, api: StockAPI = None, ttl: float = None, fallback_ttl: float = None):
+        self.api = api or StockAPI()
+        self.ttl = CHART_CONFIG["data_ttl"] if ttl is None else ttl
+        self.fallback_ttl = CHART_CONFIG["fallback_ttl"] if fallback_ttl is None else fallback_ttl
+        self._lock = threading.Lock()
+        # (ticker, resolution) -> {'frame', 'fetched', 'span', 'ttl'}
+        self._frames: Dict[Tuple[str, str], Dict] = {}
+        # (ticker, timeframe) -> (source frame, slice of it at the timeframe's resolution)
+        self._views: Dict[Tuple[str, str], Tuple[pd.DataFrame, pd.DataFrame]] = {}
+
+    def _fresh(self, entry: Dict, span: int, now: float) -> bool:
+        return now - entry['fetched'] < entry['ttl'] and entry['span'] >= span
+
+    def _lookup(self, ticker: str, timeframe: str):
+        """(timeframe span and resolution, base resolution and span, loaded base entry or None)"""
+        span, resolution = CHART_TIMEFRAMES.get(timeframe, CHART_TIMEFRAMES["3M"])
+        base, base_span = base_download(resolution, span)
+        with self._lock:
+            return (span, resolution), (base, base_span), self._frames.get((ticker.upper(), base))
+
+    def is_loaded(self, ticker: str, timeframe: str = "3M") -> bool:
+        """Whether get() can answer without fetching"""
+        (span, _), _, entry = self._lookup(ticker, timeframe)
+        return entry is not None and self._fresh(entry, span, time.time())
+
+    def get(self, ticker: str, timeframe: str = "3M") -> pd.DataFrame:
+        """
+        Candles for a ticker and timeframe, fetched only if no loaded frame covers them
+
+        Args:
+            ticker: Stock symbol
+            timeframe: Time period (1D, 1W, 1M, 3M, 6M, 1Y, 5Y)
+
+        Returns:
+            pd.DataFrame: OHLCV data at the timeframe's resolution, oldest first
+        """
+        ticker = ticker.upper()
+        if timeframe not in CHART_TIMEFRAMES:
+            timeframe = "3M"
+        (span, resolution), (base, base_span), entry = self._lookup(ticker, timeframe)
+        now = time.time()
+
+        if entry is None or not self._fresh(entry, span, now):
+            metrics.increment("chart_store.miss")
+            frame = self.api.get_candles(ticker, base, base_span, use_cache=False)
+            entry = {
+                'frame': frame,
+                'fetched': now,
+                'span': base_span,
+                'ttl': self.fallback_ttl if frame.attrs.get('dummy') else self.ttl
+            }
+            with self._lock:
+                self._frames[(ticker, base)] = entry
+            logging.debug(f"Chart store loaded {len(frame)} {base} bars for {ticker} ({timeframe})")
+        else:
+            metrics.increment("chart_store.hit")
+
+        frame = entry['frame']
+        with self._lock:
+            view = self._views.get((ticker, timeframe))
+            if view is not None and view[0] is frame:
+                return view[1]
+        if span < entry['span'] and not frame.empty:
+            # Frame indexes are naive UTC, at whole-second resolution on recent pandas
+            start = frame.index.searchsorted(pd.Timestamp(int(entry['fetched'] - span), unit='s'))
+            sliced = frame.iloc[start:]
+        else:
+            sliced = frame
+        # Generated fallback candles are always daily, whatever was asked for
+        source = "D" if frame.attrs.get('dummy') else base
+        if can_aggregate(source, resolution):
+            sliced = aggregate_frame(sliced, resolution, source)
+        with self._lock:
+            self._views[(ticker, timeframe)] = (frame, sliced)
+        return sliced
+
+    def invalidate(self, ticker: str = None):
+        """Drop loaded frames for one ticker, or for every ticker"""
+        with self._lock:
+            if ticker is None:
+                self._frames.clear()
+                self._views.clear()
+                return
+            ticker = ticker.upper()
+            for store in (self._frames, self._views):
+                for key in [key for key in store if key[0] == ticker]:
+                    del store[key]
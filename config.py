@@ -71,13 +71,17 @@ CHAT_MODEL = "llama3.2:1b"  # Add this line
 NEWS_API_KEY = os.getenv("NEWSAPI_KEY", "c91f9673406647e280aa6faf87ef892a")  # Use env var as primary source
 if not NEWS_API_KEY:
     raise ValueError("Please set a valid NEWSAPI_KEY in API.env")
-NEWS_API_URL = "https://newsapi.org/v2/everything"
+# Base URLs can be pointed at http_recorder's stand-in server for offline runs
+NEWS_API_URL = os.getenv("STOXALOTL_NEWS_API_URL", "https://newsapi.org/v2/everything")
 
 # Finnhub API Configuration
 FINNHUB_KEY = os.getenv("FINNHUB_KEY")
 if not FINNHUB_KEY:
     raise ValueError("Please set a valid FINNHUB_KEY in API.env")
-FINNHUB_API_URL = "https://finnhub.io/api/v1"  # Keep this for reference but use direct URLs in code
+FINNHUB_API_KEY = FINNHUB_KEY  # Name used by fetch_data, update_tickers and system_check
+FINNHUB_API_URL = os.getenv("STOXALOTL_FINNHUB_URL", "https://finnhub.io/api/v1")
+# Trade stream; market_stream's replay server stands in for it offline
+FINNHUB_WS_URL = os.getenv("STOXALOTL_FINNHUB_WS_URL", "wss://ws.finnhub.io")
 
 # Chart Configuration - More options
 CHART_CONFIG = {
@@ -87,7 +91,15 @@ CHART_CONFIG = {
     "candle_width": 0.7,           # Width of candlesticks (0-1)
     "grid_color": "#555555",        # Grid line color
     "axis_color": "#EEEEEE",        # Axis line and tick color
-    "label_color": "#EEEEEE"       # Axis label color
+    "label_color": "#EEEEEE",      # Axis label color
+    "data_ttl": 300,               # Seconds loaded candles are reused across timeframe/chart type switches
+    "fallback_ttl": 60,            # Seconds generated fallback candles are reused before retrying Finnhub
+    "max_series": 8,               # (ticker, timeframe) series whose graphics items the chart keeps
+    "aggregate": True,             # Build timeframes from one base download per ticker (bar_aggregator)
+    "intraday_base": "5",          # Finnhub resolution downloaded for 1D/1W/1M...
+    "intraday_base_span": 60 * 60 * 24 * 30,  # ...covering this many seconds
+    "daily_base": "D",             # Finnhub resolution downloaded for 3M and longer...
+    "daily_base_span": 60 * 60 * 24 * 365 * 5  # ...covering this many seconds
 }
 
 # UI Element Customization
@@ -119,6 +131,78 @@ DUMMY_DATA_CONFIG = {
     "base_price_range": (50, 250)  # Range of base prices for dummy data
 }
 
+# Batch analysis settings
+BATCH_CONFIG = {
+    "max_workers": 3,               # Tickers analyzed concurrently (provider queues still apply)
+    "news_articles": 5,             # Articles gathered per ticker
+    "result_ttl": 86400,            # Seconds a stored batch result is shown instead of re-running the LLM
+}
+
+# Home page sections: each is drawn from the persistent cache at launch and refreshed on its own timer
+HOME_PAGE_CONFIG = {
+    "news_refresh": 900,            # Seconds between market news refreshes
+    "recent_refresh": 120,          # Seconds between recently viewed quote refreshes
+    "market_analysis_refresh": 3600,  # Seconds between LLM market analysis refreshes
+}
+
+# Live market data poller (workers.MarketDataPoller)
+POLLER_CONFIG = {
+    "screener": "america",
+    "interval": "1d",
+    "exchanges": ["NASDAQ", "NYSE", "AMEX"],  # Tried in one request until a ticker's exchange is known
+    "symbols_per_request": 50,      # Symbols per batched TradingView request
+    "status_refresh": 600,          # Seconds between market status checks
+    "intervals": {                  # Seconds between polling rounds per market session
+        "regular": 5,
+        "pre-market": 30,
+        "post-market": 30,
+        "closed": 300,
+        "unknown": 30
+    }
+}
+
+# Watchlist on the home page (watchlist.WatchlistModel), quotes from the market data poller
+WATCHLIST_CONFIG = {
+    "max_symbols": 500,             # Tickers the watchlist accepts
+}
+
+# News lists on the home page and the news card (news_feed.NewsListView)
+NEWS_FEED_CONFIG = {
+    "max_articles": 500,            # Oldest articles are dropped past this
+    "market_articles": 20,          # Articles requested per market news refresh
+}
+
+# Local news store (news_store.NewsStore) answering StockAPI.get_news
+NEWS_STORE_CONFIG = {
+    "refresh_interval": 900,        # Seconds before NewsAPI is asked about the same query again
+    "retention_days": 30,           # Stored articles expire after this
+    "page_size": 50,                # Articles requested per NewsAPI call
+}
+
+# News providers behind the news store (news_aggregator.NewsAggregator)
+NEWS_AGGREGATOR_CONFIG = {
+    "newsapi_daily": 100,           # NewsAPI calls per UTC day (free tier)
+    "finnhub_per_minute": 20,       # Finnhub news calls per minute, leaving the rest of its quota for quotes
+    "exhausted_backoff": 3600,      # Seconds a provider is skipped after reporting a rate limit
+    "min_articles": 3,              # Fewer articles than this from one provider and the next one is asked too
+}
+
+# Live trade stream (market_stream.MarketStream)
+STREAM_CONFIG = {
+    "flush_interval": 0.25,         # Seconds of trades folded into one UI update per ticker
+    "reconnect_delay": 2,           # Seconds before the first reconnect attempt
+    "max_reconnect_delay": 60,      # Reconnect backoff doubles up to this many seconds
+    "connect_timeout": 10,          # Seconds allowed for the websocket handshake
+}
+
+# Exchange symbol list sync (update_tickers.sync_symbols)
+SYMBOL_SYNC_CONFIG = {
+    "exchanges": ["US", "NYSE", "NASDAQ", "AMEX"],  # Finnhub exchange codes, fetched concurrently
+    "max_workers": 4,               # Exchange downloads in flight at once (Finnhub limiter still applies)
+    "interval": 86400,              # Seconds between syncs run by the app
+    "check_interval": 3600,         # Seconds between checks whether a sync is due
+}
+
 # Application Defaults
 DEFAULTS = {
     "investment_amount": 10000,    # Default investment amount
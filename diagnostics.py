@@ -0,0 +1,260 @@
+"""
+Diagnostics Module
+Settings page that plots a rolling view of the app's throughput: per-provider
+request rate, token bucket levels and queue depth (from rate_limiter), the
+StockAPI cache hit ratio, per-stage latency percentiles (from
+instrumentation) and process memory.
+"""
+
+import os
+import sys
+import time
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+import pyqtgraph as pg
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QSplitter
+)
+
+from config import COLOR_PALETTES, FONT_FAMILY, FONT_SIZES
+from instrumentation import metrics
+from rate_limiter import get_rate_limiter_stats
+
+# Seconds between samples, and how many samples the plots keep (5 minutes)
+SAMPLE_INTERVAL = 1.0
+HISTORY = 300
+
+PROVIDER_COLORS = {
+    "finnhub": "#29b6f6",
+    "news_api": "#ffb74d",
+    "ollama": "#ba68c8",
+    "tradingview": "#81c784"
+}
+
+# Stages listed in the latency table, in pipeline order (label, span name)
+LATENCY_STAGES = [
+    ("Quote", "stock_api.get_stock"),
+    ("Metrics", "stock_api.get_financial_metrics"),
+    ("News", "stock_api.get_news"),
+    ("Chart data", "stock_api.get_chart_data"),
+    ("Finnhub HTTP", "http.finnhub"),
+    ("NewsAPI HTTP", "http.newsapi"),
+    ("Finnhub queue wait", "queue.finnhub.wait"),
+    ("Finnhub token wait", "limiter.finnhub.wait"),
+    ("NewsAPI queue wait", "queue.newsapi.wait"),
+    ("Ollama queue wait", "queue.ollama.wait"),
+    ("TradingView queue wait", "queue.tradingview.wait"),
+    ("AI generation", "ai.generate"),
+    ("AI analysis", "ai.analyze"),
+    ("Formatting", "formatter.format_enhanced_analysis"),
+    ("Chart render", "chart.update_chart")
+]
+
+
+def memory_usage_mb() -> Optional[float]:
+    """Resident memory of this process in MB, or None if it can't be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        import resource
+        # Peak rather than current, but the best the stdlib offers elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return None
+
+
+class DiagnosticsSampler:
+    """
+    Turns the cumulative limiter and cache counters into per-interval series.
+    """
+
+    def __init__(self, history: int = HISTORY):
+        self.times = deque(maxlen=history)
+        self.series: Dict[str, deque] = {}
+        self.history = history
+        self._last_requests: Dict[str, int] = {}
+        self._last_cache = (0, 0)
+        self._last_time: Optional[float] = None
+        self.origin = time.time()
+
+    def _append(self, name: str, value):
+        if name not in self.series:
+            # Pad so every series lines up with self.times
+            self.series[name] = deque([float('nan')] * (len(self.times) - 1), maxlen=self.history)
+        self.series[name].append(value)
+
+    def sample(self):
+        now = time.time()
+        elapsed = now - self._last_time if self._last_time else None
+        self._last_time = now
+        self.times.append(now - self.origin)
+
+        for provider, stats in get_rate_limiter_stats().items():
+            made = stats['requests_made']
+            previous = self._last_requests.get(provider)
+            self._last_requests[provider] = made
+            rate = (made - previous) / elapsed if elapsed and previous is not None else 0.0
+            self._append(f"rate.{provider}", rate)
+            self._append(f"tokens.{provider}", stats['current_tokens'])
+            self._append(f"queue.{provider}", stats.get('queue_depth', 0))
+
+        hits = metrics.counters.get("stock_api.cache_hit", 0)
+        misses = metrics.counters.get("stock_api.cache_miss", 0)
+        delta_hits, delta_misses = hits - self._last_cache[0], misses - self._last_cache[1]
+        self._last_cache = (hits, misses)
+        lookups = delta_hits + delta_misses
+        self._append("cache.hit_ratio", delta_hits / lookups * 100 if lookups else float('nan'))
+        self._append("cache.total_hit_ratio", hits / (hits + misses) * 100 if hits + misses else float('nan'))
+
+        memory = memory_usage_mb()
+        self._append("memory", memory if memory is not None else float('nan'))
+
+
+class DiagnosticsPage(QWidget):
+    """Settings stack page with live throughput plots and a latency table"""
+
+    back_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.theme = COLOR_PALETTES["Dark"]
+        self.sampler = DiagnosticsSampler()
+        self.curves = {}
+        self._setup_ui()
+
+        # Sampling is cheap, so it runs while the page exists; plots and the
+        # table only redraw while the page is visible
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(SAMPLE_INTERVAL * 1000))
+        self.timer.timeout.connect(self._tick)
+        self.timer.start()
+        self._tick()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(0, 0, 0, 10)
+        back_button = QPushButton("← Back to Settings")
+        back_button.setStyleSheet("""
+            QPushButton {
+                background-color: transparent;
+                border: none;
+                color: #BB86FC;
+                font-weight: bold;
+                text-align: left;
+            }
+            QPushButton:hover {
+                color: #A370E0;
+            }
+        """)
+        back_button.clicked.connect(self.back_requested.emit)
+
+        title_label = QLabel("Diagnostics")
+        title_label.setFont(QFont(FONT_FAMILY, FONT_SIZES["header"], QFont.Bold))
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet(f"color: {self.theme['text']};")
+
+        header_layout.addWidget(back_button)
+        header_layout.addStretch(1)
+        header_layout.addWidget(title_label)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.summary_label)
+        layout.addLayout(header_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+
+        self.plots = pg.GraphicsLayoutWidget()
+        self.plots.setBackground(self.theme['background'])
+        rate_plot = self._add_plot("Requests / s", 0, 0)
+        token_plot = self._add_plot("Tokens available", 0, 1)
+        queue_plot = self._add_plot("Queue depth", 1, 0)
+        cache_plot = self._add_plot("Cache hit ratio (%)", 1, 1)
+        memory_plot = self._add_plot("Memory (MB)", 2, 0, colspan=2)
+        cache_plot.setYRange(0, 100)
+
+        for provider, color in PROVIDER_COLORS.items():
+            pen = pg.mkPen(color, width=1.5)
+            self.curves[f"rate.{provider}"] = rate_plot.plot(pen=pen, name=provider)
+            self.curves[f"tokens.{provider}"] = token_plot.plot(pen=pen, name=provider)
+            self.curves[f"queue.{provider}"] = queue_plot.plot(pen=pen, name=provider)
+        self.curves["cache.hit_ratio"] = cache_plot.plot(pen=pg.mkPen("#29b6f6", width=1.5), name="interval")
+        self.curves["cache.total_hit_ratio"] = cache_plot.plot(
+            pen=pg.mkPen("#aaaaaa", width=1, style=Qt.DashLine), name="since launch"
+        )
+        self.curves["memory"] = memory_plot.plot(pen=pg.mkPen("#ef5350", width=1.5))
+        splitter.addWidget(self.plots)
+
+        self.latency_table = QTableWidget(0, 6)
+        self.latency_table.setHorizontalHeaderLabels(["Stage", "Count", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"])
+        self.latency_table.verticalHeader().setVisible(False)
+        self.latency_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.latency_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        splitter.addWidget(self.latency_table)
+        splitter.setSizes([500, 250])
+
+        layout.addWidget(splitter)
+
+    def _add_plot(self, title: str, row: int, col: int, colspan: int = 1):
+        plot = self.plots.addPlot(row=row, col=col, colspan=colspan, title=title)
+        plot.showGrid(x=True, y=True, alpha=0.2)
+        plot.setMouseEnabled(x=False, y=False)
+        plot.setLabel('bottom', 's')
+        if row == 0 and col == 0:
+            plot.addLegend(offset=(5, 5))
+        return plot
+
+    def _tick(self):
+        try:
+            self.sampler.sample()
+        except Exception as e:
+            logging.error(f"Diagnostics sampling failed: {e}")
+            return
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self):
+        """Redraw the plots and latency table from the collected samples"""
+        times = list(self.sampler.times)
+        for name, curve in self.curves.items():
+            values = self.sampler.series.get(name)
+            if values is not None:
+                curve.setData(times, list(values), connect="finite")
+
+        snapshot = metrics.snapshot()
+        rows = [(label, snapshot[name]) for label, name in LATENCY_STAGES
+                if snapshot.get(name, {}).get('count')]
+        self.latency_table.setRowCount(len(rows))
+        for row, (label, stats) in enumerate(rows):
+            values = [label, str(stats['count'])] + [f"{stats[key]:.1f}" for key in ('p50', 'p95', 'p99', 'max')]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.latency_table.setItem(row, col, item)
+
+        memory = self.sampler.series.get("memory")
+        total_ratio = self.sampler.series.get("cache.total_hit_ratio")
+        summary = []
+        if memory and memory[-1] == memory[-1]:
+            summary.append(f"{memory[-1]:.0f} MB")
+        if total_ratio and total_ratio[-1] == total_ratio[-1]:
+            summary.append(f"cache hits {total_ratio[-1]:.0f}%")
+        self.summary_label.setText(" · ".join(summary))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
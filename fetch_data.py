@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Union, Tuple, Any
 
 from config import FINNHUB_API_KEY, FINNHUB_API_URL
 from rate_limiter import execute_finnhub_request
+from logging_setup import SAMPLED
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -39,9 +40,9 @@ def make_finnhub_request(endpoint: str, params: Dict, use_header_auth: bool = Fa
     params['token'] = FINNHUB_API_KEY
     
     # Construct full URL
-    url = f"https://finnhub.io/api/v1/{endpoint}"
+    url = f"{FINNHUB_API_URL}/{endpoint}"
     
-    logging.info(f"Making Finnhub request to: {url}")
+    logging.debug(f"Making Finnhub request to: {url}", extra=SAMPLED)
     logging.debug(f"Request params: {params}")
     
     try:
@@ -138,14 +139,18 @@ def search_symbol(query: str) -> List[Dict]:
     params = {'q': query}
     return execute_finnhub_request(make_finnhub_request, 'search', params)
 
-def get_market_status() -> Dict[str, Any]:
+def get_market_status(exchange: str = "US") -> Dict[str, Any]:
     """
     Get current market status (whether market is open or closed)
     
+    Args:
+        exchange: Exchange code (Finnhub requires one; "US" covers the US markets)
+        
     Returns:
         Dict: Contains market status information including whether market is open
+        and the current session ("pre-market", "regular", "post-market" or None)
     """
-    return execute_finnhub_request(make_finnhub_request, 'stock/market-status', {})
+    return execute_finnhub_request(make_finnhub_request, 'stock/market-status', {'exchange': exchange})
 
 def get_market_holidays() -> Dict[str, Any]:
     """
@@ -410,7 +415,7 @@ def format_candle_data_to_dataframe(candle_data: Dict) -> pd.DataFrame:
         'Low': lows,
         'Close': closes,
         'Volume': volumes
-    }, index=pd.DatetimeIndex([datetime.fromtimestamp(t) for t in timestamps]))
+    }, index=pd.to_datetime(timestamps, unit='s'))  # Naive UTC, as StockAPI.get_candles
     
     return df
 
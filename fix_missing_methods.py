@@ -114,36 +114,8 @@ except ImportError:
         sys.modules['sip'] = DummySip()
         logging.warning("Using dummy sip implementation with limited functionality")
 
-# Add a safe wrapper function for widget operations
-def safe_widget_call(widget, method_name, *args, **kwargs):
-    """
-    Safely call a method on a widget only if it still exists
-    
-    Args:
-        widget: The Qt widget
-        method_name: Name of the method to call
-        *args, **kwargs: Arguments to pass to the method
-        
-    Returns:
-        Result of the method call or None if widget is deleted
-    """
-    if widget is None:
-        return None
-        
-    # Check if the widget still exists
-    try:
-        # Try to access a common property as a test
-        # This will raise an exception if the widget is deleted
-        _ = widget.objectName()
-        
-        # If we get here, the widget exists, so call the method
-        if hasattr(widget, method_name):
-            method = getattr(widget, method_name)
-            return method(*args, **kwargs)
-        return None
-    except (RuntimeError, AttributeError, TypeError):
-        # Widget is deleted or invalid
-        return None
+# The safe wrapper lives in widget_utils; re-exported here for existing imports
+from widget_utils import safe_widget_call
 
 # Make the function available at module level
 import sys
@@ -1,6 +1,7 @@
 # helpers.py
 import re
 from config import COLOR_PALETTES, FONT_FAMILY, FONT_SIZES
+from sentiment import get_scorer, sentiment_color, sentiment_label
 from ticker_utils import (
     validate_ticker, 
     normalize_ticker, 
@@ -39,20 +40,7 @@ def parse_recommendations(text):
 
 def analysis_color(text, theme="Dark"):
     """Determine sentiment color based on text content"""
-    text = text.lower()
-    
-    positive_words = ["buy", "positive", "bullish", "uptrend", "growth", "opportunity"]
-    negative_words = ["sell", "negative", "bearish", "downtrend", "caution", "risk"]
-    
-    positive_count = sum(1 for word in positive_words if word in text)
-    negative_count = sum(1 for word in negative_words if word in text)
-    
-    if positive_count > negative_count:
-        return "#4CAF50"  # Green
-    elif negative_count > positive_count:
-        return "#F44336"  # Red
-    else:
-        return "#FFD700"  # Yellow/gold for neutral
+    return sentiment_color(get_scorer().score(text), theme)
 
 def remove_think_tags(text):
     """Remove <thinking> and <think> tags from text"""
@@ -181,4 +169,116 @@ def extract_predictions(text):
     predictions['year']['value'] = year_match.group(1) if year_match else None
     predictions['year']['confidence'] = year_conf.group(1) if year_conf else None
     
-    return predictions
\ No newline at end of file
+    return predictions
+
+def news_context(news, limit=10):
+    """
+    Summarize recent headlines and their local sentiment scores for the LLM.
+    
+    Args:
+        news (list): Article dicts, newest first, with 'sentiment' where the news store scored them
+        limit (int): Headlines to include
+        
+    Returns:
+        str: Headline lines and the average score, or "" if there is no news
+    """
+    articles = [article for article in news or [] if article.get('title') and 'sentiment' in article][:limit]
+    if not articles:
+        return ""
+    lines = [f"- [{article['sentiment']:+.2f}] {article['title']}" for article in articles]
+    average = sum(article['sentiment'] for article in articles) / len(articles)
+    return (
+        "Recent headlines with sentiment scores from -1 (negative) to +1 (positive):\n"
+        + "\n".join(lines)
+        + f"\nAverage headline sentiment: {average:+.2f} ({sentiment_label(average)})"
+    )
+
+# Finnhub metric keys given to the LLM, with their labels
+PROMPT_METRICS = [
+    ("peTTM", "P/E (TTM)"),
+    ("peNormalizedAnnual", "P/E (normalized annual)"),
+    ("pbAnnual", "P/B"),
+    ("psTTM", "P/S (TTM)"),
+    ("dividendYieldIndicatedAnnual", "Dividend yield (%)"),
+    ("52WeekHigh", "52-week high"),
+    ("52WeekLow", "52-week low")
+]
+
+def metrics_context(metrics):
+    """
+    List the financial metrics that are known, for the LLM.
+    
+    Args:
+        metrics (dict): StockAPI.get_financial_metrics response ({'metric': {...}})
+        
+    Returns:
+        str: One line per metric, or "" if none are known
+    """
+    values = (metrics or {}).get('metric') or {}
+    lines = [f"- {label}: {values[key]:.2f}" for key, label in PROMPT_METRICS
+             if isinstance(values.get(key), (int, float))]
+    if not lines:
+        return ""
+    return "Key financial metrics:\n" + "\n".join(lines)
+
+def build_analysis_prompt(ticker, current_price, news=None, metrics=None):
+    """
+    Build the combined investment-analysis prompt sent to the LLM.
+    
+    Args:
+        ticker (str): Stock symbol
+        current_price (float): Latest traded price
+        news (list): Recent articles to summarize under NEWS IMPACT (optional)
+        metrics (dict): Financial metrics for FINANCIAL SITUATION (optional)
+        
+    Returns:
+        str: Prompt with the sections the analysis formatter expects
+    """
+    headlines = news_context(news)
+    financials = metrics_context(metrics)
+    return f"""
+            Analyze {ticker} stock and provide a comprehensive investment analysis with the following sections:
+            
+            STOCK OVERVIEW:
+            Provide a brief overview of {ticker} including what they do, market position, and current price trend.
+            Current stock price: ${current_price:.2f}
+            
+            FINANCIAL SITUATION:
+            Analyze key financial metrics, revenue trends, profitability, and financial health.
+            {financials}
+            
+            NEWS IMPACT:
+            Summarize how recent news and events affect the stock's outlook.
+            {headlines}
+            
+            TRAJECTORY ANALYSIS:
+            Evaluate the stock's recent performance trend and technical indicators.
+            
+            PREDICTION:
+            Forecast end of week price: $XX.XX (with confidence level)
+            Forecast end of month price: $XX.XX (with confidence level)
+            Forecast end of year price: $XX.XX (with confidence level)
+            
+            For each prediction, provide a specific price target and confidence level percentage.
+            Base predictions on financial data, market trends, and recent news.
+            """
+
+def skeleton_html(lines=4, theme="Dark"):
+    """
+    Build grey placeholder bars shown in a text section while its data loads.
+    
+    Args:
+        lines (int): Number of placeholder lines
+        theme (str): Color palette to take the bar color from
+        
+    Returns:
+        str: HTML for a QTextEdit
+    """
+    color = COLOR_PALETTES.get(theme, COLOR_PALETTES["Dark"])["border"]
+    # Vary the widths so the block reads as text rather than a table
+    widths = [92, 78, 85, 60]
+    bars = []
+    for i in range(lines):
+        bar = "&nbsp;" * widths[i % len(widths)]
+        bars.append(f'<p><span style="background-color: {color}; color: {color};">{bar}</span></p>')
+    return "".join(bars)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+"""
+HTTP Recorder Module
+Local stand-in server for the Finnhub and NewsAPI endpoints used by StockAPI
+and fetch_data.
+
+- record: forwards every request to the real provider and appends the
+  request/response pair, with its latency, to a JSON lines file
+- replay: answers from such a file without touching the network,
+  optionally sleeping for the recorded latency
+
+The app is pointed at the server through STOXALOTL_FINNHUB_URL and
+STOXALOTL_NEWS_API_URL (see config.py), which must be set before config is
+imported:
+
+    python http_recorder.py record --file data/recordings/session.jsonl
+    python http_recorder.py replay --file data/recordings/session.jsonl --latency 1.0
+
+API keys are stripped from recorded requests, so a replay needs no keys.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "recordings")
+
+# Path prefix on the stand-in server -> real base URL
+UPSTREAMS = {
+    "finnhub": "https://finnhub.io/api/v1",
+    "newsapi": "https://newsapi.org/v2"
+}
+
+# Credentials are never written to a recording or used for matching
+AUTH_PARAMS = {"token", "apiKey", "apikey"}
+AUTH_HEADERS = {"X-Api-Key", "X-Finnhub-Token"}
+
+# Date-range parameters move every day; replay falls back to ignoring them
+VOLATILE_PARAMS = {"from", "to"}
+
+# Headers forwarded to the provider in record mode
+FORWARD_HEADERS = {"Accept", "Content-Type", "User-Agent"} | AUTH_HEADERS
+
+
+def _request_key(method: str, path: str, params: List[Tuple[str, str]], ignore=frozenset()) -> str:
+    kept = sorted((k, v) for k, v in params if k not in AUTH_PARAMS and k not in ignore)
+    return f"{method} {path}?" + "&".join(f"{k}={v}" for k, v in kept)
+
+
+class Recording:
+    """
+    Recorded request/response pairs, indexed for replay.
+
+    Lookup tries the exact request, then the request without date-range
+    parameters, then any request to the same path. Repeated requests cycle
+    through their recorded responses in order, so replays are deterministic.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict] = []
+        self._indexes: Tuple[Dict[str, List[Dict]], ...] = ({}, {}, {})
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def _index(self, entry: Dict):
+        self.entries.append(entry)
+        params = [tuple(p) for p in entry['params']]
+        exact, loose, by_path = self._indexes
+        exact.setdefault(_request_key(entry['method'], entry['path'], params), []).append(entry)
+        loose.setdefault(_request_key(entry['method'], entry['path'], params, VOLATILE_PARAMS), []).append(entry)
+        by_path.setdefault(f"{entry['method']} {entry['path']}", []).append(entry)
+
+    def find(self, method: str, path: str, params: List[Tuple[str, str]]) -> Optional[Dict]:
+        keys = (
+            _request_key(method, path, params),
+            _request_key(method, path, params, VOLATILE_PARAMS),
+            f"{method} {path}"
+        )
+        with self._lock:
+            for index, key in zip(self._indexes, keys):
+                matches = index.get(key)
+                if matches:
+                    served = self._served.get(key, 0)
+                    self._served[key] = served + 1
+                    return matches[served % len(matches)]
+        return None
+
+    def append(self, entry: Dict):
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+            self._index(entry)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StandInServer"
+
+    def log_message(self, format, *args):
+        logging.debug(f"http_recorder: {format % args}")
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        parts = urlsplit(self.path)
+        prefix, _, rest = parts.path.lstrip("/").partition("/")
+        if prefix not in UPSTREAMS:
+            self._send(404, {"error": f"Unknown upstream '{prefix}'"})
+            return
+        path = f"/{prefix}/{rest}"
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+
+        if self.server.mode == "record":
+            self._record(prefix, rest, path, params, body)
+        else:
+            self._replay(path, params)
+
+    def _record(self, prefix: str, rest: str, path: str, params, body):
+        import requests
+
+        headers = {k: v for k, v in self.headers.items() if k in FORWARD_HEADERS}
+        start = time.perf_counter()
+        try:
+            response = requests.request(self.command, f"{UPSTREAMS[prefix]}/{rest}", params=params,
+                                        headers=headers, data=body, timeout=30)
+        except Exception as e:
+            self._send(502, {"error": str(e)})
+            return
+        elapsed = time.perf_counter() - start
+
+        self.server.recording.append({
+            'method': self.command,
+            'path': path,
+            'params': [(k, v) for k, v in params if k not in AUTH_PARAMS],
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', 'application/json'),
+            'body': response.text,
+            'elapsed': round(elapsed, 4),
+            'recorded': time.time()
+        })
+        self._send(response.status_code, response.text, response.headers.get('Content-Type'))
+
+    def _replay(self, path: str, params):
+        entry = self.server.recording.find(self.command, path, params)
+        if entry is None:
+            logging.warning(f"http_recorder: no recording for {self.command} {path}")
+            self._send(404, {"error": f"No recording for {self.command} {path}"})
+            return
+        if self.server.latency_scale:
+            time.sleep(entry.get('elapsed', 0) * self.server.latency_scale)
+        self._send(entry['status'], entry['body'], entry.get('content_type'))
+
+    def _send(self, status: int, body, content_type: Optional[str] = None):
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Threaded local HTTP server that records or replays provider traffic.
+
+    Usable as a context manager; the server runs on a daemon thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, recording_file: str, mode: str = "replay", port: int = 0,
+                 latency_scale: float = 0.0, host: str = "127.0.0.1"):
+        """
+        Args:
+            recording_file: JSON lines file to append to (record) or serve from (replay)
+            mode: "record" or "replay"
+            port: Port to listen on (0 = any free port)
+            latency_scale: Replay delay as a multiple of the recorded latency (0 = none)
+            host: Interface to bind
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        super().__init__((host, port), _Handler)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.recording = Recording(recording_file)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point config.py at this server"""
+        env = {
+            "STOXALOTL_FINNHUB_URL": f"{self.base_url}/finnhub",
+            "STOXALOTL_NEWS_API_URL": f"{self.base_url}/newsapi/everything"
+        }
+        if self.mode == "replay":
+            # config.py refuses to load without keys; replays don't need real ones
+            env["FINNHUB_KEY"] = os.getenv("FINNHUB_KEY") or "replay"
+            env["NEWSAPI_KEY"] = os.getenv("NEWSAPI_KEY") or "replay"
+        return env
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="HTTPStandIn", daemon=True)
+        self._thread.start()
+        logging.info(f"http_recorder {self.mode}ing at {self.base_url} ({len(self.recording.entries)} recorded requests)")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record or replay Finnhub/NewsAPI traffic")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--file", default=os.path.join(RECORDINGS_DIR, "session.jsonl"), help="Recording file")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Replay delay as a multiple of the recorded latency (0 = respond immediately)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = StandInServer(args.file, args.mode, args.port, args.latency).start()
+    print("Point the app at this server before starting it:")
+    for name, value in server.env().items():
+        print(f"  {name}={value}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Instrumentation Module
+Lightweight spans and latency histograms for the data pipeline: provider
+calls, request queue and token waits, LLM generation, analysis formatting
+and chart rendering. Recording a span costs two perf_counter() calls and a
+bucket increment, so it is safe to leave on in hot paths.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+# Exported snapshots are written here
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "metrics")
+
+# Histogram resolution: bucket boundaries grow by this factor, so any
+# reported percentile is within ~1% of the true value
+BUCKET_GROWTH = 1.02
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+# Values are bucketed in microseconds; anything below 1 us shares bucket 0
+_MIN_VALUE_US = 1.0
+
+# Completed spans kept for export
+RECENT_SPANS = 2000
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (HDR-style).
+
+    Memory is bounded by the value range rather than the sample count: a
+    span from 1 us to 1 hour needs under 1,100 buckets. Percentiles are read
+    from the bucket upper bounds, so they never under-report.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        micros = seconds * 1e6
+        if micros <= _MIN_VALUE_US:
+            return 0
+        return int(math.log(micros / _MIN_VALUE_US) / _LOG_GROWTH) + 1
+
+    @staticmethod
+    def _bucket_upper(index: int) -> float:
+        """Upper bound of a bucket in seconds"""
+        return _MIN_VALUE_US * BUCKET_GROWTH ** index / 1e6
+
+    def record(self, seconds: float):
+        index = self._bucket(seconds)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Value in seconds at or below which p percent of samples fall (None if empty)"""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, math.ceil(self.count * p / 100.0))
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= target:
+                    # Clamp to the observed range so p100 equals the real max
+                    return min(max(self._bucket_upper(index), self.min), self.max)
+            return self.max
+
+    def snapshot(self) -> Dict:
+        """Summary in milliseconds: count, mean, min, p50, p95, p99, max"""
+        if not self.count:
+            return {'count': 0}
+        to_ms = lambda v: round(v * 1000, 3)
+        return {
+            'count': self.count,
+            'mean': to_ms(self.total / self.count),
+            'min': to_ms(self.min),
+            'p50': to_ms(self.percentile(50)),
+            'p95': to_ms(self.percentile(95)),
+            'p99': to_ms(self.percentile(99)),
+            'max': to_ms(self.max)
+        }
+
+
+class Metrics:
+    """
+    Registry of named latency histograms plus a ring buffer of recent spans.
+
+    Span names are dotted by layer, e.g. "stock_api.get_stock",
+    "queue.finnhub.wait", "ai.analyze", "chart.update_chart". Plain event
+    counts (cache hits and misses) are kept alongside as counters.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.recent: deque = deque(maxlen=RECENT_SPANS)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name: str, seconds: float, parent: Optional[str] = None, error: bool = False):
+        """Record one measurement (used directly for waits that aren't a code block)"""
+        self.histogram(name).record(seconds)
+        self.recent.append({
+            'name': name,
+            'end': round(time.time(), 3),
+            'ms': round(seconds * 1000, 3),
+            'parent': parent,
+            'thread': threading.current_thread().name,
+            'error': error
+        })
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block; nested spans remember their parent"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            stack.pop()
+            self.record(name, time.perf_counter() - start, parent, error)
+
+    def timed(self, name: str):
+        """Decorator form of span()"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def percentile(self, name: str, p: float) -> Optional[float]:
+        histogram = self.histograms.get(name)
+        return histogram.percentile(p) if histogram else None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Summaries of every histogram, keyed by span name"""
+        with self._lock:
+            names = sorted(self.histograms)
+        return {name: self.histograms[name].snapshot() for name in names}
+
+    def export(self, path: Optional[str] = None, spans: bool = True) -> str:
+        """
+        Write the histogram summaries (and recent spans) to a JSON file
+
+        Args:
+            path: Output file (default: data/metrics/metrics_<timestamp>.json)
+            spans: Include the recent span log
+
+        Returns:
+            str: The path written
+        """
+        if path is None:
+            path = os.path.join(METRICS_DIR, f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        # A bare file name ("--metrics out.json") goes in the working directory
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {
+            'started': self.started,
+            'exported': time.time(),
+            'histograms': self.snapshot(),
+            'counters': dict(self.counters)
+        }
+        if spans:
+            data['spans'] = list(self.recent)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+        logging.info(f"Exported {len(data['histograms'])} latency histograms to {path}")
+        return path
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+            self.recent.clear()
+            self.started = time.time()
+
+
+# Shared registry used across the app
+metrics = Metrics()
+span = metrics.span
+timed = metrics.timed
+
+
+def format_p95(names: Dict[str, str]) -> str:
+    """
+    One-line p95 summary for the status bar
+
+    Args:
+        names: label -> span name, e.g. {"API": "stock_api.get_stock"}
+
+    Returns:
+        str: e.g. "p95 API 120ms · AI 4.2s" (spans without samples are skipped)
+    """
+    parts: List[str] = []
+    for label, name in names.items():
+        value = metrics.percentile(name, 95)
+        if value is None:
+            continue
+        parts.append(f"{label} {value * 1000:.0f}ms" if value < 1 else f"{label} {value:.1f}s")
+    return ("p95 " + " · ".join(parts)) if parts else ""
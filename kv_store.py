@@ -0,0 +1,223 @@
+"""
+Key-Value Store Module
+Small persistent key-value store backed by an append-only JSON lines log.
+Reads are served from memory; writes are buffered and appended in batches,
+and the log is compacted atomically once it is mostly superseded records.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Compact once the log holds this many times more records than live keys
+COMPACT_RATIO = 4
+# ...but never bother for logs smaller than this
+COMPACT_MIN_RECORDS = 1000
+
+
+class AppendOnlyKVStore:
+    """
+    Persistent dict with per-entry expiry.
+
+    Each set() or delete() becomes one JSON line ({"k", "v", "e"} or {"k", "d"})
+    appended to the log. Lines are buffered and written together flush_delay
+    seconds after the first unflushed change, or as soon as max_pending changes
+    have piled up. Loading replays the log; a torn last line from a crash is
+    skipped. Compaction rewrites only the live entries to a temporary file and
+    moves it into place, so the log on disk is always complete.
+    """
+
+    def __init__(self, path: str, flush_delay: float = 2.0, max_pending: int = 500):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: Log file path
+            flush_delay: Seconds to wait for more changes before writing
+            max_pending: Write immediately once this many changes are buffered
+        """
+        self.path = path
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._pending: List[str] = []
+        self._records = 0
+        self._torn = False
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+        self._load()
+        # A torn last line would swallow the next append, so rewrite the log first
+        if self._torn or self._should_compact():
+            self.compact()
+        atexit.register(self.close)
+
+    def _load(self):
+        """Replay the log into memory"""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    self._torn = not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Skipping corrupt record in {os.path.basename(self.path)}")
+                        continue
+                    self._records += 1
+                    key = record.get('k')
+                    if key is None:
+                        continue
+                    if record.get('d'):
+                        self._data.pop(key, None)
+                        continue
+                    expires = record.get('e')
+                    if expires is not None and expires <= now:
+                        self._data.pop(key, None)
+                    else:
+                        self._data[key] = (record.get('v'), expires)
+        except Exception as e:
+            logging.error(f"Error loading {self.path}: {e}")
+        logging.info(f"Loaded {len(self._data)} entries from {os.path.basename(self.path)} ({self._records} records)")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value for key, or default if it is missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires = entry
+        if expires is not None and expires <= time.time():
+            return default
+        return value
+
+    def items(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        """Live (key, value) pairs whose key starts with prefix"""
+        now = time.time()
+        with self._lock:
+            entries = list(self._data.items())
+        for key, (value, expires) in entries:
+            if key.startswith(prefix) and (expires is None or expires > now):
+                yield key, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Entry key
+            value: Any JSON-serializable value
+            ttl: Seconds until the entry expires (None = never)
+        """
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._put(key, value, expires)
+
+    def update(self, key: str, value: Any) -> bool:
+        """
+        Replace the value of a live entry, keeping when it expires.
+
+        Returns:
+            bool: False (and nothing stored) if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+                return False
+            self._put(key, value, entry[1])
+            return True
+
+    def _put(self, key: str, value: Any, expires: Optional[float]):
+        """Store a value with an absolute expiry; caller holds the lock"""
+        record = {'k': key, 'v': value}
+        if expires is not None:
+            record['e'] = round(expires)
+        self._data[key] = (value, expires)
+        self._append(record)
+
+    def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add amount to an integer entry (missing counts as 0) and return the new value"""
+        with self._lock:
+            value = self.get(key, 0) + amount
+            self.set(key, value, ttl)
+            return value
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._append({'k': key, 'd': 1})
+
+    def _append(self, record: Dict):
+        """Buffer a record and make sure a flush is coming; caller holds the lock"""
+        self._pending.append(json.dumps(record, separators=(',', ':')))
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Append all buffered records to the log in one write"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write("\n".join(lines) + "\n")
+                self._records += len(lines)
+            except Exception as e:
+                logging.error(f"Error writing {self.path}: {e}")
+                # Keep the records so the next flush retries them
+                self._pending = lines + self._pending
+                return
+            if self._should_compact():
+                self.compact()
+
+    def _should_compact(self) -> bool:
+        return self._records >= COMPACT_MIN_RECORDS and self._records > COMPACT_RATIO * max(len(self._data), 1)
+
+    def compact(self):
+        """Rewrite the log with only the live entries"""
+        with self._lock:
+            now = time.time()
+            live = {k: (v, e) for k, (v, e) in self._data.items() if e is None or e > now}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    for key, (value, expires) in live.items():
+                        record = {'k': key, 'v': value}
+                        if expires is not None:
+                            record['e'] = round(expires)
+                        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logging.error(f"Error compacting {self.path}: {e}")
+                return
+            logging.info(f"Compacted {os.path.basename(self.path)}: {self._records} records -> {len(live)}")
+            # The rewritten log already reflects anything still buffered
+            self._data = live
+            self._records = len(live)
+            self._pending = []
+
+    def close(self):
+        """Write anything still buffered"""
+        self.flush()
@@ -0,0 +1,237 @@
+"""
+Logging Setup Module
+Application-wide logging: callers only put records on a queue, and a listener
+thread formats and writes them. The log file is JSON lines, rotated by size
+and at midnight, and the log directory is kept under a total size budget.
+Hot-path call sites opt in to sampling (extra=SAMPLED) so a hot loop can't
+flood the log.
+"""
+
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+LOG_FILE = os.path.join(LOG_DIR, "stoxalotl.log")
+
+# Rotation and retention
+MAX_FILE_BYTES = 5 * 1024 * 1024    # Roll over once the current file reaches this size...
+ROTATE_WHEN = "midnight"            # ...or at this time, whichever comes first
+BACKUP_COUNT = 7                    # Rotated files kept
+MAX_TOTAL_BYTES = 25 * 1024 * 1024  # Oldest files in LOG_DIR are deleted beyond this
+
+# Sampling: each sampled call site may log this many INFO/DEBUG records per window
+SAMPLE_BURST = 20
+SAMPLE_WINDOW = 60.0
+
+# Pass as extra= from a hot-path call site to have its records sampled
+SAMPLED = {'sample': True}
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "suppressed", "sample"}
+
+# Arguments that can't change between the logging call and the listener formatting the record
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'where': f"{record.module}:{record.lineno}",
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate limit INFO and DEBUG records per call site, for call sites that log
+    with extra=SAMPLED.
+
+    Each such (file, line) may emit `burst` records per `window` seconds; the
+    rest are dropped before they are queued. The first record let through
+    after a quiet period carries a `suppressed` count. Warnings, errors and
+    records without the flag always pass.
+    """
+
+    def __init__(self, burst: int = SAMPLE_BURST, window: float = SAMPLE_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites: Dict[Tuple[str, int], list] = {}  # site -> [window start, count, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, 'sample', False):
+            return True
+        site = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._sites[site] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records without formatting them.
+
+    The stock handler formats every record on the calling thread so it can be
+    pickled; our queue never leaves the process, so formatting is left to the
+    listener thread and the caller only pays for creating the record. Only
+    records whose arguments could change before the listener gets to them
+    (dicts, lists, objects) have their message rendered here.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        # A lone dict argument arrives as args itself, and is mutable
+        if args and (isinstance(args, dict) or not all(isinstance(value, _IMMUTABLE_ARGS) for value in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """Rotates at the scheduled time or when the file grows past max_bytes"""
+
+    def __init__(self, filename: str, max_bytes: int = MAX_FILE_BYTES, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes and self.stream is not None:
+            self.stream.seek(0, 2)
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+    def rotation_filename(self, default_name: str) -> str:
+        # Size rollovers can happen several times a day, so the dated name
+        # may already exist; add a counter rather than overwrite it
+        name = default_name
+        counter = 1
+        while os.path.exists(name):
+            name = f"{default_name}.{counter}"
+            counter += 1
+        return name
+
+    def doRollover(self):
+        super().doRollover()
+        prune_logs(os.path.dirname(self.baseFilename), keep=self.baseFilename)
+
+
+def prune_logs(log_dir: str = LOG_DIR, max_total_bytes: int = MAX_TOTAL_BYTES, keep: str = LOG_FILE):
+    """Delete the oldest log files until the directory fits the size budget"""
+    try:
+        files = [os.path.join(log_dir, name) for name in os.listdir(log_dir) if ".log" in name]
+    except OSError:
+        return
+    files = [path for path in files if os.path.isfile(path) and os.path.abspath(path) != os.path.abspath(keep)]
+    files.sort(key=os.path.getmtime)
+
+    total = sum(os.path.getsize(path) for path in files)
+    if os.path.exists(keep):
+        total += os.path.getsize(keep)
+    for path in files:
+        if total <= max_total_bytes:
+            break
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def setup_logging(level: int = logging.INFO, log_file: str = LOG_FILE, console: bool = True) -> QueueListener:
+    """
+    Route all logging through a background listener thread.
+
+    Replaces any handlers already on the root logger (including ones added by
+    modules calling basicConfig at import). Safe to call more than once; later
+    calls return the running listener.
+
+    Args:
+        level: Root logger level
+        log_file: JSON lines log file
+        console: Also print plain text records to stderr
+
+    Returns:
+        QueueListener: The listener writing the records
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        prune_logs(os.path.dirname(log_file), keep=log_file)
+
+        file_handler = SizedTimedRotatingFileHandler(
+            log_file, when=ROTATE_WHEN, backupCount=BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -5,8 +5,8 @@ import re
 import time
 import logging
 import traceback
-import fix_missing_methods
-from fix_missing_methods import safe_widget_call
+from startup_profiler import profiler as startup_profiler
+from widget_utils import safe_widget_call
 
 # Set up exception handling to capture all errors
 def global_exception_handler(exctype, value, tb):
@@ -19,15 +19,9 @@ def global_exception_handler(exctype, value, tb):
 # Install the global exception handler
 sys.excepthook = global_exception_handler
 
-# Set up logging to file as well as console
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("stoxalotl.log"),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging to the rotating log file as well as console
+from logging_setup import setup_logging
+setup_logging()
 
 # Log startup information
 logging.info("Application starting")
@@ -62,32 +56,32 @@ from PySide6.QtWidgets import (
     QSlider,
     QGroupBox
 )
-import pyqtgraph as pg
-import numpy as np
 from request_counter import RequestCounter
 
-# Check numpy version
-try:
-    if (np.__version__ >= '1.24'):
-        print("Warning: It's recommended to use numpy<1.24 with pyqtgraph. Consider downgrading.")
-except:
-    pass
-
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Local imports
 from config import (COLOR_PALETTES, FONT_FAMILY, FONT_SIZES, FONT_CHOICES, 
-                   OLLAMA_MODEL, CHAT_MODEL, NEWS_API_KEY, NEWS_API_URL, UI_CONFIG)
-from widgets import KeyMetrics, RecommendationWidget, AnalysisCard, StockChart, StockOverview
+                   OLLAMA_MODEL, CHAT_MODEL, NEWS_API_KEY, NEWS_API_URL, UI_CONFIG,
+                   BATCH_CONFIG, HOME_PAGE_CONFIG, SYMBOL_SYNC_CONFIG, NEWS_FEED_CONFIG)
+from widgets import KeyMetrics, RecommendationWidget, AnalysisCard, StockChart, StockOverview, TickerCompleter
 from api_client import StockAPI, AIClient, StockAPIError, AIClientError
-from helpers import parse_recommendations, analysis_color, remove_think_tags
+from helpers import parse_recommendations, analysis_color, remove_think_tags, build_analysis_prompt, skeleton_html
+from cache import PersistentCache
+from batch_analysis import load_batch_result
+from update_tickers import sync_symbols, symbols_age
+from workers import run_in_background, MarketDataPoller
+from market_stream import MarketStream
+from watchlist import WatchlistModel, WatchlistView
+from news_feed import NewsListView, is_system_article
+from instrumentation import metrics, format_p95
 from widgets import ProfitTarget
 
 # Import our rate limiter system
 from rate_limiter import get_rate_limiter_stats, shutdown_all
 
 # Update imports to include the new ticker_utils module
-from ticker_utils import validate_ticker, normalize_ticker, find_similar_ticker
+from ticker_utils import validate_ticker, normalize_ticker, find_similar_ticker, get_symbol_index
 import logging
 
 # Initialize logging
@@ -138,15 +132,20 @@ class ModernStockApp(QMainWindow):
             self.setGeometry(100, 100, 1280, 800)
             self.setMinimumSize(1024, 768)
             self.current_ticker = None
-            self.recent_tickers = []  # Add list for recently viewed tickers
             self.max_recent_tickers = 5  # Maximum number of recent tickers to show
+            # Recently viewed tickers survive a restart
+            self.recent_tickers = self.settings.value("RecentTickers", [], type=list)[:self.max_recent_tickers]
+
+            # Last good result of each home page section, shown immediately on launch
+            self.home_cache = PersistentCache("home_page")
 
             # Initialize request counter
             self.request_counter = RequestCounter()
             
             # Initialize API clients with counter
-            self.stock_api = StockAPI(request_counter=self.request_counter, max_requests_per_second=30)
-            self.ai_client = AIClient()
+            with startup_profiler.phase("api clients"):
+                self.stock_api = StockAPI(request_counter=self.request_counter, max_requests_per_second=30)
+                self.ai_client = AIClient()
 
             # Initialize chat box
             self.chat_box = QTextEdit()
@@ -154,11 +153,13 @@ class ModernStockApp(QMainWindow):
             self.send_button = QPushButton("Send")
 
             # Setup UI and timer
-            self._setup_ui()
-            self._setup_styles()
-            self._setup_status_bar()
-            self._connect_signals()
-            self._init_update_timer()
+            with startup_profiler.phase("build ui"):
+                self._setup_ui()
+            with startup_profiler.phase("styles and signals"):
+                self._setup_styles()
+                self._setup_status_bar()
+                self._connect_signals()
+                self._init_update_timer()
 
             # Initialize debounce timer with longer timeout and don't connect it yet
             self.debounce_timer = QTimer(self)
@@ -192,16 +193,31 @@ class ModernStockApp(QMainWindow):
             # Add a flag to prevent multiple simultaneous analyses
             self.analysis_in_progress = False
 
+            # One poller serves live quotes for every subscribed ticker
+            self.market_poller = MarketDataPoller(self)
+            self.market_poller.quote_updated.connect(self._on_quote_update)
+            self.market_poller.round_finished.connect(self.watchlist.update_quotes)
+
+            # Trade stream for the open ticker while live updates are on
+            self.market_stream = MarketStream(self)
+            self.market_stream.trades_updated.connect(self._on_stream_trades)
+            self.market_stream.status_changed.connect(self._on_stream_status)
+            self._live_ticker = None
+
             # Add settings stacked widget
             self.settings_stack = QStackedWidget()
             
             # Create settings pages
-            self._create_settings_page()
-            self._create_ui_settings_page()
+            with startup_profiler.phase("settings pages"):
+                self._create_settings_page()
+                self._create_ui_settings_page()
 
             # Add a persistent dialog for showing maximized cards
             self._create_persistent_dialog()
 
+            # Home page data is fetched once the event loop runs, i.e. after the window is shown
+            QTimer.singleShot(0, self._load_home_page_data)
+
         except Exception as e:
             # Log any initialization errors
             logging.critical(f"Initialization error: {str(e)}")
@@ -370,6 +386,8 @@ class ModernStockApp(QMainWindow):
                 border-right: none; /* Keep right border removed even when focused */
             }
         """)
+        # Dropdown of matching symbols from the local index while typing
+        self.ticker_completer = TickerCompleter(self.search, self.settings)
         
         # Analyze button with styling to connect with search bar - update color to match theme
         self.btn_analyze = QPushButton("Analyze")
@@ -430,12 +448,17 @@ class ModernStockApp(QMainWindow):
         if not search_text or len(search_text) < 2:
             return
         
-        # Check if this might be a valid ticker and suggest corrections
+        # The dropdown already covers anything that matches a known symbol
+        if self.ticker_completer.suggestion_model.suggestions:
+            return
+
+        # Check if this might be a typo and suggest corrections. Local lookups
+        # only - validate_ticker may call Finnhub, so that waits for _analyze
         try:
             normalized = normalize_ticker(search_text)
-            # Only check for invalid tickers - don't validate with API yet
-            _, is_valid, suggestion = validate_ticker(normalized)
-            if not is_valid and suggestion:
+            index = get_symbol_index(build=False)
+            suggestion = find_similar_ticker(normalized) if index is not None and normalized not in index else None
+            if suggestion:
                 # Show suggestion in a non-intrusive way (status bar)
                 self.statusBar().showMessage(f"Did you mean {suggestion}?", 3000)
         except Exception as e:
@@ -564,9 +587,8 @@ class ModernStockApp(QMainWindow):
         self.news_label = QLabel("Market News")
         self.news_label.setFont(QFont(FONT_FAMILY, FONT_SIZES["header"], QFont.Bold))
         layout.addWidget(self.news_label)
-        self.news_feed = QTextEdit()
-        self.news_feed.setReadOnly(True)
-        self.news_feed.setMaximumHeight(200)
+        self.news_feed = NewsListView()
+        self.news_feed.setMaximumHeight(260)
         layout.addWidget(self.news_feed)
 
         # Recently Viewed Section - Redesigned without grey background
@@ -591,6 +613,31 @@ class ModernStockApp(QMainWindow):
         # Store reference to container for updates
         self.recent_content = recent_container
 
+        # Watchlist Section - one table row per ticker, fed by the market data poller
+        watchlist_header = QHBoxLayout()
+        self.watchlist_label = QLabel("Watchlist")
+        self.watchlist_label.setFont(QFont(FONT_FAMILY, FONT_SIZES["header"], QFont.Bold))
+        self.watchlist_input = QLineEdit()
+        self.watchlist_input.setPlaceholderText("Add ticker...")
+        self.watchlist_input.setMaximumWidth(160)
+        self.watchlist_input.returnPressed.connect(self._add_to_watchlist)
+        btn_watch_add = QPushButton("Add")
+        btn_watch_add.clicked.connect(self._add_to_watchlist)
+        btn_watch_remove = QPushButton("Remove")
+        btn_watch_remove.setToolTip("Remove the selected tickers")
+        btn_watch_remove.clicked.connect(self._remove_from_watchlist)
+        watchlist_header.addWidget(self.watchlist_label)
+        watchlist_header.addStretch()
+        for widget in (self.watchlist_input, btn_watch_add, btn_watch_remove):
+            watchlist_header.addWidget(widget)
+        layout.addLayout(watchlist_header)
+
+        self.watchlist = WatchlistModel(self.settings.value("Watchlist", [], type=list), self)
+        self.watchlist_view = WatchlistView(self.watchlist)
+        self.watchlist_view.setMinimumHeight(180)
+        self.watchlist_view.doubleClicked.connect(self._open_watchlist_ticker)
+        layout.addWidget(self.watchlist_view)
+
         # Market Analysis Section
         self.market_analysis_label = QLabel("Market Analysis")
         self.market_analysis_label.setFont(QFont(FONT_FAMILY, FONT_SIZES["header"], QFont.Bold))
@@ -599,13 +646,123 @@ class ModernStockApp(QMainWindow):
         self.market_analysis.setReadOnly(True)
         layout.addWidget(self.market_analysis)
 
-        # Initial data load
-        self._load_news_feed()
-        self._load_recent_tickers()
-        self._load_market_analysis()
+        # Skeletons until _load_home_page_data fills the sections after the window is shown
+        self.news_feed.show_message("Loading market news...")
+        self.market_analysis.setHtml(skeleton_html(8))
+        self._show_recent_skeletons()
 
         self.stacked_widget.addWidget(home_page)
 
+    def _load_home_page_data(self):
+        """
+        Fill each home page section from the persistent cache, then refresh
+        the sections whose cached copy is missing or older than their interval
+        """
+        start = time.perf_counter()
+        startup_profiler.mark("home page loads started")
+        sections = {
+            "news": (self._show_news_feed, self._load_news_feed),
+            "recent": (self._show_recent_tickers, self._load_recent_tickers),
+            "market_analysis": (self._show_market_analysis, self._load_market_analysis)
+        }
+        self.home_refresh_timers = {}
+        for section, (show, load) in sections.items():
+            interval = HOME_PAGE_CONFIG[f"{section}_refresh"]
+            entry = self.home_cache.get_entry(section)
+            if entry:
+                show(entry['value'])
+
+            if entry is None or time.time() - entry['time'] >= interval:
+                worker = load()
+                if worker is not None:
+                    worker.signals.finished.connect(
+                        lambda _result, section=section: startup_profiler.record(f"{section} loaded", start)
+                    )
+
+            timer = QTimer(self)
+            timer.setInterval(interval * 1000)
+            timer.timeout.connect(load)
+            timer.start()
+            self.home_refresh_timers[section] = timer
+
+        # Watchlist quotes come from the poller's batched rounds
+        for ticker in self.watchlist.tickers():
+            self._watch(ticker)
+
+        # Build the symbol index off the GUI thread before the first typo needs
+        # it, then check whether the exchange symbol list is due for a sync
+        self.symbol_sync_worker = None
+        run_in_background(get_symbol_index, on_result=lambda _index: self._sync_symbols_if_due())
+        self.symbol_sync_timer = QTimer(self)
+        self.symbol_sync_timer.setInterval(SYMBOL_SYNC_CONFIG["check_interval"] * 1000)
+        self.symbol_sync_timer.timeout.connect(self._sync_symbols_if_due)
+        self.symbol_sync_timer.start()
+
+    def _sync_symbols_if_due(self):
+        """Start a background exchange symbol sync if the last one is older than the interval"""
+        if self.symbol_sync_worker is not None:
+            return
+        age = symbols_age()
+        if age is not None and age < SYMBOL_SYNC_CONFIG["interval"]:
+            return
+        logging.info("Symbol list is due for a sync, updating in the background")
+        self.symbol_sync_worker = run_in_background(
+            sync_symbols, on_result=self._on_symbol_sync, on_error=self._on_symbol_sync
+        )
+
+    def _on_symbol_sync(self, result):
+        self.symbol_sync_worker = None
+        if isinstance(result, dict) and (result['added'] or result['removed']):
+            self.statusBar().showMessage(
+                f"Symbol list updated: {len(result['added'])} new, {len(result['removed'])} delisted", 5000
+            )
+
+    def _watch(self, ticker):
+        """Poll a watchlist ticker, showing its last known quote straight away"""
+        latest = self.market_poller.subscribe(ticker)
+        if latest:
+            self.watchlist.update_quote(ticker, latest)
+
+    def _add_to_watchlist(self):
+        raw_ticker = self.watchlist_input.text().strip().upper()
+        if not raw_ticker:
+            return
+        ticker, is_valid, suggestion = validate_ticker(raw_ticker)
+        if not is_valid:
+            suggestion_msg = f" Did you mean {suggestion}?" if suggestion else ""
+            self._show_error(f"Invalid ticker symbol: {raw_ticker}.{suggestion_msg}")
+            return
+        if self.watchlist.add(ticker):
+            self.settings.setValue("Watchlist", self.watchlist.tickers())
+            self._watch(ticker)
+        elif ticker not in self.watchlist:
+            self.statusBar().showMessage(f"Watchlist is full; remove a ticker to add {ticker}", 5000)
+        self.watchlist_input.clear()
+
+    def _remove_from_watchlist(self):
+        for ticker in self.watchlist_view.selected_tickers():
+            if self.watchlist.remove(ticker):
+                self.market_poller.unsubscribe(ticker)
+        self.settings.setValue("Watchlist", self.watchlist.tickers())
+
+    def _open_watchlist_ticker(self, index):
+        """Analyze the double-clicked watchlist ticker"""
+        ticker = self.watchlist_view.ticker_at(index)
+        if ticker:
+            self.search.setText(ticker)
+            self._analyze()
+
+    def _show_recent_skeletons(self):
+        """Grey cards in place of the recent ticker cards while quotes load"""
+        self._clear_recent_tickers()
+        self.recent_cards_shown = False
+        for _ in self.recent_tickers or [None]:
+            card = QFrame()
+            card.setFixedSize(100, 70)
+            card.setStyleSheet(f"background-color: {COLOR_PALETTES['Dark']['border']}; border-radius: 6px;")
+            self.recent_layout.addWidget(card)
+        self.recent_layout.addStretch()
+
     def _load_market_data(self):
         try:
             # Fetch data for major indices (S&P 500, NASDAQ, Dow Jones)
@@ -623,15 +780,11 @@ class ModernStockApp(QMainWindow):
                 self.market_overview_layout.addWidget(index_label)
             # Fetch and process news
             all_news = self.stock_api.get_market_news()  # Assuming this method exists
-            news_text = "\n\n".join(
-                f"{article['title']}\n{article['description'] or 'No description'}"
-                for article in all_news[:5]  # Limit to 5 articles
-            )
-            self.news_feed.setPlainText(news_text)
+            self.news_feed.add_articles(all_news)
         except StockAPIError as e:
-            self.news_feed.setPlainText(f"Error loading news: {str(e)}")
+            self.news_feed.show_message(f"Error loading news: {str(e)}")
         except Exception as e:
-            self.news_feed.setPlainText(f"Error loading news: {str(e)}")
+            self.news_feed.show_message(f"Error loading news: {str(e)}")
 
     def _create_main_app_page(self):
         main_page = QWidget()
@@ -695,7 +848,8 @@ class ModernStockApp(QMainWindow):
         layout.setSpacing(10)
 
         # Create cards with explicit connections to maximize signal
-        self.news_card = AnalysisCard("Latest News")
+        self.news_card = AnalysisCard("Latest News", NewsListView())
+        self.news_ticker = None
         self.news_card.maximize_signal.connect(self._show_maximized_card)
 
         self.long_term_card = AnalysisCard("Buy/Sell Analysis")
@@ -713,7 +867,7 @@ class ModernStockApp(QMainWindow):
             layout.addWidget(card)
 
         # Set initial content with HTML formatting
-        self.news_card.content.setHtml("<i>Search for a stock to view news...</i>")
+        self.news_card.content.show_message("Search for a stock to view news...")
         self.long_term_card.content.setHtml("<i>Search for a stock to view analysis...</i>")
         # Removed day_trade_card HTML initialization
         self.strategy_card.content.setHtml("<i>Search for a stock to view analysis...</i>")
@@ -756,11 +910,16 @@ class ModernStockApp(QMainWindow):
         controls.addWidget(self.time_frame)
         controls.addWidget(QLabel("Chart Type:"))
         controls.addWidget(self.chart_type)
+
+        # Live updates from the trade stream
+        self.live_updates = QCheckBox("Live")
+        self.live_updates.setToolTip("Update the price, profit target and last candle from the live trade stream")
+        self.live_updates.setChecked(self.settings.value("LiveUpdates", True, type=bool))
+        self.live_updates.toggled.connect(self._set_live_updates)
+        controls.addWidget(self.live_updates)
         controls.addStretch()
 
-        # Create chart using our custom class from stock_chart.py
-        # which includes the inverted drag behavior
-        from stock_chart import StockChart
+        # Price chart from widgets.py: candles, overlays and the hover crosshair
         self.chart = StockChart()
         self._fix_chart_orientation()  # Fix chart orientation after creation
 
@@ -794,7 +953,7 @@ class ModernStockApp(QMainWindow):
         if (self.current_ticker):
             try:
                 # Make sure we have valid data
-                logging.info(f"Updating chart for {self.current_ticker}")
+                logging.debug(f"Updating chart for {self.current_ticker}")
 
                 # Try to safe guard against errors
                 try:
@@ -806,7 +965,7 @@ class ModernStockApp(QMainWindow):
                     chart_type = "Both"
 
                 # Log important info before calling chart update
-                logging.info(f"Chart update with ticker={self.current_ticker}, time_frame={time_frame}, type={chart_type}")
+                logging.debug(f"Chart update with ticker={self.current_ticker}, time_frame={time_frame}, type={chart_type}")
 
                 # Use a try-except block to catch specific errors
                 try:
@@ -816,13 +975,15 @@ class ModernStockApp(QMainWindow):
                         time_frame,
                         chart_type,
                     )
-                    logging.info("Chart update method called successfully")
+                    logging.debug("Chart update method called successfully")
                     
                     # Fix chart orientation after update
                     self._fix_chart_orientation()
                 except Exception as chart_error:
                     logging.error(f"Chart update_chart method failed: {chart_error}")
                     # Try a fallback approach
+                    import pyqtgraph as pg
+
                     self.chart.clear()
                     self.chart.addItem(pg.TextItem(
                         text=f"Error rendering chart for {self.current_ticker}: {str(chart_error)}",
@@ -869,35 +1030,69 @@ class ModernStockApp(QMainWindow):
         except Exception as e:
             print(f"Error creating stock card for {ticker}: {e}")
 
-    def _load_recent_tickers(self):
-        # Clear existing widgets
-        for i in reversed(range(self.recent_layout.count())):
-            widget = self.recent_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
+    def _clear_recent_tickers(self):
+        while self.recent_layout.count():
+            item = self.recent_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
 
+    def _load_recent_tickers(self):
+        """Fetch quotes for the recent tickers in the background and rebuild the cards"""
         if not self.recent_tickers:
             # Add a placeholder message if no recent tickers
-            placeholder = QLabel("No recently viewed stocks. Search for a ticker to begin.")
-            placeholder.setStyleSheet("color: #757575; font-style: italic;")
-            self.recent_layout.addWidget(placeholder)
-            return
+            self._show_recent_message("No recently viewed stocks. Search for a ticker to begin.")
+            return None
+
+        # Only the newest request may fill the cards
+        self._recent_request_id = getattr(self, '_recent_request_id', 0) + 1
+        request_id = self._recent_request_id
+        return run_in_background(
+            self._fetch_recent_quotes, list(self.recent_tickers),
+            on_result=lambda quotes: self._on_recent_quotes(quotes, request_id)
+        )
 
-        # Add recent ticker cards
-        for ticker in self.recent_tickers:
+    def _on_recent_quotes(self, quotes, request_id):
+        if request_id != self._recent_request_id:
+            return
+        if quotes:
+            self.home_cache.set("recent", quotes)
+        self._show_recent_tickers(quotes)
+        if not self.recent_cards_shown:
+            # Every quote failed and there are no earlier cards to keep showing
+            self._show_recent_message("Couldn't load quotes for your recent stocks. Retrying shortly.")
+
+    def _fetch_recent_quotes(self, tickers):
+        """Runs in a worker thread; the rate limiter paces the requests"""
+        quotes = []
+        for ticker in tickers:
             try:
                 stock_data = self.stock_api.get_stock(ticker)
-                current_price = stock_data['c']
-                prev_close = stock_data['pc']
-                self._create_stock_card(ticker, current_price, prev_close, self.recent_layout)
-            except StockAPIError as e:
-                print(f"Error loading recent stock {ticker}: {e}")
+                quotes.append((ticker, stock_data['c'], stock_data['pc']))
             except Exception as e:
-                print(f"Error loading recent stock {ticker}: {e}")
-            time.sleep(1)  # Add delay between requests
+                logging.error(f"Error loading recent stock {ticker}: {e}")
+        return quotes
+
+    def _show_recent_tickers(self, quotes):
+        # Cached quotes may include tickers that have since dropped off the list
+        quotes = [quote for quote in quotes if quote[0] in self.recent_tickers]
+        if not quotes:
+            # Leave the cards (or skeletons, while loading) as they are
+            return
+        self._clear_recent_tickers()
+        for ticker, current_price, prev_close in quotes:
+            self._create_stock_card(ticker, current_price, prev_close, self.recent_layout)
 
         # Add stretch to push cards to the left
         self.recent_layout.addStretch()
+        self.recent_cards_shown = True
+
+    def _show_recent_message(self, text):
+        """A line of text in place of the recent ticker cards"""
+        self._clear_recent_tickers()
+        self.recent_cards_shown = False
+        placeholder = QLabel(text)
+        placeholder.setStyleSheet("color: #757575; font-style: italic;")
+        self.recent_layout.addWidget(placeholder)
 
     def _load_market_analysis(self):
         prompt = """
@@ -914,11 +1109,24 @@ class ModernStockApp(QMainWindow):
         Base your analysis on current market conditions, recent economic data, and sector performance.
         Be specific and concise with each sector.
         """
+        return run_in_background(
+            self.ai_client.analyze, prompt, "sector analyst",
+            on_result=self._on_market_analysis,
+            on_error=lambda error: self.market_analysis.setPlainText(f"Error generating market analysis: {error}")
+        )
+
+    def _on_market_analysis(self, response):
+        cleaned_content = remove_think_tags(response['message']['content'])
+        # Keep showing the last good analysis rather than replacing it with an error
+        if response.get('error'):
+            if self.home_cache.get_entry("market_analysis") is None:
+                self.market_analysis.setPlainText(cleaned_content)
+            return
+        self.home_cache.set("market_analysis", cleaned_content)
+        self._show_market_analysis(cleaned_content)
+
+    def _show_market_analysis(self, cleaned_content):
         try:
-            # Get AI analysis
-            response = self.ai_client.analyze(prompt, "sector analyst")
-            content = response['message']['content']
-            cleaned_content = remove_think_tags(content)
 
             # Clear existing text
             self.market_analysis.clear()
@@ -977,13 +1185,20 @@ class ModernStockApp(QMainWindow):
 
         try:
             # Update current_ticker ONLY after validation
+            if self.current_ticker != ticker:
+                if self.current_ticker:
+                    self.market_poller.unsubscribe(self.current_ticker)
+                self.market_poller.subscribe(ticker)
             self.current_ticker = ticker
+            self._update_live_subscription()
+            self.ticker_completer.record_use(ticker)
 
             # Update recent tickers list with validated ticker
             if (ticker in self.recent_tickers):
                 self.recent_tickers.remove(ticker)
             self.recent_tickers.insert(0, ticker)
             self.recent_tickers = self.recent_tickers[:self.max_recent_tickers]
+            self.settings.setValue("RecentTickers", self.recent_tickers)
             self._load_recent_tickers()
 
             # Clear cache for previous searches that aren't the current ticker
@@ -1005,7 +1220,8 @@ class ModernStockApp(QMainWindow):
             self.update_timer.start()
 
             # Show loading placeholders
-            self.news_card.content.setPlainText("Loading news...")
+            if ticker != self.news_ticker:
+                self.news_card.content.show_message("Loading news...")
             self.long_term_card.content.setPlainText("Loading analysis...")
             self.strategy_card.content.setPlainText("Loading analysis...")
 
@@ -1112,15 +1328,15 @@ class ModernStockApp(QMainWindow):
                 safe_widget_call(self.overview, 'update_overview', self.current_ticker, current_price, change_text)
 
                 # Update metrics - with additional logging
-                logging.info(f"Getting stock metrics for {self.current_ticker}...")
+                logging.debug(f"Getting stock metrics for {self.current_ticker}...")
                 metrics = self._get_stock_metrics(self.current_ticker)  # Pass ticker directly, not stock data
 
-                # Log metrics data to help debugging
-                logging.info(f"Got metrics data: {metrics}")
+                # Log metrics data to help debugging (lazily formatted; the dict is large)
+                logging.debug("Got metrics data: %s", metrics)
 
                 # Update the metrics widget with the data
                 if metrics and hasattr(self, 'metrics'):
-                    logging.info("Updating metrics widget with data")
+                    logging.debug("Updating metrics widget with data")
                     safe_widget_call(self.metrics, 'update_metrics', metrics)
                 else:
                     logging.error("Failed to update metrics - no data or widget")
@@ -1137,53 +1353,86 @@ class ModernStockApp(QMainWindow):
             logging.error(f"Unexpected error during UI update for {self.current_ticker}: {e}")
             self._show_error(f"An unexpected error occurred: {str(e)}")
 
-    def _format_news_html(self, news_items):
-        """Format news items as HTML for better presentation"""
-        if not news_items:
-            return "<i>No news available.</i>"
-
-        html = "<div style='font-family: Segoe UI, sans-serif;'>"
-
-        for article in news_items:
-            # Extract article data
-            title = article.get('title', 'No Title')
-            description = article.get('description', 'No description available.')
-            source = article.get('source', {}).get('name', 'Unknown Source')
-            date = article.get('formatted_date', article.get('publishedAt', ''))[:10]
-            url = article.get('url', '#')
-
-            # Format as a nice HTML card
-            html += f"""
-            <div style='margin-bottom: 15px; padding: 10px; border-left: 3px solid #00bcd4; background-color: #1a1a1a;'>
-                <h3 style='margin-top: 0; margin-bottom: 5px; color: #e0e0e0;'>{title}</h3>
-                <div style='font-size: 12px; color: #757575; margin-bottom: 8px;'>
-                    {source} • {date}
-                </div>
-                <p style='margin-bottom: 5px; color: #bdbdbd;'>{description}</p>
-            </div>
-            """
+    def _on_quote_update(self, ticker, stock_data):
+        """Apply a live quote from the market data poller to the open ticker"""
+        if ticker != self.current_ticker:
+            return
+
+        # Keeps _update_ui on the cached path while the poller is delivering
+        cache_key = f"stock_data_{ticker}"
+        self.stock_data_cache[cache_key] = stock_data
+        self.last_stock_update[cache_key] = time.time()
+
+        change_text = f"{stock_data['d']:+.2f} ({stock_data['dp']:+.2f}%)"
+        safe_widget_call(self.overview, 'update_overview', ticker, stock_data['c'], change_text)
+        safe_widget_call(self.profit_target, 'update_profit_target', stock_data['c'])
+
+    def _set_live_updates(self, enabled):
+        self.settings.setValue("LiveUpdates", enabled)
+        self._update_live_subscription()
+
+    def _update_live_subscription(self):
+        """Keep the trade stream subscribed to the open ticker only while live updates are on"""
+        wanted = self.current_ticker if self.live_updates.isChecked() else None
+        if wanted == self._live_ticker:
+            return
+        if self._live_ticker:
+            self.market_stream.unsubscribe(self._live_ticker)
+        if wanted:
+            self.market_stream.subscribe(wanted)
+        self._live_ticker = wanted
+
+    def _on_stream_trades(self, ticker, trades):
+        """Apply streamed trades to the open ticker's quote, overview, profit target and chart"""
+        if ticker != self.current_ticker:
+            return
 
-        html += "</div>"
-        return html
+        # Fresh streamed quotes keep _update_ui off the Finnhub quote endpoint
+        cache_key = f"stock_data_{ticker}"
+        stock_data = dict(self.stock_data_cache.get(cache_key) or {})
+        price = trades['close']
+        stock_data['c'] = price
+        stock_data['h'] = max(stock_data.get('h') or price, trades['high'])
+        stock_data['l'] = min(stock_data.get('l') or price, trades['low'])
+        stock_data['t'] = int(trades['time'])
+        prev_close = stock_data.get('pc')
+        if prev_close:
+            stock_data['d'] = price - prev_close
+            stock_data['dp'] = stock_data['d'] / prev_close * 100
+        self.stock_data_cache[cache_key] = stock_data
+        self.last_stock_update[cache_key] = time.time()
+        self.watchlist.update_quote(ticker, stock_data)
+
+        if prev_close:
+            change_text = f"{stock_data['d']:+.2f} ({stock_data['dp']:+.2f}%)"
+            safe_widget_call(self.overview, 'update_overview', ticker, price, change_text)
+        safe_widget_call(self.profit_target, 'update_profit_target', price)
+        safe_widget_call(self.chart, 'apply_trades', ticker, trades)
+
+    def _on_stream_status(self, status):
+        if self.live_updates.isChecked() and self.current_ticker:
+            self.statusBar().showMessage(f"Live updates: {status}", 3000)
 
     def _update_news(self, ticker):
         try:
-            # Show loading state
-            self.news_card.show_loading()
-            QApplication.processEvents()
-
             # Get news with proper error handling
             news = self.stock_api.get_news(ticker)
             QApplication.processEvents()
 
-            # Format news as HTML and update the card
-            html_content = self._format_news_html(news)
-            self.news_card.content.setHtml(html_content)
+            articles = [article for article in news if not is_system_article(article)]
+            if not articles:
+                message = news[0].get('description') if news else None
+                self.news_card.content.show_message(message or "No news available.")
+            elif ticker == self.news_ticker:
+                # Same ticker again: only articles that arrived since are inserted
+                self.news_card.content.add_articles(articles)
+            else:
+                self.news_card.content.set_articles(articles)
+            self.news_ticker = ticker if articles else None
         except Exception as e:
             logging.error(f"Error updating news: {e}")
-            self.news_card.content.setHtml(
-                f"<div style='color: #F44336;'>Error loading news: {str(e)}</div>"
-            )
+            self.news_ticker = None
+            self.news_card.content.show_message(f"Error loading news: {str(e)}")
 
     def _generate_combined_analysis(self, stock):
         try:
@@ -1195,42 +1444,27 @@ class ModernStockApp(QMainWindow):
             # Get financial metrics for the ticker
             financial_metrics = self._get_stock_metrics(self.current_ticker)
             
-            # Create enhanced prompt with clear sections for structured output
-            combined_prompt = f"""
-            Analyze {self.current_ticker} stock and provide a comprehensive investment analysis with the following sections:
-            
-            STOCK OVERVIEW:
-            Provide a brief overview of {self.current_ticker} including what they do, market position, and current price trend.
-            Current stock price: ${stock['c']:.2f}
-            
-            FINANCIAL SITUATION:
-            Analyze key financial metrics, revenue trends, profitability, and financial health.
-            
-            NEWS IMPACT:
-            Summarize how recent news and events affect the stock's outlook.
-            
-            TRAJECTORY ANALYSIS:
-            Evaluate the stock's recent performance trend and technical indicators.
-            
-            PREDICTION:
-            Forecast end of week price: $XX.XX (with confidence level)
-            Forecast end of month price: $XX.XX (with confidence level)
-            Forecast end of year price: $XX.XX (with confidence level)
-            
-            For each prediction, provide a specific price target and confidence level percentage.
-            Base predictions on financial data, market trends, and recent news.
-            """
-
-            # Generate analysis
-            response = self.ai_client.analyze(
-                combined_prompt, 
-                "financial analyst", 
-                model=OLLAMA_MODEL,  
-                retries=3, 
-                backoff_factor=2.0
-            )
-            content = response['message']['content']
-            cleaned_content = remove_think_tags(content)
+            # Reuse a fresh batch-analysis result if one exists; it opens instantly
+            batch_result = load_batch_result(self.current_ticker, max_age=BATCH_CONFIG["result_ttl"])
+            if batch_result and batch_result.get('analysis'):
+                logging.info(f"Using batch analysis result for {self.current_ticker}")
+                cleaned_content = batch_result['analysis']
+            else:
+                # Create enhanced prompt with clear sections for structured output
+                # The news card's articles carry their sentiment scores from the news store
+                news = self.news_card.content.news.articles() if self.news_ticker == self.current_ticker else None
+                combined_prompt = build_analysis_prompt(self.current_ticker, stock['c'], news, financial_metrics)
+
+                # Generate analysis
+                response = self.ai_client.analyze(
+                    combined_prompt, 
+                    "financial analyst", 
+                    model=OLLAMA_MODEL,  
+                    retries=3, 
+                    backoff_factor=2.0
+                )
+                content = response['message']['content']
+                cleaned_content = remove_think_tags(content)
 
             # Use the enhanced formatter for the long-term analysis card
             AnalysisFormatter.apply_enhanced_formatting(
@@ -1461,9 +1695,15 @@ class ModernStockApp(QMainWindow):
         self.api_requests_label = QLabel("Total: 0")
         self.api_requests_label.setStyleSheet("color: #00bcd4; font-weight: bold; padding: 5px;")
 
+        # p95 latency of the main pipeline stages, from instrumentation
+        self.latency_label = QLabel("")
+        self.latency_label.setStyleSheet("color: #aaaaaa; padding: 5px;")
+        self.latency_label.setToolTip("95th percentile latency since launch (Export Performance Metrics for details)")
+
         self.statusBar().addPermanentWidget(self.finnhub_status)
         self.statusBar().addPermanentWidget(self.news_api_status)
         self.statusBar().addPermanentWidget(self.ollama_status)
+        self.statusBar().addPermanentWidget(self.latency_label)
         self.statusBar().addPermanentWidget(self.api_requests_label)
 
         self.rate_limit_timer = QTimer(self)
@@ -1508,6 +1748,13 @@ class ModernStockApp(QMainWindow):
         total_requests = sum(s["requests_made"] for s in stats.values())
         self.api_requests_label.setText(f"Total: {total_requests}")
 
+        self.latency_label.setText(format_p95({
+            "API": "stock_api.get_stock",
+            "queue": "queue.finnhub.wait",
+            "AI": "ai.generate",
+            "chart": "chart.update_chart"
+        }))
+
     def _update_status_indicator(self, label, name, waiters, limited, tokens):
         """Update a status label based on rate limit stats"""
         if waiters > 0:
@@ -1534,12 +1781,19 @@ class ModernStockApp(QMainWindow):
             self.debounce_timer.deleteLater()
 
         # Stop all timers first - important to do this before deleting widgets
-        timers = ['update_timer', 'rate_limit_timer', 'request_timer']
+        timers = ['update_timer', 'rate_limit_timer', 'request_timer', 'symbol_sync_timer']
         for timer_name in timers:
             if hasattr(self, timer_name):
                 timer = getattr(self, timer_name)
                 if timer:
                     timer.stop()
+        for timer in getattr(self, 'home_refresh_timers', {}).values():
+            timer.stop()
+
+        if hasattr(self, 'market_poller'):
+            self.market_poller.stop()
+        if hasattr(self, 'market_stream'):
+            self.market_stream.stop()
 
         # Clear reference to widgets that might be accessed during shutdown
         # Store widget names to safely delete
@@ -1567,72 +1821,52 @@ class ModernStockApp(QMainWindow):
         event.accept()
 
     def _load_news_feed(self):
-        """Fetch general market news for the home page"""
-        try:
-            self.news_feed.setPlainText("Loading market news...")
-            QApplication.processEvents()  # Update UI immediately
-
-            # Try to get market news (general financial news)
-            try:
-                news = self.stock_api.get_news("market", days_back=2, num_articles=5)
-                news_text = ""
+        """Fetch general market news for the home page in the background"""
+        return run_in_background(
+            self.stock_api.get_news, "market", days_back=2, num_articles=NEWS_FEED_CONFIG["market_articles"],
+            on_result=self._on_news_feed,
+            on_error=self._show_fallback_news
+        )
 
-                # Process each news article
-                for i, article in enumerate(news[:5]):  # Limit to 5 articles
-                    try:
-                        title = article.get('title', 'No Title')
-                        description = article.get('description', 'No Description')
-                        source = article.get('source', {}).get('name', 'Unknown Source')
-                        date = article.get('publishedAt', '')[:10]  # Just get the date part
-
-                        # Format the article
-                        news_text += f"[{date}] {title}\n"
-                        news_text += f"Source: {source}\n"
-                        news_text += f"{description}\n\n"
-                    except Exception as e:
-                        logging.warning(f"Error processing article {i}: {e}")
-                        news_text += f"Error processing article {i}: {str(e)}\n\n"
+    def _on_news_feed(self, news):
+        # get_news reports failures as articles from the "System" source
+        failed = not news or all(article.get('source', {}).get('name') == 'System' for article in news)
+        if failed and self.home_cache.get_entry("news"):
+            logging.warning("Market news refresh failed; keeping cached news")
+            return
+        if not failed:
+            self.home_cache.set("news", news)
+        self._show_news_feed(news)
+
+    def _show_news_feed(self, news):
+        """Add the articles not already in the market news feed"""
+        articles = [article for article in news if not is_system_article(article)]
+        if articles:
+            self.news_feed.add_articles(articles)
+        elif not self.news_feed.news.rowCount():
+            self.news_feed.show_message("No market news found. Try searching for a specific stock.")
+
+    def _show_fallback_news(self, error):
+        """Show placeholder market news when the news request failed"""
+        logging.error(f"Error loading market news: {error}")
+        fallback_news = [
+            {
+                "title": "Market Overview",
+                "description": "Markets remain volatile amid economic uncertainty. Investors are closely monitoring central bank decisions and corporate earnings reports.",
+                "source": {"name": "Financial Daily"},
+                "publishedAt": datetime.now().strftime("%Y-%m-%d")
+            },
+            {
+                "title": "Tech Stocks Lead Market Rally",
+                "description": "Technology sector continues to show strength as investors favor growth stocks in the current environment.",
+                "source": {"name": "Market Insights"},
+                "publishedAt": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+            }
+        ]
 
-                # Set the compiled news text
-                if news_text:
-                    self.news_feed.setPlainText(news_text)
-                else:
-                    self.news_feed.setPlainText("No market news found. Try searching for a specific stock.")
-            except Exception as e:
-                # Try to fall back to dummy market news
-                logging.error(f"Error loading market news: {e}")
-                # Fallback news
-                fallback_news = [
-                    {
-                        "title": "Market Overview",
-                        "description": "Markets remain volatile amid economic uncertainty. Investors are closely monitoring central bank decisions and corporate earnings reports.",
-                        "source": {"name": "Financial Daily"},
-                        "publishedAt": datetime.now().strftime("%Y-%m-%d")
-                    },
-                    {
-                        "title": "Tech Stocks Lead Market Rally",
-                        "description": "Technology sector continues to show strength as investors favor growth stocks in the current environment.",
-                        "source": {"name": "Market Insights"},
-                        "publishedAt": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                    }
-                ]
-
-                # Format fallback news
-                news_text = ""
-                for article in fallback_news:
-                    title = article.get('title', '')
-                    description = article.get('description', '')
-                    source = article.get('source', {}).get('name', '')
-                    date = article.get('publishedAt', '')[:10]
-
-                    news_text += f"[{date}] {title}\n"
-                    news_text += f"Source: {source}\n"
-                    news_text += f"{description}\n\n"
-
-                self.news_feed.setPlainText(news_text)
-        except Exception as e:
-            logging.error(f"Error in news feed function: {e}")
-            self.news_feed.setPlainText(f"Unable to load news: {str(e)}")
+        # Articles already in the feed are better than placeholders
+        if not self.news_feed.news.rowCount():
+            self.news_feed.set_articles(fallback_news)
 
     def _get_stock_metrics(self, data_or_ticker):
         """Get financial metrics for a stock
@@ -1706,6 +1940,9 @@ class ModernStockApp(QMainWindow):
         settings_action = QAction("Settings", self)
         settings_action.triggered.connect(self._navigate_to_settings)
         menu.addAction(settings_action)
+        metrics_action = QAction("Export Performance Metrics", self)
+        metrics_action.triggered.connect(self._export_metrics)
+        menu.addAction(metrics_action)
         menu.addSeparator()
         about_action = QAction("About", self)
         menu.addAction(about_action)
@@ -1713,6 +1950,15 @@ class ModernStockApp(QMainWindow):
         # Show menu under the title
         menu.exec(self.brand_button.mapToGlobal(QPoint(0, self.brand_button.height())))
 
+    def _export_metrics(self):
+        """Write the latency histograms and recent spans to data/metrics"""
+        try:
+            path = metrics.export()
+            self.statusBar().showMessage(f"Performance metrics exported to {path}", 5000)
+        except Exception as e:
+            logging.error(f"Error exporting metrics: {e}")
+            self.statusBar().showMessage(f"Could not export metrics: {e}", 5000)
+
     def _create_settings_page(self):
         """Create the main settings page with category tabs"""
         settings_page = QWidget()
@@ -1769,11 +2015,16 @@ class ModernStockApp(QMainWindow):
         ui_btn.setStyleSheet(self._get_settings_button_style())
         ui_btn.clicked.connect(self._navigate_to_ui_settings)
 
+        diagnostics_btn = QPushButton("Diagnostics")
+        diagnostics_btn.setStyleSheet(self._get_settings_button_style())
+        diagnostics_btn.clicked.connect(self._navigate_to_diagnostics)
+
         # Add all buttons
         categories_layout.addWidget(general_btn)
         categories_layout.addWidget(account_btn)
         categories_layout.addWidget(privacy_btn)
         categories_layout.addWidget(ui_btn)
+        categories_layout.addWidget(diagnostics_btn)
         categories_layout.addStretch()
 
         layout.addWidget(categories_frame)
@@ -1956,6 +2207,16 @@ class ModernStockApp(QMainWindow):
         """Navigate to UI settings page"""
         self.settings_stack.setCurrentIndex(1)  # UI settings page
 
+    def _navigate_to_diagnostics(self):
+        """Navigate to the diagnostics page, creating it on first use"""
+        if not hasattr(self, 'diagnostics_page'):
+            # Imported here so pyqtgraph plots for the page are only set up when opened
+            from diagnostics import DiagnosticsPage
+            self.diagnostics_page = DiagnosticsPage()
+            self.diagnostics_page.back_requested.connect(self._return_to_settings)
+            self.settings_stack.addWidget(self.diagnostics_page)
+        self.settings_stack.setCurrentWidget(self.diagnostics_page)
+
     def _return_to_settings(self):
         """Return to main settings page"""
         self.settings_stack.setCurrentIndex(0)  # Main settings page
@@ -0,0 +1,631 @@
+#!/usr/bin/env python
+"""
+Market Stream Module
+Live trades from Finnhub's websocket feed (wss://ws.finnhub.io), folded into
+one open/high/low/close/volume update per ticker every
+STREAM_CONFIG['flush_interval'] seconds, so the UI does constant work per
+update however busy the ticker is.
+
+Includes a minimal RFC 6455 client (text frames, ping/pong, close) and a
+local stand-in server for offline runs:
+
+- record: connects to Finnhub and appends every message, with its offset
+  from the start of the session, to a JSON lines file
+- replay: serves such a file to the app, or a synthetic random walk when no
+  file is given
+
+The app is pointed at the stand-in through STOXALOTL_FINNHUB_WS_URL (see
+config.py), which must be set before config is imported:
+
+    python market_stream.py record --file data/recordings/trades.jsonl --symbols AAPL MSFT
+    python market_stream.py replay --file data/recordings/trades.jsonl --speed 2.0
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import random
+import socket
+import ssl
+import struct
+import hashlib
+import logging
+import argparse
+import threading
+import socketserver
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from PySide6.QtCore import QObject, Signal
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "recordings")
+
+# Frame opcodes used by the feed
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_HANDSHAKE_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketError(Exception):
+    """Failed handshake or a connection closed by the other side"""
+    pass
+
+
+def _accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + _HANDSHAKE_GUID).encode()).digest()).decode()
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    """XOR payload with the repeating 4-byte key, as one integer operation"""
+    if not payload:
+        return payload
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+def _encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    """A single final frame; clients must mask, servers must not"""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+def _parse_frame(buffer: bytearray):
+    """
+    First complete frame in buffer
+
+    Returns:
+        (fin, opcode, payload, frame size), or None until the whole frame has arrived
+    """
+    if len(buffer) < 2:
+        return None
+    length = buffer[1] & 0x7F
+    offset = 2
+    if length == 126:
+        if len(buffer) < 4:
+            return None
+        length = struct.unpack_from("!H", buffer, 2)[0]
+        offset = 4
+    elif length == 127:
+        if len(buffer) < 10:
+            return None
+        length = struct.unpack_from("!Q", buffer, 2)[0]
+        offset = 10
+    key = None
+    if buffer[1] & 0x80:
+        if len(buffer) < offset + 4:
+            return None
+        key = bytes(buffer[offset:offset + 4])
+        offset += 4
+    if len(buffer) < offset + length:
+        return None
+    payload = bytes(buffer[offset:offset + length])
+    if key:
+        payload = _apply_mask(payload, key)
+    return bool(buffer[0] & 0x80), buffer[0] & 0x0F, payload, offset + length
+
+
+class WebSocket:
+    """
+    One websocket connection over a connected socket.
+
+    Incoming bytes are buffered until a whole frame is available, so a
+    receive timeout never loses a partly read frame.
+    """
+
+    def __init__(self, sock: socket.socket, client: bool = True, buffered: bytes = b""):
+        self.sock = sock
+        self.client = client
+        self._buffer = bytearray(buffered)
+        self._fragments: List[bytes] = []
+        self._send_lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, url: str, timeout: float = 10.0) -> "WebSocket":
+        """Open a ws:// or wss:// URL and complete the opening handshake"""
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((parts.hostname, port), timeout=timeout)
+        try:
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+            key = base64.b64encode(os.urandom(16)).decode()
+            target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            sock.sendall((
+                f"GET {target} HTTP/1.1\r\n"
+                f"Host: {parts.hostname}:{port}\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode())
+
+            response = b""
+            while b"\r\n\r\n" not in response:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise WebSocketError("Connection closed during handshake")
+                response += chunk
+            head, rest = response.split(b"\r\n\r\n", 1)
+            lines = head.decode("latin-1").split("\r\n")
+            if " 101 " not in f"{lines[0]} ":
+                raise WebSocketError(f"Handshake rejected: {lines[0]}")
+            headers = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+            if headers.get("sec-websocket-accept") != _accept_key(key):
+                raise WebSocketError("Handshake returned the wrong accept key")
+        except Exception:
+            sock.close()
+            raise
+        return cls(sock, client=True, buffered=rest)
+
+    def send_text(self, text: str):
+        self._send(OP_TEXT, text.encode("utf-8"))
+
+    def _send(self, opcode: int, payload: bytes):
+        frame = _encode_frame(opcode, payload, mask=self.client)
+        with self._send_lock:
+            self.sock.sendall(frame)
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Next text message, answering pings on the way
+
+        Args:
+            timeout: Seconds to wait for data (None blocks)
+
+        Returns:
+            Optional[str]: The message, or None if the timeout passed first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = _parse_frame(self._buffer)
+            if frame is None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.sock.settimeout(remaining)
+                try:
+                    chunk = self.sock.recv(65536)
+                except socket.timeout:
+                    return None
+                if not chunk:
+                    raise WebSocketError("Connection closed")
+                self._buffer += chunk
+                continue
+
+            fin, opcode, payload, size = frame
+            del self._buffer[:size]
+            if opcode == OP_PING:
+                self._send(OP_PONG, payload)
+            elif opcode == OP_CLOSE:
+                try:
+                    self._send(OP_CLOSE, payload[:2])
+                except OSError:
+                    pass
+                raise WebSocketError("Connection closed by peer")
+            elif opcode in (OP_TEXT, OP_CONTINUATION):
+                self._fragments.append(payload)
+                if fin:
+                    message = b"".join(self._fragments)
+                    self._fragments = []
+                    return message.decode("utf-8", errors="replace")
+
+    def close(self):
+        try:
+            self._send(OP_CLOSE, struct.pack("!H", 1000))
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class MarketStream(QObject):
+    """
+    Finnhub trade stream for subscribed tickers, with the poller's
+    subscribe/unsubscribe interface.
+
+    Each trade is folded into its ticker's pending open/high/low/close/volume
+    in constant time on the stream thread. Every flush interval the pending
+    updates go to the GUI thread as one batch, and trades_updated is emitted
+    once per ticker that traded.
+    """
+    trades_updated = Signal(str, dict)  # Ticker, {'open', 'high', 'low', 'close', 'volume', 'time', 'count'}
+    status_changed = Signal(str)  # "connecting", "live" or "disconnected"
+    _batch_ready = Signal(dict)
+    _status_ready = Signal(str)
+
+    def __init__(self, parent=None, url: str = None, token: str = None):
+        super().__init__(parent)
+        from config import FINNHUB_WS_URL
+        self.url = url or FINNHUB_WS_URL
+        self.token = os.getenv("FINNHUB_KEY", "") if token is None else token
+        self.status = "disconnected"
+        self.latest: Dict[str, Dict] = {}  # Last flushed update per ticker
+        self._subscriptions: Dict[str, int] = {}  # Ticker -> subscriber count
+        self._pending: Dict[str, Dict] = {}  # Stream thread only: trades since the last flush
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._socket: Optional[WebSocket] = None
+        self._batch_ready.connect(self._deliver_batch)
+        self._status_ready.connect(self._deliver_status)
+
+    def subscribe(self, ticker: str) -> Optional[Dict]:
+        """
+        Add a subscriber for ticker and connect if needed.
+
+        Returns:
+            Optional[Dict]: Last flushed update for the ticker, if any
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            self._subscriptions[ticker] = self._subscriptions.get(ticker, 0) + 1
+        self._wake.set()
+        self._start()
+        return self.latest.get(ticker)
+
+    def unsubscribe(self, ticker: str):
+        """Remove one subscriber; the ticker is dropped when none are left"""
+        ticker = ticker.upper()
+        with self._lock:
+            count = self._subscriptions.get(ticker, 0) - 1
+            if count > 0:
+                self._subscriptions[ticker] = count
+            else:
+                self._subscriptions.pop(ticker, None)
+        self._wake.set()
+
+    def subscriptions(self) -> List[str]:
+        with self._lock:
+            return list(self._subscriptions)
+
+    def stop(self):
+        """Close the connection and stop the stream thread"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._socket:
+            self._socket.close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MarketStream", daemon=True)
+        self._thread.start()
+
+    def _set_status(self, status: str):
+        if status != self.status:
+            self.status = status
+            self._status_ready.emit(status)
+
+    def _run(self):
+        from config import STREAM_CONFIG
+
+        delay = STREAM_CONFIG["reconnect_delay"]
+        while not self._stop_event.is_set():
+            if not self.subscriptions():
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            self._set_status("connecting")
+            url = f"{self.url}?{urlencode({'token': self.token})}" if self.token else self.url
+            try:
+                self._socket = WebSocket.connect(url, timeout=STREAM_CONFIG["connect_timeout"])
+                logging.info(f"Trade stream connected to {self.url}")
+                self._set_status("live")
+                delay = STREAM_CONFIG["reconnect_delay"]
+                self._stream(STREAM_CONFIG["flush_interval"])
+            except (OSError, WebSocketError) as e:
+                if not self._stop_event.is_set():
+                    logging.warning(f"Trade stream disconnected: {e}")
+            finally:
+                if self._socket:
+                    self._socket.close()
+                    self._socket = None
+                self._set_status("disconnected")
+
+            if not self._stop_event.is_set():
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, STREAM_CONFIG["max_reconnect_delay"])
+
+    def _stream(self, flush_interval: float):
+        """Receive trades until the connection drops, there are no subscriptions or stop() is called"""
+        sent = set()
+        next_flush = time.monotonic() + flush_interval
+        while not self._stop_event.is_set():
+            wanted = set(self.subscriptions())
+            if not wanted:
+                return
+            for ticker in wanted - sent:
+                self._socket.send_text(json.dumps({"type": "subscribe", "symbol": ticker}))
+            for ticker in sent - wanted:
+                self._socket.send_text(json.dumps({"type": "unsubscribe", "symbol": ticker}))
+            sent = wanted
+
+            message = self._socket.recv(timeout=max(0.0, next_flush - time.monotonic()))
+            if message:
+                self._handle_message(message)
+            if time.monotonic() >= next_flush:
+                next_flush = time.monotonic() + flush_interval
+                if self._pending:
+                    self._batch_ready.emit(self._pending)
+                    self._pending = {}
+
+    def _handle_message(self, text: str):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if message.get("type") != "trade":
+            return
+        for trade in message.get("data") or ():
+            self._add_trade(trade.get("s"), trade.get("p"), trade.get("v") or 0, trade.get("t"))
+
+    def _add_trade(self, ticker: Optional[str], price: Optional[float], volume: float, when_ms: Optional[int]):
+        """Fold one trade into its ticker's pending update in constant time"""
+        if not ticker or price is None:
+            return
+        when = when_ms / 1000 if when_ms else time.time()
+        pending = self._pending.get(ticker)
+        if pending is None:
+            self._pending[ticker] = {'open': price, 'high': price, 'low': price, 'close': price,
+                                     'volume': volume, 'time': when, 'count': 1}
+            return
+        if price > pending['high']:
+            pending['high'] = price
+        elif price < pending['low']:
+            pending['low'] = price
+        pending['close'] = price
+        pending['volume'] += volume
+        pending['time'] = when
+        pending['count'] += 1
+
+    def _deliver_batch(self, batch: Dict):
+        from instrumentation import metrics
+
+        subscribed = set(self.subscriptions())
+        for ticker, trades in batch.items():
+            metrics.increment("stream.trades", trades['count'])
+            self.latest[ticker] = trades
+            if ticker in subscribed:
+                self.trades_updated.emit(ticker, trades)
+
+    def _deliver_status(self, status: str):
+        self.status_changed.emit(status)
+
+
+class _ReplayHandler(socketserver.BaseRequestHandler):
+    """Serves one stream client: recorded messages, or synthetic trades when there is no recording"""
+
+    def handle(self):
+        try:
+            socket_ = self._handshake()
+        except (OSError, WebSocketError) as e:
+            logging.debug(f"Stream stand-in handshake failed: {e}")
+            return
+        subscribed = set()
+        try:
+            if self.server.messages:
+                self._replay(socket_, subscribed)
+            else:
+                self._synthesize(socket_, subscribed)
+        except (OSError, WebSocketError):
+            pass
+        finally:
+            socket_.close()
+
+    def _handshake(self) -> WebSocket:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                raise WebSocketError("Connection closed during handshake")
+            request += chunk
+        head, rest = request.split(b"\r\n\r\n", 1)
+        headers = {k.strip().lower(): v.strip() for k, v in
+                   (line.split(":", 1) for line in head.decode("latin-1").split("\r\n")[1:] if ":" in line)}
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.request.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            raise WebSocketError("Not a websocket request")
+        self.request.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {_accept_key(key)}\r\n\r\n"
+        ).encode())
+        return WebSocket(self.request, client=False, buffered=rest)
+
+    def _read_subscriptions(self, socket_: WebSocket, subscribed: set, timeout: float):
+        """Apply subscribe/unsubscribe messages that arrive within timeout"""
+        deadline = time.monotonic() + timeout
+        while not self.server.stopping.is_set():
+            message = socket_.recv(timeout=max(0.0, deadline - time.monotonic()))
+            if message is None:
+                return
+            try:
+                request = json.loads(message)
+            except ValueError:
+                continue
+            symbol = (request.get("symbol") or "").upper()
+            if request.get("type") == "subscribe" and symbol:
+                subscribed.add(symbol)
+            elif request.get("type") == "unsubscribe":
+                subscribed.discard(symbol)
+
+    def _replay(self, socket_: WebSocket, subscribed: set):
+        """Send the recording in a loop at its recorded pace, keeping subscribed symbols only"""
+        speed = self.server.speed
+        while not self.server.stopping.is_set():
+            started = time.monotonic()
+            for entry in self.server.messages:
+                wait = started + entry['offset'] / speed - time.monotonic()
+                self._read_subscriptions(socket_, subscribed, max(0.0, wait))
+                message = entry['message']
+                if message.get("type") == "trade":
+                    trades = [t for t in message.get("data") or () if t.get("s") in subscribed]
+                    if not trades:
+                        continue
+                    message = {"type": "trade", "data": trades}
+                socket_.send_text(json.dumps(message))
+            self._read_subscriptions(socket_, subscribed, 0.1)
+
+    def _synthesize(self, socket_: WebSocket, subscribed: set):
+        """Random-walk trades for every subscribed symbol"""
+        rng = random.Random(self.server.seed)
+        prices: Dict[str, float] = {}
+        interval = 1.0 / self.server.rate
+        while not self.server.stopping.is_set():
+            self._read_subscriptions(socket_, subscribed, interval)
+            if not subscribed:
+                continue
+            now = int(time.time() * 1000)
+            trades = []
+            for symbol in sorted(subscribed):
+                price = prices.get(symbol) or 50.0 + sum(ord(c) for c in symbol) % 200
+                price = round(price * (1 + rng.gauss(0, 0.0005)), 2)
+                prices[symbol] = price
+                trades.append({"s": symbol, "p": price, "v": rng.randint(1, 500), "t": now, "c": None})
+            socket_.send_text(json.dumps({"type": "trade", "data": trades}))
+
+
+class StreamReplayServer(socketserver.ThreadingTCPServer):
+    """
+    Local stand-in for the Finnhub trade stream.
+
+    Args:
+        recording_file: Messages written by `record` (None for synthetic trades)
+        port: Port to listen on (0 picks a free port)
+        speed: Replay speed as a multiple of the recorded pace
+        rate: Synthetic trade messages per second
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, recording_file: Optional[str] = None, port: int = 0, speed: float = 1.0,
+                 rate: float = 20.0, seed: int = 7):
+        super().__init__(("127.0.0.1", port), _ReplayHandler)
+        self.messages: List[Dict] = []
+        if recording_file:
+            with open(recording_file, 'r', encoding='utf-8') as f:
+                self.messages = [json.loads(line) for line in f if line.strip()]
+        self.speed = max(speed, 1e-6)
+        self.rate = max(rate, 1e-6)
+        self.seed = seed
+        self.stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.server_address[1]}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment that points the app at this server"""
+        return {"STOXALOTL_FINNHUB_WS_URL": self.url}
+
+    def start(self) -> "StreamReplayServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="StreamReplayServer", daemon=True)
+        self._thread.start()
+        logging.info(f"Stream stand-in serving {len(self.messages) or 'synthetic'} messages at {self.url}")
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record(path: str, symbols: List[str], seconds: float, url: str = None, token: str = None) -> int:
+    """
+    Append live stream messages to a recording file
+
+    Returns:
+        int: Messages recorded
+    """
+    from config import FINNHUB_WS_URL
+
+    token = os.getenv("FINNHUB_KEY", "") if token is None else token
+    socket_ = WebSocket.connect(f"{url or FINNHUB_WS_URL}?{urlencode({'token': token})}")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    count = 0
+    try:
+        for symbol in symbols:
+            socket_.send_text(json.dumps({"type": "subscribe", "symbol": symbol.upper()}))
+        started = time.monotonic()
+        with open(path, 'a', encoding='utf-8') as f:
+            while time.monotonic() - started < seconds:
+                message = socket_.recv(timeout=1.0)
+                if not message:
+                    continue
+                f.write(json.dumps({'offset': round(time.monotonic() - started, 3),
+                                    'message': json.loads(message)}) + "\n")
+                count += 1
+    finally:
+        socket_.close()
+    return count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record or replay the Finnhub trade stream")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--file", help="Recording file (replay without one sends synthetic trades)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--symbols", nargs="+", default=["AAPL"], help="Symbols to record")
+    parser.add_argument("--seconds", type=float, default=300, help="How long to record")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed as a multiple of the recorded pace")
+    parser.add_argument("--rate", type=float, default=20.0, help="Synthetic trade messages per second")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.mode == "record":
+        path = args.file or os.path.join(RECORDINGS_DIR, "trades.jsonl")
+        print(f"Recorded {record(path, args.symbols, args.seconds)} messages to {path}")
+        return 0
+
+    server = StreamReplayServer(args.file, args.port, args.speed, args.rate).start()
+    print("Point the app at this server before starting it:")
+    for name, value in server.env().items():
+        print(f"  {name}={value}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
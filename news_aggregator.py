@@ -0,0 +1,220 @@
+"""
+News Aggregator Module
+Fetches news from Finnhub (company news for tickers, general news for
+topics) or NewsAPI and returns it in NewsAPI's article schema. Each query
+goes to the provider with the most quota left, and to the other one only
+if the first fails or finds too few articles; results from both are merged
+without duplicates. Calls are counted per quota window in the news store,
+so the counts survive restarts, and NewsAPI's small daily quota is paced
+across the day. A provider that reports a rate limit is skipped for a while.
+"""
+
+import re
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from config import NEWS_API_URL, NEWS_AGGREGATOR_CONFIG
+from rate_limiter import execute_news_api_request
+from logging_setup import SAMPLED
+from news_store import NewsStore, article_id, published_time, same_story, title_key
+
+PROVIDERS = ("finnhub", "newsapi")
+
+_TICKER = re.compile(r"[A-Z]{1,5}(?:[.\-][A-Z]{1,2})?")
+
+
+class NewsUnavailableError(Exception):
+    """No news provider could answer a query"""
+    pass
+
+
+def is_ticker(query: str) -> bool:
+    """Whether a query is a ticker (company news) rather than a topic such as "market" """
+    return bool(_TICKER.fullmatch(query))
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def normalize_finnhub(item: Dict) -> Dict:
+    """A Finnhub news item in NewsAPI's article schema"""
+    published = _utc(item.get('datetime') or 0)
+    return {
+        'title': item.get('headline') or '',
+        'description': item.get('summary') or '',
+        'url': item.get('url') or '',
+        'urlToImage': item.get('image') or None,
+        'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'formatted_date': published.strftime('%b %d, %Y'),
+        'source': {'name': item.get('source') or 'Finnhub'},
+        'provider': 'finnhub'
+    }
+
+
+def normalize_newsapi(article: Dict) -> Dict:
+    """A NewsAPI article with a readable date and its provider added"""
+    article = dict(article, provider='newsapi')
+    if 'publishedAt' in article:
+        try:
+            # Convert ISO date to more readable format
+            date_obj = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00'))
+            article['formatted_date'] = date_obj.strftime('%b %d, %Y')
+        except (TypeError, ValueError):
+            article['formatted_date'] = article['publishedAt']
+    return article
+
+
+def merge(*batches: List[Dict]) -> List[Dict]:
+    """
+    Articles from several providers, newest first, without duplicates
+
+    An article is a duplicate if its URL was already seen, or its title was
+    and news_store.same_story() holds; of two copies the one with a
+    description wins.
+    """
+    merged: Dict[str, Dict] = {}
+    titles: Dict[str, List[str]] = {}
+    for batch in batches:
+        for article in batch:
+            if not article.get('title'):
+                continue
+            key = article_id(article)
+            if key not in merged:
+                same_title = titles.setdefault(title_key(article), [])
+                key = next((other for other in same_title if same_story(article, merged[other])), key)
+                if key not in merged:
+                    same_title.append(key)
+            existing = merged.get(key)
+            if existing is None or (not existing.get('description') and article.get('description')):
+                merged[key] = article
+    return sorted(merged.values(), key=published_time, reverse=True)
+
+
+class NewsAggregator:
+    """
+    Picks providers for a query by remaining quota and fetches from them in turn.
+
+    Quota counters live in the news store's key-value store as
+    "quota:<provider>:<window>" -> calls made in that window, and
+    "exhausted:<provider>" -> set while a provider is backing off.
+    """
+
+    def __init__(self, store: NewsStore, newsapi_request: Callable, request_counter=None):
+        """
+        Args:
+            store: News store holding the quota counters
+            newsapi_request: Callable(url, params) returning NewsAPI's JSON (StockAPI._make_news_api_request)
+            request_counter: Optional RequestCounter credited with NewsAPI calls
+        """
+        self.kv = store.store
+        self.newsapi_request = newsapi_request
+        self.request_counter = request_counter
+
+    def _window(self, provider: str):
+        """(counter key, counter ttl, calls allowed) for the provider's current quota window"""
+        now = time.gmtime()
+        if provider == "finnhub":
+            return f"quota:finnhub:{time.strftime('%Y%m%d%H%M', now)}", 120, NEWS_AGGREGATOR_CONFIG["finnhub_per_minute"]
+        # NewsAPI's free tier resets daily
+        return f"quota:newsapi:{time.strftime('%Y%m%d', now)}", 2 * 86400, NEWS_AGGREGATOR_CONFIG["newsapi_daily"]
+
+    def remaining(self, provider: str) -> int:
+        """Calls left in the provider's current quota window"""
+        key, _, limit = self._window(provider)
+        return max(limit - self.kv.get(key, 0), 0)
+
+    def available(self, provider: str) -> bool:
+        if self.kv.get(f"exhausted:{provider}") or not self.remaining(provider):
+            return False
+        if provider == "newsapi":
+            # Spend the daily quota evenly: by hour h at most (h + 1) / 24 of it
+            now = time.gmtime()
+            used = NEWS_AGGREGATOR_CONFIG["newsapi_daily"] - self.remaining(provider)
+            return used < NEWS_AGGREGATOR_CONFIG["newsapi_daily"] * (now.tm_hour + 1) / 24
+        return True
+
+    def providers(self) -> List[str]:
+        """Providers with quota left, the one with the largest share of its window's quota left first"""
+        available = [provider for provider in PROVIDERS if self.available(provider)]
+        return sorted(available, key=lambda provider: self.remaining(provider) / self._window(provider)[2], reverse=True)
+
+    def _count(self, provider: str):
+        key, ttl, _ = self._window(provider)
+        self.kv.increment(key, ttl=ttl)
+        if provider == "newsapi" and self.request_counter:
+            self.request_counter.increment('news_api')
+
+    def _back_off(self, provider: str, error: Exception):
+        if "rate limit" in str(error).lower():
+            logging.warning(f"{provider} news quota exhausted; skipping it for a while")
+            self.kv.set(f"exhausted:{provider}", True, ttl=NEWS_AGGREGATOR_CONFIG["exhausted_backoff"])
+
+    def _fetch_finnhub(self, query: str, since: float, limit: int) -> List[Dict]:
+        # fetch_data pulls in pandas, so only import it once news is actually fetched
+        from fetch_data import get_ticker_news, get_market_news
+        if is_ticker(query):
+            items = get_ticker_news(query, _utc(since).strftime('%Y-%m-%d'), _utc(time.time()).strftime('%Y-%m-%d'), limit)
+        else:
+            items = get_market_news('general', limit)
+        articles = [normalize_finnhub(item) for item in items or [] if item.get('datetime', 0) >= since]
+        return articles[:limit]
+
+    def _fetch_newsapi(self, query: str, since: float, limit: int) -> List[Dict]:
+        params = {
+            'q': query,
+            'from': _utc(since).strftime('%Y-%m-%dT%H:%M:%S'),  # NewsAPI takes UTC times
+            'sortBy': 'publishedAt',  # Newest first, so a full page is the latest news
+            'language': 'en',
+            'pageSize': limit
+        }
+        logging.debug(f"Making news request to: {NEWS_API_URL} with query: {query}, from: {params['from']}", extra=SAMPLED)
+        data = execute_news_api_request(self.newsapi_request, NEWS_API_URL, params)
+        # data might be an error response from the request function
+        if data.get('status') != 'ok':
+            raise NewsUnavailableError(data.get('message', 'Unknown error'))
+        return [normalize_newsapi(article) for article in data.get('articles', [])]
+
+    def _fetch(self, provider: str, query: str, since: float, limit: int) -> List[Dict]:
+        self._count(provider)
+        fetch = self._fetch_finnhub if provider == "finnhub" else self._fetch_newsapi
+        return fetch(query, since, limit)
+
+    def fetch(self, query: str, since: float, limit: int) -> List[Dict]:
+        """
+        Articles published since a time, from the provider with the most quota left
+
+        The next provider is only asked when one fails or returns fewer than
+        NEWS_AGGREGATOR_CONFIG["min_articles"] articles.
+
+        Args:
+            query: Ticker or topic
+            since: Earliest publish time (epoch seconds)
+            limit: Articles to request from each provider
+
+        Returns:
+            List[Dict]: Merged articles, newest first
+
+        Raises:
+            NewsUnavailableError: If no provider had quota left or every one asked failed
+        """
+        providers = self.providers()
+        if not providers:
+            raise NewsUnavailableError("⚠️ News quota used up for now")
+
+        batches, errors = [], []
+        for provider in providers:
+            try:
+                batches.append(self._fetch(provider, query, since, limit))
+            except Exception as e:
+                logging.warning(f"{provider} news request for {query} failed: {e}")
+                self._back_off(provider, e)
+                errors.append(str(e))
+                continue
+            if sum(len(batch) for batch in batches) >= NEWS_AGGREGATOR_CONFIG["min_articles"]:
+                break
+        if not batches:
+            raise NewsUnavailableError("; ".join(errors))
+        return merge(*batches)
@@ -0,0 +1,251 @@
+"""
+News Feed Module
+List model, delegate and view for news articles. Articles are kept newest
+first and de-duplicated by URL; a refresh inserts only the articles not
+already shown, so rows already on screen are neither rebuilt nor re-laid
+out. The delegate paints each row straight from the article dict, and only
+for the rows that are visible, however long the feed grows. The accent bar
+shows the article's stored sentiment score.
+"""
+
+import bisect
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt, QUrl
+from PySide6.QtGui import QColor, QDesktopServices, QFont, QFontMetrics, QPainter
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from config import COLOR_PALETTES, FONT_FAMILY, FONT_SIZES, NEWS_FEED_CONFIG
+from sentiment import sentiment_label
+
+ArticleRole = Qt.UserRole
+
+
+def article_key(article: Dict) -> str:
+    """
+    Identity of an article for de-duplication: its URL without the fragment,
+    trailing slash or host case, or its title when it has no URL
+    """
+    url = (article.get('url') or '').strip()
+    if not url:
+        return (article.get('title') or '').strip().lower()
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+
+def published_time(article: Dict) -> float:
+    """Epoch seconds of publishedAt (ISO 8601 or YYYY-MM-DD), 0 if missing or unparseable"""
+    published = article.get('publishedAt') or ''
+    try:
+        return datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def is_system_article(article: Dict) -> bool:
+    """Whether get_news produced the article to report a failure"""
+    return article.get('source', {}).get('name') == 'System'
+
+
+class NewsListModel(QAbstractListModel):
+    """
+    Articles newest first, at most max_articles of them.
+
+    add_articles() inserts new articles at their place in the order and
+    skips ones whose article_key() is already present. DisplayRole is the
+    title; ArticleRole is the article dict.
+    """
+
+    def __init__(self, max_articles: int = None, parent=None):
+        super().__init__(parent)
+        self.max_articles = NEWS_FEED_CONFIG["max_articles"] if max_articles is None else max_articles
+        self._articles: List[Dict] = []
+        # Negated publish times, ascending, parallel to _articles
+        self._order: List[float] = []
+        self._keys = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._articles)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        article = self._articles[index.row()]
+        if role == Qt.DisplayRole:
+            return article.get('title') or 'No Title'
+        if role == ArticleRole:
+            return article
+        if role == Qt.ToolTipRole:
+            return article.get('description') or None
+        return None
+
+    def articles(self) -> List[Dict]:
+        return list(self._articles)
+
+    def add_articles(self, articles: Iterable[Dict]) -> int:
+        """
+        Insert the articles not already in the feed
+
+        Args:
+            articles: Article dicts as returned by StockAPI.get_news
+
+        Returns:
+            int: Number of articles inserted
+        """
+        added = 0
+        for article in articles:
+            key = article_key(article)
+            if not key or key in self._keys:
+                continue
+            order = -published_time(article)
+            # After articles published at the same time, so a batch keeps its own order
+            row = bisect.bisect_right(self._order, order)
+            if row >= self.max_articles:
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._articles.insert(row, article)
+            self._order.insert(row, order)
+            self._keys.add(key)
+            self.endInsertRows()
+            added += 1
+
+        if len(self._articles) > self.max_articles:
+            self.beginRemoveRows(QModelIndex(), self.max_articles, len(self._articles) - 1)
+            for article in self._articles[self.max_articles:]:
+                self._keys.discard(article_key(article))
+            del self._articles[self.max_articles:]
+            del self._order[self.max_articles:]
+            self.endRemoveRows()
+        return added
+
+    def set_articles(self, articles: Iterable[Dict]):
+        """Replace the feed, e.g. when switching to another ticker's news"""
+        self.beginResetModel()
+        self._articles, self._order, self._keys = [], [], set()
+        self.endResetModel()
+        self.add_articles(articles)
+
+    def clear(self):
+        self.set_articles(())
+
+
+class NewsItemDelegate(QStyledItemDelegate):
+    """
+    Paints an article as title, source and date, and a one line summary, each
+    elided to the row width, beside a bar colored by the article's sentiment
+    """
+
+    PADDING = 8
+
+    def __init__(self, parent=None, theme: str = "Dark"):
+        super().__init__(parent)
+        self.colors = {name: QColor(value) for name, value in COLOR_PALETTES.get(theme, COLOR_PALETTES["Dark"]).items()}
+        self.title_font = QFont(FONT_FAMILY, FONT_SIZES["body"], QFont.Bold)
+        self.text_font = QFont(FONT_FAMILY, FONT_SIZES["small"])
+        title_height = QFontMetrics(self.title_font).height()
+        text_height = QFontMetrics(self.text_font).height()
+        self._lines = (title_height, text_height, text_height)
+        self._height = sum(self._lines) + 3 * self.PADDING
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self._height)
+
+    def paint(self, painter: QPainter, option, index):
+        article = index.data(ArticleRole)
+        if article is None:
+            return super().paint(painter, option, index)
+
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, self.colors['border'])
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, self.colors['surface'])
+        label = sentiment_label(article['sentiment']) if 'sentiment' in article else 'neutral'
+        accent = self.colors['primary'] if label == 'neutral' else self.colors[label]
+        painter.fillRect(QRect(rect.left(), rect.top() + self.PADDING, 3, rect.height() - 2 * self.PADDING), accent)
+
+        source = article.get('source', {}).get('name') or 'Unknown Source'
+        date = article.get('formatted_date') or (article.get('publishedAt') or '')[:10]
+        lines = (
+            (self.title_font, self.colors['text'], article.get('title') or 'No Title'),
+            (self.text_font, self.colors['text-secondary'], f"{source} • {date}" if date else source),
+            (self.text_font, self.colors['text-secondary'], article.get('description') or '')
+        )
+        left = rect.left() + 3 + 2 * self.PADDING
+        width = rect.right() - left - self.PADDING
+        top = rect.top() + self.PADDING
+        for (font, color, text), height in zip(lines, self._lines):
+            painter.setFont(font)
+            painter.setPen(color)
+            # Summaries can carry newlines; the row has room for one line
+            text = " ".join(text.split())
+            elided = QFontMetrics(font).elidedText(text, Qt.ElideRight, width)
+            painter.drawText(QRect(left, top, width, height), Qt.AlignLeft | Qt.AlignVCenter, elided)
+            top += height + self.PADDING // 2
+        painter.restore()
+
+
+class NewsListView(QListView):
+    """
+    Scrollable news feed over a NewsListModel. Activating an article opens
+    it in the browser; show_message() replaces the list with a line of text
+    for loading, empty and error states.
+    """
+
+    def __init__(self, model: Optional[NewsListModel] = None, parent=None):
+        super().__init__(parent)
+        self.news = model or NewsListModel(parent=self)
+        self.setModel(self.news)
+        self.setItemDelegate(NewsItemDelegate(self))
+        # Every row is the same height, so Qt sizes one row instead of measuring them all
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setWordWrap(False)
+        self._message = ""
+        self.activated.connect(self._open_article)
+
+    def show_message(self, text: str):
+        """Clear the feed and show text in its place"""
+        self._message = text
+        self.news.clear()
+        self.viewport().update()
+
+    def add_articles(self, articles: Iterable[Dict]) -> int:
+        self._message = ""
+        added = self.news.add_articles(articles)
+        self.viewport().update()
+        return added
+
+    def set_articles(self, articles: Iterable[Dict]):
+        self._message = ""
+        self.news.set_articles(articles)
+
+    # Same calls as the QTextEdit an AnalysisCard shows by default
+    def setPlainText(self, text: str):
+        self.show_message(text)
+
+    def toPlainText(self) -> str:
+        if not self.news.rowCount():
+            return self._message
+        return "\n\n".join(
+            f"{article.get('title') or 'No Title'}\n{article.get('description') or ''}"
+            for article in self.news.articles()
+        )
+
+    def _open_article(self, index):
+        url = (index.data(ArticleRole) or {}).get('url')
+        if url:
+            QDesktopServices.openUrl(QUrl(url))
+
+    def paintEvent(self, event):
+        if self.news.rowCount() or not self._message:
+            return super().paintEvent(event)
+        painter = QPainter(self.viewport())
+        painter.setPen(QColor(COLOR_PALETTES["Dark"]['text-secondary']))
+        painter.drawText(self.viewport().rect().adjusted(10, 10, -10, -10),
+                         Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, self._message)
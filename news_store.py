@@ -0,0 +1,280 @@
+"""
+News Store Module
+Local store of every news article fetched from the news providers, so
+overlapping queries ("market", "finance", tickers) share what has already
+been downloaded. Articles are kept in an AppendOnlyKVStore keyed by a hash
+of their URL; in memory they are indexed by the tickers they mention (and the
+query that fetched them), by publish date and by an inverted index over the
+words of the title and description. Each article is stored with its
+sentiment score, computed once in a batch when it arrives. StockAPI.get_news
+answers from here and only asks the providers for articles newer than the
+newest one stored.
+"""
+
+import os
+import re
+import bisect
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from config import NEWS_STORE_CONFIG
+from kv_store import AppendOnlyKVStore
+from sentiment import score_articles
+
+NEWS_STORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "news_store.jsonl")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# "$AAPL" and "(NASDAQ: AAPL)" style mentions
+_CASHTAG = re.compile(r"\$([A-Z]{1,5})\b")
+_EXCHANGE_TAG = re.compile(r"\((?:NASDAQ|NYSE|AMEX|NYSEARCA|OTC)\s*:\s*([A-Z][A-Z.\-]{0,5})\)")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with"
+}
+
+_news_store: Optional["NewsStore"] = None
+_news_store_lock = threading.Lock()
+
+
+def article_id(article: Dict) -> str:
+    """Stable id for an article: a hash of its URL (of its title when it has none)"""
+    url = (article.get('url') or '').strip().split('#')[0].rstrip('/')
+    basis = url or (article.get('title') or '').strip().lower()
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:16]
+
+
+def title_key(article: Dict) -> str:
+    """Title with case and punctuation dropped; the same story from two providers has two URLs"""
+    return _NON_WORD.sub(" ", (article.get('title') or '').lower()).strip()
+
+
+def source_name(article: Dict) -> str:
+    return ((article.get('source') or {}).get('name') or '').strip().lower()
+
+
+def same_story(article: Dict, other: Dict) -> bool:
+    """
+    Whether two articles with the same title_key are copies of one story.
+    Generic titles ("Stock market today") recur across outlets, so a shared
+    title only counts when one copy has no URL or both name the same source.
+    """
+    if not article.get('url') or not other.get('url'):
+        return True
+    return source_name(article) == source_name(other)
+
+
+def published_time(article: Dict) -> float:
+    """Epoch seconds of publishedAt, 0 if missing or unparseable"""
+    try:
+        return datetime.fromisoformat((article.get('publishedAt') or '').replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def terms(text: str) -> Set[str]:
+    """Lower-case words of text worth indexing"""
+    return {word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in _STOPWORDS}
+
+
+def ticker_mentions(text: str) -> Set[str]:
+    """Tickers an article names explicitly, as cashtags or exchange tags"""
+    return set(_CASHTAG.findall(text)) | set(_EXCHANGE_TAG.findall(text))
+
+
+class NewsStore:
+    """
+    Persistent, indexed article store.
+
+    Entries are "article:<id>" -> article dict (with 'mentions' and 'sentiment' added)
+    and "query:<QUERY>" -> when the providers were last asked about the query.
+    Articles expire after retention_days; the indexes are rebuilt from the
+    store on open and skip expired articles when queried.
+    """
+
+    def __init__(self, path: str = NEWS_STORE_FILE):
+        self.store = AppendOnlyKVStore(path)
+        self.retention = NEWS_STORE_CONFIG["retention_days"] * 86400
+        self._lock = threading.RLock()
+        self._mentions: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._published: Dict[str, float] = {}
+        # title_key -> ids of the stored articles with that title
+        self._titles: Dict[str, Set[str]] = {}
+        # (publish time, id), ascending
+        self._by_date: List[tuple] = []
+        unscored = []
+        for key, article in self.store.items("article:"):
+            self._index(key[8:], article)
+            if 'sentiment' not in article:
+                unscored.append((key, article))
+        # Articles stored before scores were kept
+        for (key, article), score in zip(unscored, score_articles([article for _, article in unscored])):
+            self.store.update(key, dict(article, sentiment=round(score, 3)))
+
+    def __len__(self) -> int:
+        return len(self._by_date)
+
+    def _index(self, aid: str, article: Dict):
+        """Add an article to the in-memory indexes; caller holds the lock or is the constructor"""
+        for ticker in article.get('mentions', []):
+            self._mentions.setdefault(ticker, set()).add(aid)
+        text = f"{article.get('title') or ''} {article.get('description') or ''}"
+        for term in terms(text):
+            self._terms.setdefault(term, set()).add(aid)
+        published = published_time(article)
+        if aid in self._published:
+            # Re-stored after expiring
+            self._by_date.remove((self._published[aid], aid))
+        self._published[aid] = published
+        self._titles.setdefault(title_key(article), set()).add(aid)
+        bisect.insort(self._by_date, (published, aid))
+
+    def _story_id(self, article: Dict, batch_ids: Set[str], batch_titles: Dict[str, List[tuple]]) -> str:
+        """
+        Id the article is stored under: its own URL hash if that is already
+        stored (or in this batch), otherwise the id of a same_story() copy
+        stored or in this batch, otherwise its own
+        """
+        aid = article_id(article)
+        if aid in batch_ids or self.store.get(f"article:{aid}") is not None:
+            return aid
+        key = title_key(article)
+        for other_id, other in batch_titles.get(key, ()):
+            if same_story(article, other):
+                return other_id
+        for other_id in self._titles.get(key, ()):
+            other = self.store.get(f"article:{other_id}")
+            if other is not None and same_story(article, other):
+                return other_id
+        return aid
+
+    def add(self, articles: Iterable[Dict], query: Optional[str] = None) -> int:
+        """
+        Store the articles not already stored
+
+        Args:
+            articles: Article dicts in NewsAPI's schema
+            query: Query that fetched them; stored articles are found by it later
+
+        Returns:
+            int: Number of new articles
+        """
+        added = []
+        # Ids and titles of the new articles, which are only indexed once scored
+        batch_ids, batch_titles = set(), {}
+        query = query.upper() if query else None
+        with self._lock:
+            for article in articles:
+                if not article.get('title'):
+                    continue
+                aid = self._story_id(article, batch_ids, batch_titles)
+                if aid in batch_ids:
+                    continue
+                key = f"article:{aid}"
+                stored = self.store.get(key)
+                if stored is not None:
+                    # Already known; just remember this query found it too
+                    if query and query not in stored.get('mentions', []):
+                        stored = dict(stored, mentions=stored.get('mentions', []) + [query])
+                        # Found again, not fetched again: it still expires retention_days after it was stored
+                        self.store.update(key, stored)
+                        self._mentions.setdefault(query, set()).add(aid)
+                    continue
+                text = f"{article.get('title') or ''} {article.get('description') or ''}"
+                mentions = ticker_mentions(text)
+                if query:
+                    mentions.add(query)
+                article = dict(article, mentions=sorted(mentions))
+                added.append((aid, article))
+                batch_ids.add(aid)
+                batch_titles.setdefault(title_key(article), []).append((aid, article))
+            # Score every new article in one pass
+            for (aid, article), score in zip(added, score_articles([article for _, article in added])):
+                article['sentiment'] = round(score, 3)
+                self.store.set(f"article:{aid}", article, ttl=self.retention)
+                self._index(aid, article)
+        return len(added)
+
+    def _articles(self, ids: Optional[Set[str]], since: float, limit: int) -> List[Dict]:
+        """Stored articles among ids (None for any) published at or after since, newest first"""
+        results = []
+        with self._lock:
+            if ids is None:
+                start = bisect.bisect_left(self._by_date, (since, ""))
+                candidates = [aid for _, aid in reversed(self._by_date[start:])]
+            else:
+                candidates = sorted((aid for aid in ids if self._published[aid] >= since),
+                                    key=self._published.get, reverse=True)
+            for aid in candidates:
+                article = self.store.get(f"article:{aid}")
+                if article is not None:
+                    results.append(article)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def recent(self, since: float = 0, limit: int = 20) -> List[Dict]:
+        """Stored articles published at or after since, newest first"""
+        return self._articles(None, since, limit)
+
+    def articles_for(self, query: str, since: float = 0, limit: int = 20) -> List[Dict]:
+        """
+        Stored articles about a ticker or topic: those fetched for it, those
+        mentioning it as a ticker, and those containing all of its words
+
+        Args:
+            query: Ticker or search words
+            since: Earliest publish time (epoch seconds)
+            limit: Maximum number of articles
+
+        Returns:
+            List[Dict]: Articles, newest first
+        """
+        with self._lock:
+            ids = set(self._mentions.get(query.upper(), ()))
+            ids |= self._matching(query)
+        return self._articles(ids, since, limit)
+
+    def search(self, text: str, since: float = 0, limit: int = 20) -> List[Dict]:
+        """Stored articles containing every word of text, newest first"""
+        with self._lock:
+            ids = self._matching(text)
+        return self._articles(ids, since, limit)
+
+    def _matching(self, text: str) -> Set[str]:
+        words = terms(text)
+        if not words:
+            return set()
+        postings = sorted((self._terms.get(word, set()) for word in words), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def latest(self, query: str) -> float:
+        """Publish time of the newest stored article fetched for or mentioning query, 0 if none"""
+        with self._lock:
+            return max((self._published[aid] for aid in self._mentions.get(query.upper(), ())), default=0.0)
+
+    def last_fetched(self, query: str) -> float:
+        """When the providers were last asked about query, 0 if never"""
+        return self.store.get(f"query:{query.upper()}", 0)
+
+    def mark_fetched(self, query: str, when: float):
+        self.store.set(f"query:{query.upper()}", when, ttl=self.retention)
+
+    def flush(self):
+        self.store.flush()
+
+
+def get_news_store() -> NewsStore:
+    """Open the shared news store on first use"""
+    global _news_store
+    if _news_store is not None:
+        return _news_store
+    with _news_store_lock:
+        if _news_store is None:
+            logging.debug(f"Opening news store {NEWS_STORE_FILE}")
+            _news_store = NewsStore(NEWS_STORE_FILE)
+        return _news_store
@@ -7,6 +7,8 @@ import requests
 
 # Import from config to ensure consistency
 from config import FINNHUB_KEY, NEWS_API_KEY, NEWS_API_URL, OLLAMA_MODEL
+from instrumentation import metrics
+from logging_setup import SAMPLED
 
 class RateLimiter:
     """
@@ -162,11 +164,17 @@ class APIRequestQueue:
         self.threads = []
         self.running = True
         
-        # Start worker threads
-        for i in range(workers):
+        # Worker threads are started by the first execute() so that importing
+        # this module doesn't spin up threads for providers that are never used
+    
+    def _start_workers(self):
+        """Start the worker threads if they aren't running yet. Call with self.lock held."""
+        if self.threads:
+            return
+        for i in range(self.workers):
             thread = threading.Thread(
                 target=self._worker,
-                name=f"{rate_limiter.name}Worker-{i+1}"
+                name=f"{self.rate_limiter.name}Worker-{i+1}"
             )
             thread.daemon = True
             thread.start()
@@ -191,16 +199,21 @@ class APIRequestQueue:
             
             # Process request outside lock
             if request:
-                func, args, kwargs, result_event, result_container = request
+                func, args, kwargs, result_event, result_container, queued_at = request
+                name = self.rate_limiter.name.lower()
+                # Time spent queued behind other requests
+                metrics.record(f"queue.{name}.wait", time.perf_counter() - queued_at)
                 try:
                     # Apply rate limiting
                     wait_time = self.rate_limiter.acquire()
+                    metrics.record(f"limiter.{name}.wait", wait_time)
                     
                     if wait_time > 0:
-                        logging.info(f"Request waited {wait_time:.2f}s due to rate limiting")
+                        logging.debug(f"Request waited {wait_time:.2f}s due to rate limiting", extra=SAMPLED)
                     
                     # Execute the request
-                    result = func(*args, **kwargs)
+                    with metrics.span(f"queue.{name}.exec"):
+                        result = func(*args, **kwargs)
                     result_container['result'] = result
                     
                 except Exception as e:
@@ -235,9 +248,11 @@ class APIRequestQueue:
                 
             if not self.running:
                 raise RuntimeError("API request queue is shutting down")
+            
+            self._start_workers()
                 
             # Add to queue
-            self.queue.append((func, args, kwargs, result_event, result_container))
+            self.queue.append((func, args, kwargs, result_event, result_container, time.perf_counter()))
             self.not_empty.notify()
         
         # Wait for result
@@ -282,17 +297,25 @@ ollama_limiter = RateLimiter(
     name="Ollama"
 )
 
+tradingview_limiter = RateLimiter(
+    max_rate=0.5,  # Max 1 per 2 seconds; each request covers many symbols
+    burst_limit=3,
+    name="TradingView"
+)
+
 # Create request queues
 finnhub_queue = APIRequestQueue(finnhub_limiter, workers=1)
 news_api_queue = APIRequestQueue(news_api_limiter, workers=1)
 ollama_queue = APIRequestQueue(ollama_limiter, workers=1)
+tradingview_queue = APIRequestQueue(tradingview_limiter, workers=1)
 
 def get_rate_limiter_stats():
     """Get stats from all rate limiters for display."""
     return {
-        "finnhub": finnhub_limiter.get_stats(),
-        "news_api": news_api_limiter.get_stats(),
-        "ollama": ollama_limiter.get_stats()
+        "finnhub": dict(finnhub_limiter.get_stats(), queue_depth=len(finnhub_queue.queue)),
+        "news_api": dict(news_api_limiter.get_stats(), queue_depth=len(news_api_queue.queue)),
+        "ollama": dict(ollama_limiter.get_stats(), queue_depth=len(ollama_queue.queue)),
+        "tradingview": dict(tradingview_limiter.get_stats(), queue_depth=len(tradingview_queue.queue))
     }
 
 # Shutdown function to cleanly close all queues
@@ -300,6 +323,7 @@ def shutdown_all():
     finnhub_queue.shutdown()
     news_api_queue.shutdown()
     ollama_queue.shutdown()
+    tradingview_queue.shutdown()
     logging.info("All API request queues have been shut down")
 
 # Helper utility functions for common operations
@@ -314,3 +338,7 @@ def execute_news_api_request(func, *args, **kwargs):
 def execute_ollama_request(func, *args, **kwargs):
     """Execute an Ollama API request with proper rate limiting."""
     return ollama_queue.execute(func, *args, **kwargs)
+
+def execute_tradingview_request(func, *args, **kwargs):
+    """Execute a TradingView request with proper rate limiting."""
+    return tradingview_queue.execute(func, *args, **kwargs)
@@ -7,23 +7,14 @@ import sys
 import os
 import logging
 import traceback
-from datetime import datetime
 
-# Set up logging
-log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
+# Imported first so the startup timeline starts as early as possible
+from startup_profiler import profiler as startup_profiler
 
-log_file = os.path.join(log_dir, f"stoxalotl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging: JSON lines in logs/, written by a background thread and
+# rotated by size and date
+from logging_setup import setup_logging, LOG_FILE as log_file
+setup_logging()
 
 logging.info(f"Starting Stoxalotl - log file: {log_file}")
 
@@ -71,8 +62,10 @@ if __name__ == "__main__":
             logging.info("Running system checks...")
             # First try direct import
             try:
-                from system_check import run_all_checks
-                if not run_all_checks():
+                with startup_profiler.phase("system checks"):
+                    from system_check import run_all_checks
+                    checks_passed = run_all_checks()
+                if not checks_passed:
                     logging.warning("Some system checks failed. Proceeding anyway...")
             except (ImportError, AttributeError) as e:
                 logging.warning(f"Could not run system checks: {e}")
@@ -86,12 +79,24 @@ if __name__ == "__main__":
             logging.info("Starting main application...")
             try:
                 # Try to import directly
-                from main import ModernStockApp
-                from PySide6.QtWidgets import QApplication
+                with startup_profiler.phase("import application"):
+                    from main import ModernStockApp
+                    from PySide6.QtWidgets import QApplication
+                    from PySide6.QtCore import QTimer
                 
-                app = QApplication(sys.argv)
-                window = ModernStockApp()
-                window.show()
+                with startup_profiler.phase("create QApplication"):
+                    app = QApplication(sys.argv)
+                with startup_profiler.phase("construct main window"):
+                    window = ModernStockApp()
+                with startup_profiler.phase("show window"):
+                    window.show()
+
+                # The first event loop iteration means the window is up and responsive
+                def _startup_complete():
+                    startup_profiler.mark("event loop running")
+                    startup_profiler.report()
+
+                QTimer.singleShot(0, _startup_complete)
                 sys.exit(app.exec())
             except ImportError as e:
                 error_msg = f"Failed to import application modules: {e}\n\n"
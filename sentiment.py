@@ -0,0 +1,158 @@
+"""
+Sentiment Module
+Local, lexicon-based sentiment scoring for news and analysis text. The
+lexicon and the negation words are compiled into one regular expression,
+so a text, or a whole batch of texts joined together, is scored in a single
+left-to-right pass: each lexicon hit adds its weight, flipped if a negation
+word came shortly before it in the same sentence. Scores are squashed into
+-1..1.
+"""
+
+import re
+import math
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from config import COLOR_PALETTES
+
+# Term or phrase -> weight. Phrases are matched before the words inside them.
+LEXICON: Dict[str, float] = {
+    # Analyst and recommendation language
+    "buy": 1.5, "strong buy": 2.5, "outperform": 2.0, "overweight": 1.5, "upgrade": 2.0, "upgraded": 2.0,
+    "sell": -1.5, "strong sell": -2.5, "underperform": -2.0, "underweight": -1.5, "downgrade": -2.0,
+    "downgraded": -2.0, "price target raised": 2.0, "price target cut": -2.0, "raises price target": 2.0,
+    "cuts price target": -2.0,
+    # Results and guidance
+    "beat": 1.5, "beats": 1.5, "beat estimates": 2.0, "tops estimates": 2.0, "record": 1.0,
+    "miss": -1.5, "misses": -1.5, "missed": -1.5, "missed estimates": -2.0, "profit warning": -2.5,
+    "raises guidance": 2.0, "raised guidance": 2.0, "cuts guidance": -2.0, "cut guidance": -2.0,
+    "profit": 0.5, "loss": -1.0, "losses": -1.0,
+    # Price action
+    "bullish": 1.5, "bearish": -1.5, "rally": 1.5, "rallies": 1.5, "surge": 1.5, "surges": 1.5,
+    "soar": 1.5, "soars": 1.5, "jump": 1.0, "jumps": 1.0, "gain": 1.0, "gains": 1.0, "rise": 0.5,
+    "rises": 0.5, "uptrend": 1.5, "plunge": -2.0, "plunges": -2.0, "tumble": -1.5, "tumbles": -1.5,
+    "slump": -1.5, "slumps": -1.5, "drop": -1.0, "drops": -1.0, "fall": -0.5, "falls": -0.5,
+    "decline": -1.0, "declines": -1.0, "downtrend": -1.5, "selloff": -1.5, "sell-off": -1.5,
+    "all-time high": 1.5, "52-week low": -1.5,
+    # Company and market conditions
+    "growth": 1.0, "strong": 1.0, "positive": 1.0, "opportunity": 1.0, "optimism": 1.0, "optimistic": 1.0,
+    "expansion": 0.5, "partnership": 0.5, "approval": 1.0, "approved": 1.0, "dividend increase": 1.5,
+    "buyback": 1.0, "weak": -1.0, "negative": -1.0, "risk": -0.5, "risks": -0.5, "caution": -0.5,
+    "concern": -1.0, "concerns": -1.0, "uncertainty": -1.0, "volatile": -0.5, "lawsuit": -1.5,
+    "investigation": -1.5, "recall": -1.5, "layoffs": -1.0, "bankruptcy": -3.0, "default": -2.0,
+    "fraud": -3.0, "pessimism": -1.0, "pessimistic": -1.0, "recession": -1.5, "inflation": -0.5
+}
+
+NEGATIONS = ["not", "no", "never", "without", "neither", "nor", "hardly", "fails to", "failed to"]
+# Words after a negation whose sentiment it flips
+NEGATION_WINDOW = 3
+# Larger squashes scores towards 0 more; roughly the raw score that maps to 0.6
+SCORE_SCALE = 15.0
+# |score| below this is neutral
+NEUTRAL_BAND = 0.05
+
+_SEPARATOR = "\x00"
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    # Longest first, so "beat estimates" wins over "beat"
+    return "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+
+
+class SentimentScorer:
+    """
+    Compiled lexicon scorer.
+
+    The pattern has one branch per token kind: text separator (for batches),
+    sentence end, negation (including any "n't" word), lexicon term and,
+    last, any other word, which only advances the negation window.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, negations: Optional[List[str]] = None,
+                 window: int = NEGATION_WINDOW):
+        self.lexicon = {term.lower(): weight for term, weight in (lexicon or LEXICON).items()}
+        self.window = window
+        self.pattern = re.compile(
+            rf"(?P<sep>{_SEPARATOR})|(?P<stop>[.!?;])"
+            rf"|\b(?P<neg>{_alternation(negations or NEGATIONS)}|\w+n't)\b"
+            rf"|(?<![\w-])(?P<term>{_alternation(self.lexicon)})(?![\w-])"
+            r"|(?P<word>[\w'-]+)",
+            re.IGNORECASE
+        )
+
+    def _raw_scores(self, text: str, count: int) -> List[float]:
+        """Summed weights per separator-delimited part of text"""
+        totals = [0.0] * count
+        part = 0
+        position = 0                # Words seen in the current sentence
+        negated_until = -1          # Last word position a negation still covers
+        lexicon = self.lexicon
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == "word":
+                position += 1
+            elif kind == "term":
+                weight = lexicon[match.group(kind).lower()]
+                totals[part] += -weight if position <= negated_until else weight
+                position += 1
+            elif kind == "neg":
+                position += 1
+                negated_until = position + self.window - 1
+            else:
+                position, negated_until = 0, -1
+                if kind == "sep":
+                    part += 1
+        return totals
+
+    @staticmethod
+    def _squash(raw: float) -> float:
+        return raw / math.sqrt(raw * raw + SCORE_SCALE)
+
+    def score(self, text: str) -> float:
+        """Sentiment of text in -1..1"""
+        return self._squash(self._raw_scores((text or "").replace(_SEPARATOR, " "), 1)[0])
+
+    def score_many(self, texts: List[str]) -> List[float]:
+        """Sentiment of each text, all scored in one pass over the joined texts"""
+        if not texts:
+            return []
+        joined = _SEPARATOR.join((text or "").replace(_SEPARATOR, " ") for text in texts)
+        return [self._squash(raw) for raw in self._raw_scores(joined, len(texts))]
+
+
+_scorer: Optional[SentimentScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_scorer() -> SentimentScorer:
+    """The shared scorer, compiled on first use"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = SentimentScorer()
+    return _scorer
+
+
+def article_text(article: Dict) -> str:
+    return f"{article.get('title') or ''}. {article.get('description') or ''}"
+
+
+def score_articles(articles: List[Dict]) -> List[float]:
+    """Sentiment of each article's title and description, in one pass"""
+    return get_scorer().score_many([article_text(article) for article in articles])
+
+
+def sentiment_label(score: float) -> str:
+    if score >= NEUTRAL_BAND:
+        return "positive"
+    if score <= -NEUTRAL_BAND:
+        return "negative"
+    return "neutral"
+
+
+def sentiment_color(score: float, theme: str = "Dark") -> str:
+    """Theme color for a score; gold when neutral"""
+    colors = COLOR_PALETTES.get(theme, COLOR_PALETTES["Dark"])
+    label = sentiment_label(score)
+    return colors[label] if label != "neutral" else "#FFD700"
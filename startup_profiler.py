@@ -0,0 +1,84 @@
+"""
+Startup Profiler Module
+Records a timeline of named startup phases so slow imports and blocking
+initialization show up in the log with their cost.
+"""
+
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class StartupProfiler:
+    """
+    Collects (phase, start, duration) entries relative to a common origin.
+
+    Phases may nest. Once report() has been called, phases that finish later
+    (background loads started after the window is shown) are logged as they
+    complete instead of being held for the report.
+    """
+
+    def __init__(self, name: str = "Startup"):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.reported = False
+
+    def elapsed(self) -> float:
+        """Seconds since the profiler was created"""
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        """
+        Record a phase from perf_counter() timestamps
+
+        Args:
+            name: Phase name
+            start: perf_counter() value when the phase began
+            end: perf_counter() value when it ended (default: now)
+        """
+        end = end if end is not None else time.perf_counter()
+        entry = {
+            'phase': name,
+            'offset': start - self.origin,
+            'duration': end - start
+        }
+        self.phases.append(entry)
+        if self.reported:
+            logging.info(f"{self.name} phase {name}: {entry['duration'] * 1000:.0f} ms "
+                         f"(finished at +{(end - self.origin) * 1000:.0f} ms)")
+
+    def mark(self, name: str):
+        """Record a zero-length event, e.g. 'window shown'"""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def report(self) -> str:
+        """
+        Log the timeline collected so far
+
+        Returns:
+            str: The formatted timeline
+        """
+        lines = [f"{self.name} timeline ({self.elapsed() * 1000:.0f} ms total):"]
+        for entry in sorted(self.phases, key=lambda e: e['offset']):
+            lines.append(f"  +{entry['offset'] * 1000:7.0f} ms {entry['duration'] * 1000:7.0f} ms  {entry['phase']}")
+        text = "\n".join(lines)
+        logging.info(text)
+        self.reported = True
+        return text
+
+
+# Shared profiler; its origin is the first import, so entry points should
+# import this module before anything heavy
+profiler = StartupProfiler()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+Headless command line interface for Stoxalotl
+
+Runs the data and AI layers without the Qt application, for scripted and
+server use:
+
+    python -m stoxalotl quote AAPL MSFT
+    python -m stoxalotl chart AAPL --timeframe 1M
+    python -m stoxalotl analyze NVDA
+    python -m stoxalotl batch --file tickers.txt --workers 4
+    python -m stoxalotl imports
+
+Only modules that do not touch PySide6 or pyqtgraph may be imported here or by
+anything reached from a command. `imports` checks that in a fresh interpreter.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import subprocess
+
+# Modules the headless commands rely on
+HEADLESS_MODULES = ["api_client", "batch_analysis", "ai_formatter", "helpers", "ticker_utils"]
+
+# Modules that must never be loaded by the headless layer
+GUI_MODULES = ["PySide6", "pyqtgraph", "widgets", "main"]
+
+# Import time budget for HEADLESS_MODULES in a fresh interpreter (seconds)
+IMPORT_BUDGET = 0.5
+
+
+def _print_json(data):
+    print(json.dumps(data, indent=2, default=str))
+
+
+def cmd_quote(args) -> int:
+    from api_client import StockAPI
+
+    api = StockAPI()
+    exit_code = 0
+    quotes = {}
+    for ticker in args.tickers:
+        ticker = ticker.upper()
+        try:
+            quotes[ticker] = api.get_stock(ticker, retries=args.retries)
+        except Exception as e:
+            logging.error(f"Quote failed for {ticker}: {e}")
+            quotes[ticker] = None
+            exit_code = 1
+
+    if args.json:
+        _print_json(quotes)
+        return exit_code
+
+    for ticker, quote in quotes.items():
+        if quote is None:
+            print(f"{ticker:<8} unavailable")
+        else:
+            print(f"{ticker:<8} {quote['c']:>10.2f} {quote['d']:>+9.2f} ({quote['dp']:+.2f}%)")
+    return exit_code
+
+
+def cmd_chart(args) -> int:
+    from api_client import StockAPI
+
+    ticker = args.ticker.upper()
+    df = StockAPI().get_chart_data(ticker, timeframe=args.timeframe)
+    if df is None or df.empty:
+        print(f"No chart data for {ticker}", file=sys.stderr)
+        return 1
+
+    if args.rows:
+        df = df.tail(args.rows)
+    if args.csv:
+        df.to_csv(sys.stdout, index_label="Date")
+    else:
+        print(df.to_string())
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    from batch_analysis import BatchAnalyzer
+
+    analyzer = BatchAnalyzer([args.ticker], include_ai=not args.no_ai)
+    if not analyzer.tickers:
+        print(f"Invalid ticker: {args.ticker}", file=sys.stderr)
+        return 1
+
+    try:
+        result = analyzer.analyze_ticker(analyzer.tickers[0])
+    except Exception as e:
+        print(f"Analysis failed: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        _print_json(result)
+    else:
+        quote = result['quote']
+        print(f"{result['ticker']}: {quote['c']:.2f} ({quote['dp']:+.2f}%)")
+        for stage, error in result['errors'].items():
+            print(f"  {stage} unavailable: {error}")
+        if result['analysis']:
+            print()
+            print(result['analysis'])
+    return 0
+
+
+def cmd_batch(args) -> int:
+    from batch_analysis import BatchAnalyzer
+
+    if args.resume:
+        analyzer = BatchAnalyzer.resume(max_workers=args.workers, include_ai=not args.no_ai)
+        if analyzer is None:
+            print("No unfinished batch run to resume", file=sys.stderr)
+            return 1
+    else:
+        tickers = list(args.tickers)
+        if args.file:
+            with open(args.file, 'r') as f:
+                tickers += [line.strip() for line in f if line.strip()]
+        if not tickers:
+            print("No tickers given", file=sys.stderr)
+            return 2
+        analyzer = BatchAnalyzer(tickers, max_workers=args.workers, include_ai=not args.no_ai)
+
+    def progress(ticker, done, total):
+        print(f"[{done}/{total}] {ticker}")
+
+    analyzer.progress_callback = progress
+    try:
+        analyzer.run()
+    except KeyboardInterrupt:
+        print("Batch run interrupted; rerun with --resume to continue", file=sys.stderr)
+        return 130
+
+    for ticker, error in analyzer.failed.items():
+        print(f"{ticker} failed: {error}", file=sys.stderr)
+    return 1 if analyzer.failed else 0
+
+
+def measure_imports(modules=None) -> dict:
+    """
+    Import modules in a fresh interpreter and report the cost
+
+    Args:
+        modules: Module names to import (default: HEADLESS_MODULES)
+
+    Returns:
+        dict: seconds taken and which GUI modules ended up loaded
+    """
+    modules = modules or HEADLESS_MODULES
+    probe = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}:\n"
+        "    __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {GUI_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': elapsed, 'gui_modules': loaded}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout
+    # Imported modules may print; the probe result is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def cmd_imports(args) -> int:
+    report = measure_imports()
+    report['budget'] = args.budget
+    ok = report['seconds'] <= args.budget and not report['gui_modules']
+
+    if args.json:
+        _print_json(report)
+    else:
+        print(f"Headless import time: {report['seconds'] * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)")
+        if report['gui_modules']:
+            print(f"GUI modules loaded: {', '.join(report['gui_modules'])}")
+    return 0 if ok else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="stoxalotl", description="Stoxalotl headless tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show info logging")
+    parser.add_argument("--metrics", metavar="FILE", help="Write latency histograms for the command to FILE")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    quote = subparsers.add_parser("quote", help="Print current quotes")
+    quote.add_argument("tickers", nargs="+")
+    quote.add_argument("--retries", type=int, default=1)
+    quote.add_argument("--json", action="store_true")
+    quote.set_defaults(func=cmd_quote)
+
+    chart = subparsers.add_parser("chart", help="Print OHLCV chart data")
+    chart.add_argument("ticker")
+    chart.add_argument("--timeframe", default="3M", choices=["1D", "1W", "1M", "3M", "6M", "1Y", "5Y"])
+    chart.add_argument("--rows", type=int, default=20, help="Show only the last N bars (0 = all)")
+    chart.add_argument("--csv", action="store_true")
+    chart.set_defaults(func=cmd_chart)
+
+    analyze = subparsers.add_parser("analyze", help="Run the full analysis for one ticker")
+    analyze.add_argument("ticker")
+    analyze.add_argument("--no-ai", action="store_true", help="Skip the LLM analysis stage")
+    analyze.add_argument("--json", action="store_true")
+    analyze.set_defaults(func=cmd_analyze)
+
+    batch = subparsers.add_parser("batch", help="Analyze many tickers in the background")
+    batch.add_argument("tickers", nargs="*", help="Ticker symbols to analyze")
+    batch.add_argument("--file", help="Text file with one ticker per line")
+    batch.add_argument("--workers", type=int, help="Tickers processed concurrently (default: BATCH_CONFIG)")
+    batch.add_argument("--no-ai", action="store_true", help="Skip the LLM analysis stage")
+    batch.add_argument("--resume", action="store_true", help="Resume the last interrupted run")
+    batch.set_defaults(func=cmd_batch)
+
+    imports = subparsers.add_parser("imports", help="Check the headless import time budget")
+    imports.add_argument("--budget", type=float, default=IMPORT_BUDGET, help="Budget in seconds")
+    imports.add_argument("--json", action="store_true")
+    imports.set_defaults(func=cmd_imports)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Configure before the data modules call basicConfig themselves
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    start = time.perf_counter()
+    exit_code = args.func(args)
+    logging.info(f"{args.command} finished in {time.perf_counter() - start:.2f}s")
+
+    if args.metrics:
+        from instrumentation import metrics
+        metrics.export(args.metrics)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Symbol Index Module
+In-memory index of known ticker symbols and company names. Serves prefix
+lookups for autocomplete and bounded edit-distance lookups for typo
+suggestions without scanning the whole symbol universe.
+"""
+
+import os
+import json
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# File paths
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SYMBOLS_FILE = os.path.join(DATA_DIR, "symbols.json")
+
+# Typo suggestions never go further than this many edits
+MAX_EDIT_DISTANCE = 2
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """
+    Levenshtein distance that gives up once it must exceed max_distance
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(previous_row[j + 1] + 1,
+                                   current_row[j] + 1,
+                                   previous_row[j] + (c1 != c2)))
+        if min(current_row) > max_distance:
+            return max_distance + 1
+        previous_row = current_row
+    return min(previous_row[-1], max_distance + 1)
+
+
+def load_symbols_file(path: str = SYMBOLS_FILE) -> Dict[str, str]:
+    """
+    Read the symbol list written by update_tickers.py
+
+    Returns:
+        Dict[str, str]: symbol -> company name (empty if the file is missing)
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {item['symbol']: item.get('description', '') for item in data.get('symbols', []) if item.get('symbol')}
+    except Exception as e:
+        logging.error(f"Error loading symbol list: {e}")
+        return {}
+
+
+class SymbolIndex:
+    """
+    Symbols and company names with three lookups:
+
+    - prefix(): symbols starting with a prefix (sorted array + bisect)
+    - search(): symbol prefix matches followed by company name word matches
+    - similar() / closest(): symbols within a small edit distance, found through
+      a symmetric delete index so only a handful of candidates are compared
+    """
+
+    def __init__(self, symbols: Optional[Dict[str, str]] = None, max_distance: int = MAX_EDIT_DISTANCE):
+        """
+        Args:
+            symbols: symbol -> company name
+            max_distance: Largest edit distance similar() can be asked for
+        """
+        self.max_distance = max_distance
+        self.names: Dict[str, str] = {}
+        self._symbols: List[str] = []
+        self._name_words: List[Tuple[str, str]] = []
+        self._deletes: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        if symbols:
+            self.add_many(symbols)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.names
+
+    def add(self, symbol: str, name: str = ""):
+        self.add_many({symbol: name})
+
+    def add_many(self, symbols: Dict[str, str]):
+        """Add symbols (and names); symbols already indexed only gain a missing name"""
+        with self._lock:
+            added = []
+            named = []
+            for symbol, name in symbols.items():
+                symbol = symbol.strip().upper()
+                if not symbol:
+                    continue
+                if symbol in self.names:
+                    if name and not self.names[symbol]:
+                        self.names[symbol] = name
+                        named.append(symbol)
+                    continue
+                self.names[symbol] = name or ""
+                added.append(symbol)
+                if name:
+                    named.append(symbol)
+
+            # One sort for bulk loads, insort for the odd newly validated ticker
+            if len(added) > 64:
+                self._symbols = sorted(self._symbols + added)
+            else:
+                for symbol in added:
+                    bisect.insort(self._symbols, symbol)
+
+            words = [(word, symbol) for symbol in named for word in self.names[symbol].lower().split()]
+            if len(words) > 64:
+                self._name_words = sorted(self._name_words + words)
+            else:
+                for entry in words:
+                    bisect.insort(self._name_words, entry)
+
+            for symbol in added:
+                for variant in _deletes(symbol, self.max_distance):
+                    self._deletes.setdefault(variant, set()).add(symbol)
+
+    def rename_many(self, symbols: Dict[str, str]):
+        """Replace the company names of indexed symbols (e.g. after a rename); others are ignored"""
+        with self._lock:
+            renamed = {}
+            for symbol, name in symbols.items():
+                symbol = symbol.strip().upper()
+                if symbol in self.names and self.names[symbol] != (name or ""):
+                    self.names[symbol] = name or ""
+                    renamed[symbol] = self.names[symbol]
+            if not renamed:
+                return
+            words = [(word, symbol) for symbol, name in renamed.items() for word in name.lower().split()]
+            self._name_words = sorted([entry for entry in self._name_words if entry[1] not in renamed] + words)
+
+    def remove_many(self, symbols: List[str]):
+        """Drop symbols (e.g. delisted ones) from every lookup"""
+        with self._lock:
+            removed = set()
+            for symbol in symbols:
+                symbol = symbol.strip().upper()
+                if self.names.pop(symbol, None) is None:
+                    continue
+                removed.add(symbol)
+                i = bisect.bisect_left(self._symbols, symbol)
+                if i < len(self._symbols) and self._symbols[i] == symbol:
+                    del self._symbols[i]
+                for variant in _deletes(symbol, self.max_distance):
+                    entries = self._deletes.get(variant)
+                    if entries is not None:
+                        entries.discard(symbol)
+                        if not entries:
+                            del self._deletes[variant]
+            if removed:
+                self._name_words = [entry for entry in self._name_words if entry[1] not in removed]
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """Symbols starting with prefix, in alphabetical order"""
+        prefix = prefix.upper()
+        with self._lock:
+            start = bisect.bisect_left(self._symbols, prefix)
+            results = []
+            for symbol in self._symbols[start:start + limit]:
+                if not symbol.startswith(prefix):
+                    break
+                results.append(symbol)
+            return results
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Autocomplete lookup
+
+        Returns:
+            List[Tuple[str, str]]: (symbol, company name) for symbol prefix matches,
+            then symbols whose company name has a word starting with the query
+        """
+        query = query.strip()
+        if not query:
+            return []
+        results = self.prefix(query, limit)
+        seen = set(results)
+
+        word = query.lower()
+        with self._lock:
+            start = bisect.bisect_left(self._name_words, (word, ""))
+            for name_word, symbol in self._name_words[start:]:
+                if len(results) >= limit or not name_word.startswith(word):
+                    break
+                if symbol not in seen:
+                    seen.add(symbol)
+                    results.append(symbol)
+            return [(symbol, self.names.get(symbol, "")) for symbol in results]
+
+    def similar(self, query: str, max_distance: int = MAX_EDIT_DISTANCE, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Symbols within max_distance edits of query
+
+        Returns:
+            List[Tuple[str, int]]: (symbol, distance), closest first
+        """
+        query = query.upper()
+        max_distance = min(max_distance, self.max_distance)
+        with self._lock:
+            candidates = set()
+            for variant in _deletes(query, max_distance):
+                candidates |= self._deletes.get(variant, set())
+
+        matches = []
+        for symbol in candidates:
+            distance = bounded_levenshtein(query, symbol, max_distance)
+            if distance <= max_distance:
+                matches.append((symbol, distance))
+        # Closest first; prefer the same length, then alphabetical for stable results
+        matches.sort(key=lambda m: (m[1], abs(len(m[0]) - len(query)), m[0]))
+        return matches[:limit]
+
+    def closest(self, query: str, max_distance: int = MAX_EDIT_DISTANCE) -> Optional[str]:
+        """The most similar other symbol, or None if nothing is within max_distance"""
+        for symbol, distance in self.similar(query, max_distance):
+            if distance > 0:
+                return symbol
+        return None
@@ -4,8 +4,11 @@ System check module to verify proper setup before application starts
 
 import os
 import sys
+import json
+import hashlib
 import logging
-import importlib
+import importlib.util
+import importlib.metadata
 import platform
 import traceback
 
@@ -31,42 +34,93 @@ def check_python_version():
     
     return True
 
+# Import name -> distribution name for each required package
+REQUIRED_PACKAGES = {
+    "PySide6": "PySide6",
+    "numpy": "numpy",
+    "pandas": "pandas",
+    "pyqtgraph": "pyqtgraph",
+    "requests": "requests",
+    "ollama": "ollama",
+    "tradingview_ta": "tradingview-ta"
+}
+
+# A passed dependency check is reused for launches with the same environment
+# fingerprint, and redone at least this often (seconds)
+DEPENDENCY_CHECK_TTL = 7 * 86400
+
+def environment_fingerprint():
+    """
+    Hash of what decides which packages are importable: the interpreter and
+    the modification times of the directories on sys.path. Installing,
+    upgrading or removing a package changes its site-packages directory.
+    """
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    parts = [sys.executable, sys.version, json.dumps(REQUIRED_PACKAGES, sort_keys=True)]
+    for path in sys.path:
+        # The app directory changes whenever the app writes a file; it holds no packages
+        if not path or os.path.abspath(path) == app_dir:
+            continue
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:-")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+def find_package_versions():
+    """
+    Locate the required packages without importing them
+
+    Returns:
+        dict: import name -> installed version, "unknown" if it has no
+        package metadata, or None if it can't be found
+    """
+    versions = {}
+    for package, distribution in REQUIRED_PACKAGES.items():
+        if importlib.util.find_spec(package) is None:
+            versions[package] = None
+            continue
+        try:
+            versions[package] = importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = "unknown"
+    return versions
+
 def check_dependencies():
     """Check if all required Python packages are installed"""
-    required_packages = [
-        "PySide6",
-        "numpy",
-        "pandas",
-        "pyqtgraph",
-        "requests",
-        "ollama",
-        "tradingview_ta"
-    ]
-    
+    from cache import PersistentCache
+
+    cache = PersistentCache("system_check", ttl=DEPENDENCY_CHECK_TTL)
+    fingerprint = environment_fingerprint()
+    cached = cache.get("dependencies")
+    if cached and cached.get("fingerprint") == fingerprint:
+        logging.info("Dependencies unchanged since the last check, skipping")
+        return True
+
+    versions = find_package_versions()
     missing = []
     version_issues = []
-    
-    for package in required_packages:
-        try:
-            module = importlib.import_module(package)
-            version = getattr(module, "__version__", "unknown")
-            logging.info(f"Found {package} (version: {version})")
-            
-            # Check specific version requirements
-            if package == "numpy" and version.startswith("1.24"):
-                version_issues.append(f"numpy {version} may have compatibility issues with pyqtgraph")
-                
-        except ImportError:
+
+    for package, version in versions.items():
+        if version is None:
             missing.append(package)
             logging.error(f"Missing required package: {package}")
-    
+            continue
+        logging.info(f"Found {package} (version: {version})")
+
+        # Check specific version requirements
+        if package == "numpy" and version.startswith("1.24"):
+            version_issues.append(f"numpy {version} may have compatibility issues with pyqtgraph")
+
     if missing:
         logging.error(f"Missing required packages: {', '.join(missing)}")
         return False
-        
+
     for issue in version_issues:
         logging.warning(issue)
-        
+
+    # Only a passing result is cached, so a fixed environment is rechecked next launch
+    cache.set("dependencies", {"fingerprint": fingerprint, "versions": versions})
     return True
 
 def check_api_keys():
@@ -7,9 +7,12 @@ import os
 import json
 import time
 import logging
+import threading
 import requests
-from typing import Tuple, Dict, Optional, List, Set
+from typing import Tuple, Dict, Optional, List
 from config import FINNHUB_KEY, FINNHUB_API_URL
+from symbol_index import SymbolIndex, load_symbols_file
+from kv_store import AppendOnlyKVStore
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -38,18 +41,30 @@ COMMON_MISSPELLINGS = {
 }
 
 # Local cache files
+TICKER_STORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ticker_store.jsonl")
+# Files written by earlier versions, imported into the store once
 VALID_TICKERS_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "valid_tickers.json")
 INVALID_TICKERS_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "invalid_tickers.json")
+API_CHECKS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "api_checks.json")
 
-# In-memory caches
-_valid_tickers_cache: Set[str] = set()
-_invalid_tickers_cache: Set[str] = set()
-_last_cache_load_time = 0
-_cache_ttl = 86400  # 24 hours in seconds
+# How long a validation result is trusted (seconds). Invalid results expire
+# sooner so newly listed symbols are picked up.
+VALID_TICKER_TTL = 30 * 86400
+INVALID_TICKER_TTL = 86400
+API_CHECK_COUNT_TTL = 2 * 86400
+
+# Persistent ticker validity store: "ticker:<SYMBOL>" -> True/False and
+# "checks:<YYYYMMDD>" -> Finnhub lookups made that day. Opened on first use.
+_ticker_store: Optional[AppendOnlyKVStore] = None
+_ticker_store_lock = threading.Lock()
+
+# Fuzzy/prefix index over every known symbol, built on first use
+_symbol_index: Optional[SymbolIndex] = None
+_symbol_index_lock = threading.Lock()
 
 def _ensure_cache_dir():
     """Ensure the data directory exists for cache files"""
-    cache_dir = os.path.dirname(VALID_TICKERS_CACHE_FILE)
+    cache_dir = os.path.dirname(TICKER_STORE_FILE)
     if not os.path.exists(cache_dir):
         try:
             os.makedirs(cache_dir)
@@ -59,81 +74,115 @@ def _ensure_cache_dir():
             return False
     return True
 
-def _load_ticker_caches():
-    """Load ticker caches from disk if they exist and aren't expired"""
-    global _valid_tickers_cache, _invalid_tickers_cache, _last_cache_load_time
-    
-    current_time = time.time()
-    
-    # If cache is still fresh, don't reload
-    if current_time - _last_cache_load_time < _cache_ttl and _valid_tickers_cache:
-        return
-        
-    _ensure_cache_dir()
-    
-    # Load valid tickers
+def _read_legacy_tickers(path: str) -> List[str]:
     try:
-        if os.path.exists(VALID_TICKERS_CACHE_FILE):
-            with open(VALID_TICKERS_CACHE_FILE, 'r') as f:
-                cache_data = json.load(f)
-                # Convert to set for O(1) lookups
-                _valid_tickers_cache = set(cache_data.get('tickers', []))
-                cache_time = cache_data.get('timestamp', 0)
-                
-                # Only use cache if it's not expired
-                if current_time - cache_time > _cache_ttl:
-                    logging.info("Valid tickers cache expired, will be refreshed on next API check")
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f).get('tickers', [])
     except Exception as e:
-        logging.error(f"Error loading valid tickers cache: {e}")
-        _valid_tickers_cache = set()
-    
-    # Load invalid tickers
+        logging.error(f"Error reading {os.path.basename(path)}: {e}")
+    return []
+
+def _migrate_legacy_caches(store: AppendOnlyKVStore):
+    """Import the old whole-file JSON caches into a new store"""
+    valid = _read_legacy_tickers(VALID_TICKERS_CACHE_FILE)
+    invalid = _read_legacy_tickers(INVALID_TICKERS_CACHE_FILE)
+    for ticker in invalid:
+        store.set(f"ticker:{ticker}", False, ttl=INVALID_TICKER_TTL)
+    for ticker in valid:
+        store.set(f"ticker:{ticker}", True, ttl=VALID_TICKER_TTL)
+
     try:
-        if os.path.exists(INVALID_TICKERS_CACHE_FILE):
-            with open(INVALID_TICKERS_CACHE_FILE, 'r') as f:
-                cache_data = json.load(f)
-                # Convert to set for O(1) lookups
-                _invalid_tickers_cache = set(cache_data.get('tickers', []))
-                # Expiration handled same as valid tickers
+        if os.path.exists(API_CHECKS_FILE):
+            with open(API_CHECKS_FILE, 'r') as f:
+                counts = json.load(f)
+            today = f"ticker_checks_{time.strftime('%Y%m%d')}"
+            if today in counts:
+                store.set(f"checks:{time.strftime('%Y%m%d')}", counts[today], ttl=API_CHECK_COUNT_TTL)
     except Exception as e:
-        logging.error(f"Error loading invalid tickers cache: {e}")
-        _invalid_tickers_cache = set()
-    
-    _last_cache_load_time = current_time
-    logging.info(f"Loaded {len(_valid_tickers_cache)} valid and {len(_invalid_tickers_cache)} invalid tickers from cache")
+        logging.error(f"Error reading API check counts: {e}")
+
+    store.set("migrated", True)
+    store.flush()
+    logging.info(f"Imported {len(valid)} valid and {len(invalid)} invalid tickers into the ticker store")
+
+def _get_ticker_store() -> AppendOnlyKVStore:
+    """Open the ticker validity store, importing the legacy caches the first time"""
+    global _ticker_store
+    if _ticker_store is not None:
+        return _ticker_store
+    with _ticker_store_lock:
+        if _ticker_store is None:
+            _ensure_cache_dir()
+            store = AppendOnlyKVStore(TICKER_STORE_FILE)
+            if not store.get("migrated"):
+                _migrate_legacy_caches(store)
+            _ticker_store = store
+        return _ticker_store
+
+def _known_valid_tickers() -> List[str]:
+    return [key[7:] for key, valid in _get_ticker_store().items("ticker:") if valid]
+
+def get_symbol_index(build: bool = True) -> Optional[SymbolIndex]:
+    """
+    Get the shared symbol index: the symbol list saved by update_tickers.py,
+    tickers validated on this machine and the targets of COMMON_MISSPELLINGS.
+    Built on first use, which takes about a second for the full US universe.
+
+    Args:
+        build: If False, return None instead of building an index that isn't ready
+    """
+    global _symbol_index
+    if not build:
+        return _symbol_index
+    with _symbol_index_lock:
+        if _symbol_index is None:
+            start = time.time()
+            index = SymbolIndex(load_symbols_file())
+            index.add_many({t: "" for t in _known_valid_tickers()})
+            index.add_many({t: "" for t in COMMON_MISSPELLINGS.values()})
+            logging.info(f"Built symbol index with {len(index)} symbols in {time.time() - start:.2f}s")
+            _symbol_index = index
+        return _symbol_index
+
+def apply_symbol_changes(added: Dict[str, str], removed: List[str], changed: Optional[Dict[str, str]] = None):
+    """
+    Apply a symbol list diff from update_tickers.sync_symbols to the running app
+
+    Args:
+        added: New symbol -> company name
+        removed: Delisted symbols
+        changed: Symbol whose listing changed -> its current company name
+    """
+    changed = changed or {}
+    with _symbol_index_lock:
+        if _symbol_index is not None:
+            _symbol_index.add_many(added)
+            _symbol_index.rename_many(changed)
+            _symbol_index.remove_many(removed)
+    store = _get_ticker_store()
+    for ticker in removed:
+        store.delete(f"ticker:{ticker}")
+    # Listed symbols cached as invalid (e.g. checked before they listed) are valid now
+    for ticker in list(added) + list(changed):
+        if store.get(f"ticker:{ticker}") is False:
+            store.set(f"ticker:{ticker}", True, ttl=VALID_TICKER_TTL)
+
+def _get_cached_validity(ticker: str) -> Optional[bool]:
+    """True/False if the ticker was validated recently, None if unknown"""
+    return _get_ticker_store().get(f"ticker:{ticker}")
 
 def _save_ticker_cache(valid_ticker=None, invalid_ticker=None):
-    """Save a ticker to the appropriate cache file"""
-    global _valid_tickers_cache, _invalid_tickers_cache
-    
-    if not _ensure_cache_dir():
-        return
-        
-    # Add to valid tickers cache
+    """Record a validation result; written to disk in the store's next batch"""
+    store = _get_ticker_store()
+
     if valid_ticker:
-        _valid_tickers_cache.add(valid_ticker)
-        try:
-            valid_cache_data = {
-                'tickers': list(_valid_tickers_cache),
-                'timestamp': time.time()
-            }
-            with open(VALID_TICKERS_CACHE_FILE, 'w') as f:
-                json.dump(valid_cache_data, f)
-        except Exception as e:
-            logging.error(f"Error saving valid ticker cache: {e}")
-    
-    # Add to invalid tickers cache
+        store.set(f"ticker:{valid_ticker}", True, ttl=VALID_TICKER_TTL)
+        if _symbol_index is not None:
+            _symbol_index.add(valid_ticker)
+
     if invalid_ticker:
-        _invalid_tickers_cache.add(invalid_ticker)
-        try:
-            invalid_cache_data = {
-                'tickers': list(_invalid_tickers_cache),
-                'timestamp': time.time()
-            }
-            with open(INVALID_TICKERS_CACHE_FILE, 'w') as f:
-                json.dump(invalid_cache_data, f)
-        except Exception as e:
-            logging.error(f"Error saving invalid ticker cache: {e}")
+        store.set(f"ticker:{invalid_ticker}", False, ttl=INVALID_TICKER_TTL)
 
 def _check_ticker_pattern(ticker: str) -> bool:
     """
@@ -171,7 +220,6 @@ def _verify_ticker_with_finnhub(ticker: str) -> bool:
     """
     try:
         # First check rate limiting: Query up to 10 tickers per day from Finnhub
-        daily_check_key = f"ticker_checks_{time.strftime('%Y%m%d')}"
         checks_today = _get_api_check_count()
         
         if checks_today >= 10:
@@ -209,43 +257,11 @@ def _verify_ticker_with_finnhub(ticker: str) -> bool:
 
 def _get_api_check_count() -> int:
     """Get the number of Finnhub API ticker checks today"""
-    daily_check_key = f"ticker_checks_{time.strftime('%Y%m%d')}"
-    
-    try:
-        check_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "api_checks.json")
-        
-        if not os.path.exists(check_file):
-            return 0
-            
-        with open(check_file, 'r') as f:
-            data = json.load(f)
-            return data.get(daily_check_key, 0)
-    except Exception:
-        return 0
+    return _get_ticker_store().get(f"checks:{time.strftime('%Y%m%d')}", 0)
 
 def _increment_api_check_count():
     """Increment the Finnhub API ticker check counter"""
-    daily_check_key = f"ticker_checks_{time.strftime('%Y%m%d')}"
-    
-    try:
-        check_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "api_checks.json")
-        check_dir = os.path.dirname(check_file)
-        
-        if not os.path.exists(check_dir):
-            os.makedirs(check_dir)
-        
-        data = {}
-        if os.path.exists(check_file):
-            with open(check_file, 'r') as f:
-                data = json.load(f)
-        
-        count = data.get(daily_check_key, 0) + 1
-        data[daily_check_key] = count
-        
-        with open(check_file, 'w') as f:
-            json.dump(data, f)
-    except Exception as e:
-        logging.error(f"Error updating API check count: {e}")
+    _get_ticker_store().increment(f"checks:{time.strftime('%Y%m%d')}", ttl=API_CHECK_COUNT_TTL)
 
 def get_levenshtein_distance(s1: str, s2: str) -> int:
     """
@@ -290,24 +306,8 @@ def find_similar_ticker(ticker: str) -> Optional[str]:
     if ticker in COMMON_MISSPELLINGS:
         return COMMON_MISSPELLINGS[ticker]
     
-    # Load cache to check against known valid tickers
-    _load_ticker_caches()
-    
-    # Check edit distance against known valid tickers
-    closest = None
-    min_distance = float('inf')
-    
-    # Get all valid tickers we know about
-    known_valid = list(_valid_tickers_cache) + list(COMMON_MISSPELLINGS.values())
-    
-    for valid in known_valid:
-        distance = get_levenshtein_distance(ticker, valid)
-        # Only consider close matches (edit distance <= 2)
-        if distance <= 2 and distance < min_distance:
-            min_distance = distance
-            closest = valid
-    
-    return closest
+    # Ask the index for the closest known symbol within edit distance 2
+    return get_symbol_index().closest(ticker, max_distance=2)
 
 def normalize_ticker(ticker: str) -> str:
     """
@@ -350,11 +350,11 @@ def validate_ticker(ticker: str) -> Tuple[str, bool, Optional[str]]:
     # Normalize the ticker
     normalized = normalize_ticker(ticker)
     
-    # Load caches for faster validation
-    _load_ticker_caches()
+    # Recent validation result, if any (O(1) in-memory lookup)
+    cached = _get_cached_validity(normalized)
     
     # Check against known valid tickers first (fastest)
-    if normalized in _valid_tickers_cache or normalized in COMMON_MISSPELLINGS.values():
+    if cached is True or normalized in COMMON_MISSPELLINGS.values():
         # If the ticker is already known to be valid or is a valid correction, 
         # consider it valid immediately
         return normalized, True, None
@@ -365,7 +365,7 @@ def validate_ticker(ticker: str) -> Tuple[str, bool, Optional[str]]:
         return correction, False, correction
     
     # Check if we already know this ticker is invalid
-    if normalized in _invalid_tickers_cache:
+    if cached is False:
         # Try to find a similar ticker
         suggestion = find_similar_ticker(normalized)
         # Don't suggest the original ticker as a correction
@@ -1,6 +1,7 @@
 """
 Utility script to update the ticker database by fetching the latest symbols
-from major exchanges. Run this periodically to keep ticker validation current.
+from major exchanges. The app runs sync_symbols() in the background on a
+schedule; it can also be run by hand.
 """
 
 import os
@@ -8,7 +9,12 @@ import json
 import time
 import logging
 import requests
-from config import FINNHUB_API_KEY, FINNHUB_API_URL
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from config import FINNHUB_API_KEY, FINNHUB_API_URL, SYMBOL_SYNC_CONFIG
+from rate_limiter import finnhub_limiter
+# Symbols with their Finnhub metadata, read back by symbol_index
+from symbol_index import DATA_DIR, SYMBOLS_FILE
 
 # Configure logging
 logging.basicConfig(
@@ -16,10 +22,6 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# File paths
-DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
-VALID_TICKERS_FILE = os.path.join(DATA_DIR, "valid_tickers.json")
-
 def ensure_data_dir():
     """Ensure the data directory exists"""
     if not os.path.exists(DATA_DIR):
@@ -29,71 +31,187 @@ def ensure_data_dir():
 def fetch_exchange_symbols(exchange):
     """
     Fetch all stock symbols for a specific exchange from Finnhub
-    
+
     Args:
         exchange (str): Exchange code (e.g., 'US')
-        
+
     Returns:
-        list: List of valid tickers from the exchange
+        list: Symbol entries from the exchange (dicts with 'symbol', 'description', ...)
+
+    Raises:
+        Exception: If the request fails or the response is not a symbol list
     """
+    # Take a token from the shared Finnhub limiter, then download outside the
+    # request queue so several exchanges can transfer at once
+    finnhub_limiter.acquire()
+
+    url = f"{FINNHUB_API_URL}/stock/symbol"
+    params = {
+        'exchange': exchange,
+        'token': FINNHUB_API_KEY
+    }
+
+    logging.info(f"Fetching symbols for exchange: {exchange}")
+    response = requests.get(url, params=params, timeout=60)
+    response.raise_for_status()
+
+    data = response.json()
+
+    if not isinstance(data, list):
+        raise ValueError(f"Unexpected response format for {exchange}: {str(data)[:200]}")
+
+    symbols = [item for item in data if item.get('symbol')]
+    logging.info(f"Retrieved {len(symbols)} symbols from {exchange}")
+    return symbols
+
+def fetch_all_symbols(exchanges: List[str] = None, max_workers: int = None) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Fetch several exchanges concurrently and merge them
+
+    Args:
+        exchanges: Finnhub exchange codes (default: SYMBOL_SYNC_CONFIG)
+        max_workers: Downloads in flight at once (default: SYMBOL_SYNC_CONFIG)
+
+    Returns:
+        Tuple[Dict[str, Dict], List[str]]: symbol -> metadata record, and the
+        exchanges that could not be fetched
+    """
+    exchanges = exchanges or SYMBOL_SYNC_CONFIG["exchanges"]
+    max_workers = max_workers or SYMBOL_SYNC_CONFIG["max_workers"]
+
+    records = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SymbolSync") as executor:
+        futures = [(exchange, executor.submit(fetch_exchange_symbols, exchange)) for exchange in exchanges]
+        # Merge in exchange order so the result doesn't depend on download timing
+        for exchange, future in futures:
+            try:
+                symbols = future.result()
+            except Exception as e:
+                logging.error(f"Error fetching symbols for {exchange}: {e}")
+                failed.append(exchange)
+                continue
+            for item in symbols:
+                record = records.setdefault(item['symbol'], {'symbol': item['symbol'], 'exchanges': []})
+                # First non-empty value wins for each metadata field
+                for field, value in item.items():
+                    if value and not record.get(field):
+                        record[field] = value
+                record['exchanges'].append(exchange)
+    return records, failed
+
+def load_symbol_records(path: str = SYMBOLS_FILE) -> Dict[str, Dict]:
+    """
+    Read the symbol list written by the last sync
+
+    Returns:
+        Dict[str, Dict]: symbol -> metadata record (empty if there is no list yet)
+    """
+    if not os.path.exists(path):
+        return {}
     try:
-        url = f"{FINNHUB_API_URL}/stock/symbol"
-        params = {
-            'exchange': exchange,
-            'token': FINNHUB_API_KEY
-        }
-        
-        logging.info(f"Fetching symbols for exchange: {exchange}")
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if not isinstance(data, list):
-            logging.error(f"Unexpected response format for {exchange}: {data}")
-            return []
-            
-        # Extract just the ticker symbols
-        tickers = [item['symbol'] for item in data if 'symbol' in item]
-        logging.info(f"Retrieved {len(tickers)} symbols from {exchange}")
-        return tickers
-        
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {item['symbol']: item for item in data.get('symbols', []) if item.get('symbol')}
     except Exception as e:
-        logging.error(f"Error fetching symbols for {exchange}: {e}")
-        return []
+        logging.error(f"Error reading symbol list: {e}")
+        return {}
 
-def update_ticker_database():
-    """Update the ticker database with symbols from major exchanges"""
+def symbols_age(path: str = SYMBOLS_FILE) -> Optional[float]:
+    """Seconds since the symbol list was last synced, or None if it never was"""
+    if not os.path.exists(path):
+        return None
+    # The file's mtime is the sync time; unchanged syncs only touch it
+    return time.time() - os.path.getmtime(path)
+
+def diff_symbols(old: Dict[str, Dict], new: Dict[str, Dict]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Compare two symbol lists
+
+    Returns:
+        Tuple[List[str], List[str], List[str]]: added, removed and changed symbols
+    """
+    added = sorted(new.keys() - old.keys())
+    removed = sorted(old.keys() - new.keys())
+    changed = sorted(s for s in new.keys() & old.keys() if new[s] != old[s])
+    return added, removed, changed
+
+def _write_symbols(records: Dict[str, Dict], path: str = SYMBOLS_FILE):
+    """Write the symbol list to a temporary file and move it into place"""
     ensure_data_dir()
-    
-    exchanges = ['US', 'NYSE', 'NASDAQ', 'AMEX']
-    all_tickers = set()
-    
-    for exchange in exchanges:
-        tickers = fetch_exchange_symbols(exchange)
-        # Add to master list
-        all_tickers.update(tickers)
-        # Respect API rate limits
-        time.sleep(1)
-    
-    # Save to file
-    if all_tickers:
-        try:
-            data = {
-                'tickers': list(all_tickers),
-                'timestamp': time.time(),
-                'count': len(all_tickers),
-                'update_date': time.strftime('%Y-%m-%d')
-            }
-            
-            with open(VALID_TICKERS_FILE, 'w') as f:
-                json.dump(data, f)
-                
-            logging.info(f"Successfully updated ticker database with {len(all_tickers)} symbols")
-        except Exception as e:
-            logging.error(f"Error saving ticker database: {e}")
-    else:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'symbols': [records[s] for s in sorted(records)],
+            'timestamp': time.time(),
+            'count': len(records),
+            'update_date': time.strftime('%Y-%m-%d')
+        }, f)
+    os.replace(tmp_path, path)
+
+def sync_symbols(exchanges: List[str] = None) -> Dict:
+    """
+    Bring the local symbol list up to date with the exchanges
+
+    Only the diff against the current list is applied, and the file is only
+    rewritten when something changed. Delistings and metadata changes are
+    applied only when every exchange was fetched, so one failed download
+    doesn't look like thousands of symbols disappearing. The running symbol index and ticker
+    validity store are updated with the same diff.
+
+    Args:
+        exchanges: Finnhub exchange codes (default: SYMBOL_SYNC_CONFIG)
+
+    Returns:
+        Dict: Sync summary with added/removed/changed symbols and failed exchanges
+    """
+    start = time.time()
+    fetched, failed = fetch_all_symbols(exchanges)
+    summary = {'added': [], 'removed': [], 'changed': [], 'failed': failed, 'total': 0}
+
+    if not fetched:
         logging.warning("No tickers retrieved, database not updated")
+        return summary
+
+    current = load_symbol_records()
+    added, removed, changed = diff_symbols(current, fetched)
+    if failed:
+        # A partial fetch can't tell delistings (or which exchanges list a
+        # symbol) apart from the missing download, so only take additions
+        removed, changed = [], []
+
+    records = dict(current)
+    for symbol in added + changed:
+        records[symbol] = fetched[symbol]
+    for symbol in removed:
+        del records[symbol]
+
+    summary.update(added=added, removed=removed, changed=changed, total=len(records))
+
+    try:
+        if added or removed or changed:
+            _write_symbols(records)
+        elif not failed:
+            # Nothing changed: just record the sync time
+            os.utime(SYMBOLS_FILE)
+    except Exception as e:
+        logging.error(f"Error saving ticker database: {e}")
+        return summary
+
+    if added or removed or changed:
+        # Imported here so the script doesn't pull in ticker validation just to run
+        from ticker_utils import apply_symbol_changes
+        apply_symbol_changes({s: records[s].get('description', '') for s in added}, removed,
+                             {s: records[s].get('description', '') for s in changed})
+
+    logging.info(f"Symbol sync finished in {time.time() - start:.1f}s: {len(records)} symbols, "
+                 f"{len(added)} added, {len(removed)} removed, {len(changed)} changed"
+                 + (f", failed exchanges: {', '.join(failed)}" if failed else ""))
+    return summary
+
+def update_ticker_database():
+    """Update the ticker database with symbols from major exchanges"""
+    return sync_symbols()
 
 if __name__ == "__main__":
     logging.info("Starting ticker database update")
@@ -0,0 +1,180 @@
+"""
+Watchlist Module
+Table model and view for the watchlist. Quotes arrive in batches from the
+market data poller (and from the trade stream for the open ticker); each
+update is compared with the row's current values and only the cells that
+changed are signalled, so the view repaints those cells rather than the
+whole table. The view only paints visible rows, however long the list is.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from config import COLOR_PALETTES, WATCHLIST_CONFIG
+from helpers import format_currency
+
+# Column header -> quote field (Finnhub quote names, as get_stock and the poller return)
+COLUMNS = [
+    ("Symbol", None),
+    ("Price", 'c'),
+    ("Change", 'd'),
+    ("Change %", 'dp'),
+    ("High", 'h'),
+    ("Low", 'l')
+]
+# Columns coloured by the sign of the day's change
+_SIGNED = {2, 3}
+
+
+def _format(column: int, value) -> str:
+    if value is None:
+        return "--"
+    if column == 0:
+        return value
+    if column == 2:
+        return f"{value:+.2f}"
+    if column == 3:
+        return f"{value:+.2f}%"
+    return format_currency(value)
+
+
+class WatchlistModel(QAbstractTableModel):
+    """
+    Watched tickers with their latest quote fields.
+
+    Rows keep a raw value per column; update_quotes() writes only the values
+    that differ and emits one dataChanged per row covering just the changed
+    columns. Qt.UserRole returns the raw value, for sorting.
+    """
+
+    def __init__(self, tickers: Iterable[str] = (), parent=None):
+        super().__init__(parent)
+        self._tickers: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._values: List[List] = []
+        theme = COLOR_PALETTES["Dark"]
+        self._positive = QColor(theme['positive'])
+        self._negative = QColor(theme['negative'])
+        for ticker in tickers:
+            self._append(ticker.upper())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tickers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._values[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return _format(index.column(), value)
+        if role == Qt.UserRole:
+            return value
+        if role == Qt.ForegroundRole and index.column() in _SIGNED and value:
+            return self._positive if value > 0 else self._negative
+        if role == Qt.TextAlignmentRole and index.column() > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def tickers(self) -> List[str]:
+        return list(self._tickers)
+
+    def ticker_at(self, row: int) -> Optional[str]:
+        return self._tickers[row] if 0 <= row < len(self._tickers) else None
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._rows
+
+    def _append(self, ticker: str):
+        self._rows[ticker] = len(self._tickers)
+        self._tickers.append(ticker)
+        self._values.append([ticker] + [None] * (len(COLUMNS) - 1))
+
+    def add(self, ticker: str) -> bool:
+        """Append a ticker; False if it is already watched or the list is full"""
+        ticker = ticker.upper()
+        if ticker in self._rows or len(self._tickers) >= WATCHLIST_CONFIG["max_symbols"]:
+            return False
+        row = len(self._tickers)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._append(ticker)
+        self.endInsertRows()
+        return True
+
+    def remove(self, ticker: str) -> bool:
+        ticker = ticker.upper()
+        row = self._rows.get(ticker)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tickers[row]
+        del self._values[row]
+        self._rows = {t: i for i, t in enumerate(self._tickers)}
+        self.endRemoveRows()
+        return True
+
+    def update_quote(self, ticker: str, quote: Dict):
+        """Apply one quote; signals only the changed cells of the ticker's row"""
+        row = self._rows.get(ticker.upper())
+        if row is None:
+            return
+        values = self._values[row]
+        first = last = None
+        for column, (_, field) in enumerate(COLUMNS):
+            if field is None or field not in quote:
+                continue
+            value = quote[field]
+            if value != values[column]:
+                values[column] = value
+                first = column if first is None else first
+                last = column
+        if first is not None:
+            self.dataChanged.emit(self.index(row, first), self.index(row, last),
+                                  [Qt.DisplayRole, Qt.UserRole, Qt.ForegroundRole])
+
+    def update_quotes(self, quotes: Dict[str, Dict]):
+        """Apply a batch of quotes, e.g. one MarketDataPoller round"""
+        for ticker, quote in quotes.items():
+            self.update_quote(ticker, quote)
+
+
+class WatchlistView(QTableView):
+    """Sortable table for a WatchlistModel; sorting never reorders rows on quote updates"""
+
+    def __init__(self, model: WatchlistModel, parent=None):
+        super().__init__(parent)
+        self.watchlist = model
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(model)
+        self.proxy.setSortRole(Qt.UserRole)
+        # Re-sorting on every quote would move rows under the cursor and repaint the table
+        self.proxy.setDynamicSortFilter(False)
+        self.setModel(self.proxy)
+
+        self.setSortingEnabled(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setShowGrid(False)
+        self.setAlternatingRowColors(True)
+        self.verticalHeader().setVisible(False)
+        # Fixed row heights, so Qt never measures rows that aren't shown
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(26)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+    def selected_tickers(self) -> List[str]:
+        rows = {self.proxy.mapToSource(index).row() for index in self.selectionModel().selectedRows()}
+        return [self.watchlist.ticker_at(row) for row in sorted(rows)]
+
+    def ticker_at(self, index) -> Optional[str]:
+        return self.watchlist.ticker_at(self.proxy.mapToSource(index).row())
@@ -1,18 +1,22 @@
 import sys
 import re
+import json
+import math
+import time
 import requests
 import numpy as np
 import logging
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QMessageBox,
     QGridLayout, QStyle, QTabWidget, QFrame, QScrollArea,
     QDialog, QDialogButtonBox, QStackedWidget, QSizePolicy,
     QComboBox, QToolBar, QMenuBar, QMenu, QFormLayout, QSlider,
-    QGraphicsProxyWidget, QProgressBar
+    QGraphicsProxyWidget, QProgressBar, QCompleter
 )
-from PySide6.QtCore import Qt, QTimer, Signal, QSettings, QUrl  # Remove QPropertyAnimation here
+from PySide6.QtCore import Qt, QTimer, Signal, QSettings, QUrl, QAbstractListModel, QModelIndex  # Remove QPropertyAnimation here
 
 try:
     from PySide6.QtCore import QPropertyAnimation
@@ -22,8 +26,16 @@ from PySide6.QtGui import QFont, QColor, QActionGroup, QAction  # Remove QProper
 import pyqtgraph as pg
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from pyqtgraph import PlotWidget, AxisItem
-from api_client import StockAPI
+from api_client import CHART_TIMEFRAMES
+from bar_aggregator import bucket_start
+from chart_crosshair import BarLookup, ChartCrosshair
+from chart_panes import CandlestickSeriesItem, VolumeBarItem, relative_strength_index, RSI_LEVELS
+from chart_store import ChartSeriesStore
+from config import CHART_CONFIG
 from helpers import format_number, format_market_cap, format_percentage, format_currency
+from ticker_utils import COMMON_MISSPELLINGS, get_symbol_index
+from instrumentation import timed
+from logging_setup import SAMPLED
 
 # Replace the direct sip import with this:
 try:
@@ -206,7 +218,7 @@ class KeyMetrics(QFrame):
             metrics = metrics_data.get('metric', {})
             
             # Debug logging to see what we actually received
-            logging.info(f"Received metrics: {metrics}")
+            logging.debug("Received metrics: %s", metrics, extra=SAMPLED)
             
             # Safely extract values with defaults
             def get_safe_value(key, default="N/A"):
@@ -268,42 +280,8 @@ class KeyMetrics(QFrame):
 class DateAxis(AxisItem):
     def tickStrings(self, values, scale, spacing):
         """Convert timestamps to UK date format"""
-        return [datetime.fromtimestamp(value).strftime("%d/%m") for value in values]  # Changed to UK format
-
-class CandleStickItem(pg.GraphicsObject):
-    def __init__(self, x, open, close, high, low, brush=None, pen=None):
-        super().__init__()
-        self.x = x
-        self.open = open
-        self.close = close
-        self.high = high
-        self.low = low
-        self.brush = brush or pg.mkBrush('w')
-        self.pen = pen or pg.mkPen('w')
-        self.picture = None
-        self.generatePicture()
-
-    def generatePicture(self):
-        self.picture = pg.QtGui.QPicture()
-        p = pg.QtGui.QPainter(self.picture)
-        p.setPen(self.pen)
-        p.setBrush(self.brush)
-        
-        # Draw candlestick body
-        if self.open > self.close:
-            p.drawRect(pg.QtCore.QRectF(self.x - 0.25, self.close, 0.5, self.open - self.close))
-        else:
-            p.drawRect(pg.QtCore.QRectF(self.x - 0.25, self.open, 0.5, self.close - self.open))
-        
-        # Draw wicks
-        p.drawLine(pg.QtCore.QPointF(self.x, self.low), pg.QtCore.QPointF(self.x, self.high))
-        p.end()
-
-    def paint(self, p, *args):
-        p.drawPicture(0, 0, self.picture)
-
-    def boundingRect(self):
-        return pg.QtCore.QRectF(self.picture.boundingRect())
+        # Dates in UTC: daily candles sit at midnight UTC, which is the previous evening west of it
+        return [datetime.fromtimestamp(value, timezone.utc).strftime("%d/%m") for value in values]  # Changed to UK format
 
 class StockChart(PlotWidget):
     def __init__(self):
@@ -361,6 +339,83 @@ class StockChart(PlotWidget):
         self._is_dragging = False
         self._last_pos = None
 
+        # Crosshair with an OHLC readout for the hovered bar
+        self.crosshair = ChartCrosshair(self.getPlotItem(), THEMES["Dark"])
+
+        # Bars currently drawn, shared by the crosshair and every pane
+        self.bars = None
+        self._setup_panes()
+
+        # Loaded candles, and the graphics items built from them, per
+        # (ticker, timeframe); most recently shown last
+        self.store = ChartSeriesStore()
+        self.series = OrderedDict()
+        self.current_series = None
+        self.chart_type = "Both"
+        self.message_item = None
+
+    def _setup_panes(self):
+        """Stack volume and oscillator panes under the price plot, X axes linked"""
+        self.price_plot = self.getPlotItem()
+        self.volume_plot = pg.PlotItem(axisItems={'bottom': DateAxis(orientation='bottom')})
+        self.oscillator_plot = pg.PlotItem(axisItems={'bottom': DateAxis(orientation='bottom')})
+        self.plots = {"price": self.price_plot, "volume": self.volume_plot, "oscillator": self.oscillator_plot}
+
+        # The PlotWidget's own PlotItem stays the price pane, so plot(),
+        # addItem(), clear() etc. keep drawing prices
+        self.panes = pg.GraphicsLayout()
+        self.panes.setSpacing(0)
+        self.setCentralItem(self.panes)
+        for row, (plot, stretch) in enumerate(((self.price_plot, 5), (self.volume_plot, 1), (self.oscillator_plot, 1))):
+            self.panes.addItem(plot, row=row, col=0)
+            self.panes.layout.setRowStretchFactor(row, stretch)
+            plot.getAxis("left").setWidth(60)
+        self.price_plot.hideAxis("bottom")
+
+        for plot in (self.volume_plot, self.oscillator_plot):
+            plot.setXLink(self.price_plot)
+            plot.hideButtons()
+            plot.setMouseEnabled(x=True, y=False)
+            plot.getAxis("left").setPen(pg.mkPen(THEMES["Dark"]["text"]))
+            plot.getAxis("bottom").setPen(pg.mkPen(THEMES["Dark"]["text"]))
+
+        self.volume_item = VolumeBarItem(THEMES["Dark"]["positive"], THEMES["Dark"]["negative"])
+        self.volume_plot.addItem(self.volume_item)
+        self.volume_plot.getViewBox().setAutoVisible(y=True)
+        self.volume_plot.getAxis("left").setLabel("Vol")
+
+        self.rsi_curve = self.oscillator_plot.plot(pen=pg.mkPen(color=(255, 213, 79), width=1.2))
+        for level in RSI_LEVELS:
+            self.oscillator_plot.addItem(pg.InfiniteLine(
+                pos=level, angle=0, pen=pg.mkPen(THEMES["Dark"]["text-secondary"], width=1, style=Qt.DotLine)
+            ))
+        self.oscillator_plot.setYRange(0, 100, padding=0.05)
+        self.oscillator_plot.getAxis("left").setLabel("RSI")
+
+        self.show_oscillator = False
+        self._layout_panes()
+
+    def _layout_panes(self):
+        """Show or collapse the oscillator pane; the bottom pane carries the date axis"""
+        self.oscillator_plot.setVisible(self.show_oscillator)
+        self.oscillator_plot.setMaximumHeight(16777215 if self.show_oscillator else 0)
+        self.volume_plot.showAxis("bottom", not self.show_oscillator)
+        if self.show_oscillator:
+            self._update_oscillator()
+
+    def _set_pane_bars(self, bars):
+        """Point the crosshair and panes at a new set of bars (None clears them)"""
+        self.bars = bars
+        self.crosshair.set_bars(bars)
+        self.volume_item.set_bars(bars)
+        self._update_oscillator()
+
+    def _update_oscillator(self):
+        if self.bars is not None and len(self.bars) and self.show_oscillator:
+            self.rsi_curve.setData(self.bars.times, relative_strength_index(self.bars.closes), connect="finite")
+        else:
+            self.rsi_curve.clear()
+
     def _add_control_buttons(self):
         """Add control buttons to the chart"""
         # Create container widget for buttons
@@ -425,17 +480,18 @@ class StockChart(PlotWidget):
         """
 
         toggles = [
-            ('📊', 'Peak Markers', lambda: self._toggle_visibility('peaks')),
-            ('📈', 'Support/Resistance', lambda: self._toggle_visibility('levels')),
-            ('🏷️', 'Labels', lambda: self._toggle_visibility('markers'))
+            ('📊', 'Peak Markers', lambda: self._toggle_visibility('peaks'), True),
+            ('📈', 'Support/Resistance', lambda: self._toggle_visibility('levels'), True),
+            ('🏷️', 'Labels', lambda: self._toggle_visibility('markers'), True),
+            ('〽️', 'RSI Pane', lambda: self._toggle_visibility('oscillator'), False)
         ]
 
-        for icon, tooltip, callback in toggles:
+        for icon, tooltip, callback, checked in toggles:
             btn = QPushButton(icon)
             btn.setFixedSize(25, 25)
             btn.setToolTip(tooltip)
             btn.setCheckable(True)  # Make button toggleable
-            btn.setChecked(True)    # Start checked
+            btn.setChecked(checked)
             btn.setStyleSheet(button_style)
             btn.clicked.connect(callback)
             control_layout.addWidget(btn)
@@ -443,9 +499,14 @@ class StockChart(PlotWidget):
         # Position controls in top-right corner
         control_proxy.setWidget(control_widget)
         self.scene().addItem(control_proxy)
-        control_proxy.setPos(self.width() - 120, 20)
+        control_proxy.setPos(self.width() - 150, 20)
 
     def _toggle_visibility(self, marker_type):
+        if marker_type == 'oscillator':
+            self.show_oscillator = not self.show_oscillator
+            self._layout_panes()
+            return
+
         try:
             if any(sip.isdeleted(item) for item in self.peak_labels):
                 return
@@ -524,8 +585,13 @@ class StockChart(PlotWidget):
             
             # Apply the pan
             view_box.translateBy(x=delta.x() * x_scale, y=delta.y() * y_scale)
+        self.crosshair.mouse_moved(self.mapToScene(event.pos()))
         event.accept()
 
+    def leaveEvent(self, event):
+        self.crosshair.hide()
+        super().leaveEvent(event)
+
     def _mouseDragEvent(self, ev):
         """Custom drag event handler"""
         if ev.button() == Qt.LeftButton:
@@ -582,174 +648,240 @@ class StockChart(PlotWidget):
         
         return peaks
 
+    def _show_message(self, text, color):
+        """Replace the shown series with a status or error message"""
+        self._detach_series()
+        if self.message_item is not None:
+            self.removeItem(self.message_item)
+        self.message_item = pg.TextItem(text=text, color=color)
+        self.addItem(self.message_item)
+
+    def _clear_message(self):
+        if self.message_item is not None:
+            self.removeItem(self.message_item)
+            self.message_item = None
+
+    def _build_series(self, ticker, hist, resolution):
+        """
+        Build every price plot item for one set of candles
+
+        Args:
+            ticker: Stock symbol the candles are for
+            hist: OHLCV DataFrame from the chart store
+            resolution: Finnhub resolution of the candles, for placing live trades
+
+        Returns:
+            dict: The frame, its BarLookup, the items and the initial view range
+        """
+        # Cast through datetime64[s]: the index unit (ns or us) depends on the pandas version
+        dates = hist.index.values.astype('datetime64[s]').astype('int64')
+        closes = hist['Close'].values
+        bars = BarLookup.from_dataframe(dates, hist)
+        line_pen = pg.mkPen(THEMES["Dark"]["primary"], width=1.5)
+        entry = {
+            'ticker': ticker.upper(),
+            # Generated fallback candles are daily whatever the timeframe
+            'resolution': "D" if hist.attrs.get('dummy') else resolution,
+            'frame': hist,
+            'bars': bars,
+            # The segment into the last bar is its own item, so live trades redraw two points
+            'line': pg.PlotDataItem(dates[:-1], closes[:-1], pen=line_pen, name="Close"),
+            'live_line': pg.PlotDataItem(dates[-2:], closes[-2:], pen=line_pen),
+            'candles': None,
+            'overlays': [],
+            'support_lines': [],
+            'resistance_lines': [],
+            'peak_labels': [],
+            'range': None
+        }
+
+        try:
+            entry['candles'] = CandlestickSeriesItem(
+                bars, THEMES["Dark"]["positive"], THEMES["Dark"]["negative"], THEMES["Dark"]["border"]
+            )
+        except Exception as candle_error:
+            # If candlestick rendering fails, just log it and keep the line chart
+            logging.error(f"Candlestick rendering error: {candle_error}")
+            error_note = pg.TextItem(
+                text="Candlestick rendering failed - showing line chart only",
+                color=(255, 150, 50),
+                anchor=(0, 0)
+            )
+            error_note.setPos(dates[0], hist['High'].max())
+            entry['overlays'].append(error_note)
+
+        # Moving averages, skipping the NaN values from each rolling window
+        try:
+            for window, color in ((20, (255, 165, 0)), (50, (138, 43, 226))):
+                if len(hist) >= window:
+                    average = hist['Close'].rolling(window=window).mean().values[window - 1:]
+                    entry['overlays'].append(pg.PlotDataItem(
+                        dates[window - 1:], average, pen=pg.mkPen(color=color, width=1), name=f"MA{window}"
+                    ))
+        except Exception as ma_error:
+            logging.error(f"Moving average plotting error: {ma_error}")
+
+        try:
+            min_y = hist['Low'].min() * 0.98
+            max_y = hist['High'].max() * 1.02
+            entry['range'] = {'x': (dates[0], dates[-1]), 'y': (min_y, max_y)}
+        except Exception as range_error:
+            logging.error(f"Setting range error: {range_error}")
+        return entry
+
+    def _series_items(self, entry):
+        items = [entry['line'], entry['live_line']]
+        if entry['candles'] is not None:
+            items.append(entry['candles'])
+        return items + entry['overlays'] + entry['support_lines'] + entry['resistance_lines'] + entry['peak_labels']
+
+    def _detach_series(self):
+        """Take the shown series' items off the price plot; they stay built for reuse"""
+        if self.current_series is None:
+            return
+        for item in self._series_items(self.current_series):
+            self.removeItem(item)
+        self.current_series = None
+        self._set_pane_bars(None)
+
+    def _attach_series(self, entry):
+        """Show a built series in place of the current one"""
+        plot_item = self.getPlotItem()
+        if self.current_series is not None and self.current_series['line'] not in plot_item.items:
+            # The plot was cleared from outside (e.g. an error message); start from empty
+            plot_item.clear()
+            self.current_series = None
+            self.message_item = None
+        if entry is self.current_series:
+            return
+        self._detach_series()
+        self._clear_message()
+        for item in self._series_items(entry):
+            self.addItem(item)
+        self.current_series = entry
+
+        # Marker toggles act on the shown series' markers
+        self.support_lines = entry['support_lines']
+        self.resistance_lines = entry['resistance_lines']
+        self.peak_labels = entry['peak_labels']
+        for label in self.peak_labels:
+            label.setVisible(self.show_peaks and self.show_markers)
+        for line in self.support_lines + self.resistance_lines:
+            line.setVisible(self.show_support_resistance and self.show_markers)
+
+        self._set_pane_bars(entry['bars'])
+        if entry['range'] is not None:
+            self.original_range = entry['range']
+            self.setYRange(*entry['range']['y'])
+            self.setXRange(*entry['range']['x'])
+        else:
+            self.autoRange()
+
+    def _apply_chart_type(self):
+        """Show the line and/or candles of the shown series for the selected chart type"""
+        entry = self.current_series
+        if entry is None:
+            return
+        show_line = self.chart_type in ("Line", "Both") or entry['candles'] is None
+        entry['line'].setVisible(show_line)
+        entry['live_line'].setVisible(show_line)
+        if entry['candles'] is not None:
+            entry['candles'].setVisible(self.chart_type in ("Candlestick", "Both"))
+
+    def apply_trades(self, ticker, trades):
+        """
+        Fold streamed trades into the last bar of the shown series in place
+
+        Trades in the last bar's bucket (see bar_aggregator) update that bar;
+        later trades start a new bar. Only the last bar, the line segment into it and its
+        volume bar are redrawn; nothing is refetched or rebuilt.
+
+        Args:
+            ticker: Stock symbol the trades are for
+            trades: Aggregate from MarketStream ('open', 'high', 'low', 'close', 'volume', 'time')
+        """
+        entry = self.current_series
+        if entry is None or entry['ticker'] != ticker.upper():
+            return
+        bars = entry['bars']
+        start = bucket_start(trades['time'], entry['resolution'])
+        if not len(bars) or start < bars.times[-1]:
+            return
+
+        if start > bars.times[-1]:
+            bars.append(start, trades['open'], trades['high'], trades['low'], trades['close'], trades['volume'])
+            entry['line'].setData(bars.times[:-1], bars.closes[:-1])
+            for item in (entry['candles'], self.volume_item):
+                if item is not None:
+                    item.bar_added()
+            self._update_oscillator()
+        else:
+            bars.update_last(trades['high'], trades['low'], trades['close'], trades['volume'])
+            for item in (entry['candles'], self.volume_item):
+                if item is not None:
+                    item.bar_updated()
+        entry['live_line'].setData(bars.times[-2:], bars.closes[-2:])
+        self.crosshair.refresh(len(bars) - 1)
+
+    @timed("chart.update_chart")
     def update_chart(self, ticker, time_frame="3M", chart_type="Both"):
+        """
+        Show a ticker's candles for a timeframe, reusing loaded data and items
+
+        Candles come from the chart store, which only fetches what it does
+        not already hold. Items are rebuilt only when the store returns new
+        data for the (ticker, timeframe); a chart type change just shows or
+        hides the existing line and candles.
+        """
         try:
-            logging.info(f"Updating chart for {ticker} with {time_frame} timeframe and {chart_type} type")
-            
-            # Clear previous items
-            self.clear()
-            for line in self.support_lines + self.resistance_lines:
-                try:
-                    self.removeItem(line)
-                except Exception:
-                    pass  # Item might already be removed
-            for label in self.peak_labels:
-                try:
-                    self.removeItem(label)
-                except Exception:
-                    pass  # Item might already be removed
-                    
-            self.support_lines.clear()
-            self.resistance_lines.clear()
-            self.peak_labels.clear()
-            
-            # Create a simple message while loading
-            loading_text = pg.TextItem(text="Loading chart data... (this may take a moment due to rate limiting)", color=(200, 200, 200))
-            self.addItem(loading_text)
-            QApplication.processEvents()  # Update UI to show loading message
-            
+            logging.debug(f"Updating chart for {ticker} with {time_frame} timeframe and {chart_type} type", extra=SAMPLED)
+            self.chart_type = chart_type
+            key = (ticker.upper(), time_frame)
+
+            if not self.store.is_loaded(ticker, time_frame):
+                # Create a simple message while loading
+                self._show_message("Loading chart data... (this may take a moment due to rate limiting)", (200, 200, 200))
+                QApplication.processEvents()  # Update UI to show loading message
+
             # Try to get the stock data with error handling
             try:
-                # Use Finnhub to get chart data
-                stock_api = StockAPI()
-                hist = stock_api.get_chart_data(ticker, time_frame)
-                
-                if (hist.empty):
-                    self.clear()
-                    error_text = pg.TextItem(text=f"No data available for {ticker}", color=(255, 50, 50))
-                    self.addItem(error_text)
+                hist = self.store.get(ticker, time_frame)
+                if hist.empty:
+                    self._show_message(f"No data available for {ticker}", (255, 50, 50))
                     logging.warning(f"No historical data found for {ticker}")
                     return
-                
-                # Remove loading message
-                self.removeItem(loading_text)
-                
             except Exception as data_error:
-                self.clear()
-                error_text = pg.TextItem(text=f"Error fetching data: {str(data_error)}", color=(255, 50, 50))
-                self.addItem(error_text)
+                self._show_message(f"Error fetching data: {str(data_error)}", (255, 50, 50))
                 logging.error(f"Data fetch error: {data_error}")
                 return
-                
-            # Log data statistics
-            logging.info(f"Loaded data rows: {len(hist)}")
-            
-            # Convert index to timestamps for plotting
-            try:
-                dates = hist.index.astype('int64') // 10**9
-                closes = hist['Close'].values
-            except Exception as conversion_error:
-                self.clear()
-                error_text = pg.TextItem(text=f"Data conversion error: {str(conversion_error)}", color=(255, 50, 50))
-                self.addItem(error_text)
-                logging.error(f"Data conversion error: {conversion_error}")
-                return
-            
-            # Simple plot for all chart types - ensures we have a baseline
-            try:
-                self.plot(dates, closes, pen=pg.mkPen(THEMES["Dark"]["primary"], width=1.5), name="Close")
-            except Exception as plot_error:
-                self.clear()
-                error_text = pg.TextItem(text=f"Error plotting line: {str(plot_error)}", color=(255, 50, 50))
-                self.addItem(error_text)
-                logging.error(f"Basic plotting error: {plot_error}")
-                return
-                
-            # Plot specific chart type
-            if chart_type in ["Candlestick", "Both"] and len(hist) > 0:
+
+            entry = self.series.get(key)
+            if entry is None or entry['frame'] is not hist:
+                logging.debug(f"Building chart items for {len(hist)} rows")
                 try:
-                    # Try using a more efficient approach for many candles
-                    if len(hist) > 100:
-                        # For many candles, batch them into chunks
-                        for chunk_start in range(0, len(hist), 50):
-                            chunk_end = min(chunk_start + 50, len(hist))
-                            for i in range(chunk_start, chunk_end):
-                                # Create candlestick
-                                candlestick = CandleStickItem(
-                                    x=dates[i],
-                                    open=hist['Open'].iloc[i],
-                                    close=hist['Close'].iloc[i],
-                                    high=hist['High'].iloc[i],
-                                    low=hist['Low'].iloc[i],
-                                    brush=pg.mkBrush(THEMES["Dark"]["positive"]) if hist['Close'].iloc[i] >= hist['Open'].iloc[i] 
-                                        else pg.mkBrush(THEMES["Dark"]["negative"]),
-                                    pen=pg.mkPen(THEMES["Dark"]["border"])
-                                )
-                                self.addItem(candlestick)
-                            QApplication.processEvents()  # Update UI periodically during rendering
-                    else:
-                        # For fewer candles, add them all at once
-                        for i in range(len(hist)):
-                            candlestick = CandleStickItem(
-                                x=dates[i],
-                                open=hist['Open'].iloc[i],
-                                close=hist['Close'].iloc[i],
-                                high=hist['High'].iloc[i],
-                                low=hist['Low'].iloc[i],
-                                brush=pg.mkBrush(THEMES["Dark"]["positive"]) if hist['Close'].iloc[i] >= hist['Open'].iloc[i] 
-                                    else pg.mkBrush(THEMES["Dark"]["negative"]),
-                                pen=pg.mkPen(THEMES["Dark"]["border"])
-                            )
-                            self.addItem(candlestick)
-                except Exception as candle_error:
-                    # If candlestick rendering fails, just log it and continue with line chart
-                    logging.error(f"Candlestick rendering error: {candle_error}")
-                    
-                    # Add text indicator about candlestick failure
-                    error_note = pg.TextItem(
-                        text="Candlestick rendering failed - showing line chart only", 
-                        color=(255, 150, 50),
-                        anchor=(0, 0)
-                    )
-                    error_note.setPos(dates[0], hist['High'].max())
-                    self.addItem(error_note)
-            
-            # Try to add moving averages
-            try:
-                if len(hist) >= 20:
-                    ma20 = hist['Close'].rolling(window=20).mean()
-                    ma20_valid = ma20.dropna()
-                    if len(ma20_valid) > 0:
-                        ma20_dates = dates[19:]  # Skip NaN values from rolling window
-                        self.plot(ma20_dates, ma20_valid.values, 
-                               pen=pg.mkPen(color=(255, 165, 0), width=1), name="MA20")
-                        
-                if len(hist) >= 50:
-                    ma50 = hist['Close'].rolling(window=50).mean()
-                    ma50_valid = ma50.dropna()
-                    if len(ma50_valid) > 0:
-                        ma50_dates = dates[49:]  # Skip NaN values from rolling window
-                        self.plot(ma50_dates, ma50_valid.values, 
-                               pen=pg.mkPen(color=(138, 43, 226), width=1), name="MA50")
-            except Exception as ma_error:
-                logging.error(f"Moving average plotting error: {ma_error}")
-            
-            # Set range - with error handling
-            try:
-                min_y = hist['Low'].min() * 0.98
-                max_y = hist['High'].max() * 1.02
-                self.setYRange(min_y, max_y)
-                self.setXRange(dates[0], dates[-1])
-                
-                # Store original range for reset function
-                self.original_range = {
-                    'x': (dates[0], dates[-1]),
-                    'y': (min_y, max_y)
-                }
-            except Exception as range_error:
-                logging.error(f"Setting range error: {range_error}")
-                # Try to set a reasonable default range
-                self.autoRange()
-            
-            # Additional debug info
-            logging.info("Chart update completed successfully")
-            
+                    resolution = CHART_TIMEFRAMES.get(time_frame, CHART_TIMEFRAMES["3M"])[1]
+                    new_entry = self._build_series(ticker, hist, resolution)
+                except Exception as build_error:
+                    self._show_message(f"Data conversion error: {str(build_error)}", (255, 50, 50))
+                    logging.error(f"Data conversion error: {build_error}")
+                    return
+                if entry is not None and entry is self.current_series:
+                    self._detach_series()
+                entry = self.series[key] = new_entry
+
+            # Keep the most recently shown series, dropping the oldest
+            self.series.move_to_end(key)
+            while len(self.series) > CHART_CONFIG["max_series"]:
+                self.series.popitem(last=False)
+
+            self._attach_series(entry)
+            self._apply_chart_type()
+            logging.debug("Chart update completed successfully", extra=SAMPLED)
+
         except Exception as e:
             logging.exception(f"Error updating chart: {e}")
-            # Add error message to chart
-            self.clear()  # Clear any partial plotting
-            text = pg.TextItem(text=f"Error loading chart: {str(e)}", color=(255, 0, 0))
-            self.addItem(text)
+            # Replace any partial plotting with the error
+            self._show_message(f"Error loading chart: {str(e)}", (255, 0, 0))
 
 class StockOverview(QFrame):
     def __init__(self):
@@ -817,9 +949,11 @@ class AnalysisCard(QFrame):
     # Define a signal for maximizing the card with proper parameters
     maximize_signal = Signal(dict)
 
-    def __init__(self, title):
+    def __init__(self, title, content=None):
         super().__init__()
         self.title = title
+        # Widget shown under the header; a read-only QTextEdit unless given
+        self.content = content
         self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
         self.setStyleSheet("""
             QFrame {
@@ -877,8 +1011,9 @@ class AnalysisCard(QFrame):
         header_layout.addWidget(max_button)
         
         # Content text edit
-        self.content = QTextEdit()
-        self.content.setReadOnly(True)
+        if self.content is None:
+            self.content = QTextEdit()
+            self.content.setReadOnly(True)
         
         # Add to main layout
         layout.addWidget(header)
@@ -1082,6 +1217,122 @@ class RecommendationWidget(QFrame):
         # Minimal placeholder implementation
         pass
 
+class TickerSuggestionModel(QAbstractListModel):
+    """List model of (symbol, company name) suggestions for TickerCompleter"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.suggestions = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.suggestions)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        symbol, name = self.suggestions[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{symbol:<6}  {name.title()}" if name else symbol
+        if role == Qt.EditRole:
+            return symbol
+        return None
+
+    def set_suggestions(self, suggestions):
+        self.beginResetModel()
+        self.suggestions = suggestions
+        self.endResetModel()
+
+
+class TickerCompleter(QCompleter):
+    """
+    Type-ahead ticker suggestions served from the local symbol index.
+
+    Matches are ranked by match quality (exact symbol, symbol prefix, company
+    name word), how often the ticker was analyzed and how recently. Usage is
+    persisted in QSettings. Nothing here makes a network call.
+    """
+    MAX_SUGGESTIONS = 8
+    RECENCY_HALF_LIFE = 7 * 86400  # Seconds for the recency boost to halve
+
+    def __init__(self, line_edit, settings=None):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.settings = settings or QSettings("Stoxalotl", "Preferences")
+        self.usage = self._load_usage()
+        self.well_known = set(COMMON_MISSPELLINGS.values())
+
+        self.suggestion_model = TickerSuggestionModel(self)
+        self.setModel(self.suggestion_model)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCompletionRole(Qt.EditRole)
+        self.setMaxVisibleItems(self.MAX_SUGGESTIONS)
+        self.popup().setMinimumWidth(320)
+
+        line_edit.setCompleter(self)
+        line_edit.textEdited.connect(self._update_suggestions)
+
+    def _load_usage(self):
+        try:
+            return json.loads(self.settings.value("TickerUsage", "{}"))
+        except (TypeError, ValueError):
+            return {}
+
+    def record_use(self, ticker):
+        """Count an analysis of ticker towards its popularity and recency"""
+        count, _ = self.usage.get(ticker, (0, 0))
+        self.usage[ticker] = (count + 1, time.time())
+        self.settings.setValue("TickerUsage", json.dumps(self.usage))
+
+    def suggest(self, text):
+        """
+        Rank suggestions for text
+
+        Returns:
+            list: (symbol, company name) pairs, best first
+        """
+        query = text.strip().upper()
+        if not query:
+            return []
+
+        candidates = {}
+        # The index may still be building in the background; usage and the
+        # well known tickers keep the dropdown useful until it is ready
+        index = get_symbol_index(build=False)
+        if index is not None:
+            for symbol, name in index.search(query, limit=50):
+                candidates[symbol] = name
+        for symbol in list(self.usage) + list(self.well_known):
+            if symbol.startswith(query) and symbol not in candidates:
+                candidates[symbol] = index.names.get(symbol, "") if index is not None else ""
+
+        now = time.time()
+
+        def score(symbol):
+            if symbol == query:
+                value = 100.0
+            elif symbol.startswith(query):
+                value = 60.0 - len(symbol)
+            else:
+                value = 30.0  # Company name match
+            count, last_used = self.usage.get(symbol, (0, 0))
+            if count:
+                value += 8 * math.log1p(count)
+                value += 20 * 0.5 ** ((now - last_used) / self.RECENCY_HALF_LIFE)
+            if symbol in self.well_known:
+                value += 5
+            return value
+
+        ranked = sorted(candidates, key=lambda s: (-score(s), s))
+        return [(symbol, candidates[symbol]) for symbol in ranked[:self.MAX_SUGGESTIONS]]
+
+    def _update_suggestions(self, text):
+        suggestions = self.suggest(text)
+        self.suggestion_model.set_suggestions(suggestions)
+        if suggestions:
+            self.complete()
+        else:
+            self.popup().hide()
+
+
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
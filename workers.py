@@ -1,67 +1,76 @@
 # workers.py
 from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
-from tradingview_ta import TA_Handler, Interval
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import time
 import logging
-from config import COLORS
-import yfinance as yf
-class StockWorkerSignals(QObject):
-    finished = Signal(dict)  # Processed stock data
-    metrics_updated = Signal(list)  # Formatted metrics list
-    error = Signal(str)  # Error messages
-class StockWorker(QRunnable):
-    def __init__(self, ticker: str):
+import threading
+from config import COLOR_PALETTES, POLLER_CONFIG
+
+COLORS = COLOR_PALETTES["Dark"]
+
+# Signals of queued/running tasks, kept alive until their result is delivered
+_pending_tasks = set()
+class TaskSignals(QObject):
+    """
+    Result signals for TaskWorker. They are always emitted in the thread that
+    created the worker, so any callable (lambdas included) can be connected.
+    """
+    finished = Signal(object)  # Return value of the task
+    error = Signal(str)  # Error message if the task raised
+    # Emitted from the pool thread; queued over to this object's thread
+    _result = Signal(object)
+    _failure = Signal(str)
+    def __init__(self):
         super().__init__()
-        self.signals = StockWorkerSignals()
-        self.ticker = ticker
-        self._active = True
-        self.exchange = "NASDAQ"
-        self.screener = "america"
-        self.interval = Interval.INTERVAL_1_DAY
-        
-        # Configure automatic signal connection
+        self._result.connect(self._deliver_result)
+        self._failure.connect(self._deliver_failure)
+        _pending_tasks.add(self)
+    def _deliver_result(self, result):
+        _pending_tasks.discard(self)
+        self.finished.emit(result)
+    def _deliver_failure(self, message):
+        _pending_tasks.discard(self)
+        self.error.emit(message)
+class TaskWorker(QRunnable):
+    """Runs a single blocking call on the global thread pool and reports back via signals"""
+    def __init__(self, func: Callable, *args, **kwargs):
+        super().__init__()
+        self.signals = TaskSignals()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
         self.setAutoDelete(True)
     def run(self):
-        """Main worker execution loop"""
-        while self._active:
-            try:
-                start_time = time.time()
-                
-                # Get technical analysis data
-                analysis = self._get_technical_analysis()
-                if not analysis:
-                    continue
-                
-                # Process and emit data
-                processed_data = self._process_analysis(analysis)
-                self.signals.finished.emit(processed_data)
-                self.signals.metrics_updated.emit(processed_data['metrics'])
-                
-                # Maintain 2-second interval
-                elapsed = time.time() - start_time
-                sleep_time = max(2.0 - elapsed, 0)
-                time.sleep(sleep_time)
-                
-            except Exception as e:
-                self.signals.error.emit(f"Worker error: {str(e)}")
-                time.sleep(5)  # Backoff on errors
-    def stop(self):
-        """Gracefully stop the worker"""
-        self._active = False
-    def _get_technical_analysis(self) -> Optional[Dict]:
-        """Fetch TA data from TradingView"""
         try:
-            handler = TA_Handler(
-                symbol=self.ticker,
-                screener=self.screener,
-                exchange=self.exchange,
-                interval=self.interval
-            )
-            return handler.get_analysis()
+            result = self.func(*self.args, **self.kwargs)
         except Exception as e:
-            self.signals.error.emit(f"TA fetch failed: {str(e)}")
-            return None
+            logging.error(f"Background task {getattr(self.func, '__name__', self.func)} failed: {e}")
+            self.signals._failure.emit(str(e))
+            return
+        self.signals._result.emit(result)
+def run_in_background(func: Callable, *args, on_result: Callable = None, on_error: Callable = None, **kwargs) -> TaskWorker:
+    """
+    Run func(*args, **kwargs) on the global thread pool.
+
+    Args:
+        func: Blocking callable (network or disk work; must not touch widgets)
+        on_result: Slot called with the return value in the GUI thread
+        on_error: Slot called with the error message in the GUI thread
+
+    Returns:
+        TaskWorker: The queued worker
+    """
+    worker = TaskWorker(func, *args, **kwargs)
+    if on_result:
+        worker.signals.finished.connect(on_result)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+class AnalysisProcessor:
+    """Turns a TradingView analysis into the values and colors shown in the UI"""
+    def process(self, analysis) -> Dict:
+        return self._process_analysis(analysis)
     def _process_analysis(self, analysis: Dict) -> Dict:
         """Convert raw analysis to processed data"""
         indicators = analysis.indicators
@@ -153,20 +162,192 @@ class StockWorker(QRunnable):
         if k and d:
             return f"{k:.2f}/{d:.2f}"
         return "N/A"
+class MarketDataPoller(QObject):
+    """
+    Single polling service for live market data.
+
+    Widgets subscribe to tickers; one background thread refreshes every
+    subscribed symbol per round with batched TradingView requests that go
+    through the rate-limited provider queue, and fans the results out with
+    quote_updated. The time between rounds follows the market session
+    reported by fetch_data.get_market_status.
+    """
+    quote_updated = Signal(str, dict)  # Ticker, processed data with Finnhub-style quote fields
+    round_finished = Signal(dict)  # Ticker -> processed data for the whole round
+    session_changed = Signal(str)  # "regular", "pre-market", "post-market", "closed" or "unknown"
+    error = Signal(str)
+    # Emitted from the polling thread; queued over to this object's thread
+    _round_ready = Signal(dict)
+    _session_ready = Signal(str)
+    _failure = Signal(str)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.processor = AnalysisProcessor()
+        self.session = "unknown"
+        self.latest: Dict[str, Dict] = {}  # Last data per ticker, for late subscribers
+        self._subscriptions: Dict[str, int] = {}  # Ticker -> subscriber count
+        self._exchanges: Dict[str, str] = {}  # Ticker -> exchange it was found on
+        self._session_checked = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._round_ready.connect(self._deliver_round)
+        self._session_ready.connect(self._deliver_session)
+        self._failure.connect(self.error)
+    def subscribe(self, ticker: str) -> Optional[Dict]:
+        """
+        Add a subscriber for ticker and start polling if needed.
+
+        Returns:
+            Optional[Dict]: Last known data for the ticker, if any
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            count = self._subscriptions.get(ticker, 0)
+            self._subscriptions[ticker] = count + 1
+        if count == 0:
+            # Poll the new symbol now instead of waiting out the interval
+            self._wake.set()
+        self._start()
+        return self.latest.get(ticker)
+    def unsubscribe(self, ticker: str):
+        """Remove one subscriber; the ticker is dropped when none are left"""
+        ticker = ticker.upper()
+        with self._lock:
+            count = self._subscriptions.get(ticker, 0) - 1
+            if count > 0:
+                self._subscriptions[ticker] = count
+            else:
+                self._subscriptions.pop(ticker, None)
+    def subscriptions(self) -> List[str]:
+        with self._lock:
+            return list(self._subscriptions)
+    @property
+    def interval(self) -> float:
+        """Seconds between polling rounds for the current market session"""
+        intervals = POLLER_CONFIG["intervals"]
+        return intervals.get(self.session, intervals["unknown"])
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MarketDataPoller", daemon=True)
+        self._thread.start()
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._refresh_session()
+            tickers = self.subscriptions()
+            if tickers:
+                try:
+                    results = self._poll_round(tickers)
+                    if results:
+                        self._round_ready.emit(results)
+                except Exception as e:
+                    logging.error(f"Market data round failed: {e}")
+                    self._failure.emit(str(e))
+            self._wake.wait(self.interval)
+            self._wake.clear()
+    def _refresh_session(self):
+        """Re-check the market session every POLLER_CONFIG['status_refresh'] seconds"""
+        if time.time() - self._session_checked < POLLER_CONFIG["status_refresh"]:
+            return
+        self._session_checked = time.time()
+        try:
+            from fetch_data import get_market_status
+            status = get_market_status()
+            session = "regular" if status.get("isOpen") else (status.get("session") or "closed")
+        except Exception as e:
+            logging.warning(f"Could not get market status: {e}")
+            session = "unknown"
+        if session != self.session:
+            self.session = session
+            logging.info(f"Market session is {session}; polling every {self.interval}s")
+            self._session_ready.emit(session)
+    def _poll_round(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch all tickers with as few TradingView requests as the batch size allows"""
+        from tradingview_ta import get_multiple_analysis
+        from rate_limiter import execute_tradingview_request
+
+        symbols = []
+        for ticker in tickers:
+            exchange = self._exchanges.get(ticker)
+            symbols += [f"{e}:{ticker}" for e in ([exchange] if exchange else POLLER_CONFIG["exchanges"])]
+
+        results = {}
+        batch_size = POLLER_CONFIG["symbols_per_request"]
+        for i in range(0, len(symbols), batch_size):
+            analyses = execute_tradingview_request(
+                get_multiple_analysis,
+                screener=POLLER_CONFIG["screener"],
+                interval=POLLER_CONFIG["interval"],
+                symbols=symbols[i:i + batch_size],
+                timeout=10
+            )
+            for symbol, analysis in analyses.items():
+                if analysis is None:
+                    continue
+                exchange, ticker = symbol.split(":", 1)
+                data = self._build_quote(analysis)
+                if data and ticker not in results:
+                    self._exchanges.setdefault(ticker, exchange)
+                    results[ticker] = data
+        return results
+    def _build_quote(self, analysis) -> Optional[Dict]:
+        """Processed analysis plus the quote fields StockAPI.get_stock returns"""
+        indicators = analysis.indicators
+        close = indicators.get("close")
+        if close is None:
+            return None
+        change_percent = indicators.get("change")
+        if change_percent is not None:
+            prev_close = close / (1 + change_percent / 100)
+        else:
+            prev_close = indicators.get("open") or close
+            change_percent = (close - prev_close) / prev_close * 100 if prev_close else 0
+        data = self.processor.process(analysis)
+        data.update({
+            'c': close,
+            'pc': prev_close,
+            'd': close - prev_close,
+            'dp': change_percent,
+            'h': indicators.get("high"),
+            'l': indicators.get("low"),
+            'o': indicators.get("open"),
+            't': int(time.time())
+        })
+        return data
+    def _deliver_round(self, results: Dict):
+        subscribed = set(self.subscriptions())
+        for ticker, data in results.items():
+            self.latest[ticker] = data
+            if ticker in subscribed:
+                self.quote_updated.emit(ticker, data)
+        self.round_finished.emit(results)
+    def _deliver_session(self, session: str):
+        self.session_changed.emit(session)
 class WorkerManager:
-    def __init__(self):
-        self.thread_pool = QThreadPool.globalInstance()
-        self.active_workers = {}
+    """Keeps the old per-ticker worker API on top of the shared poller"""
+    def __init__(self, poller: MarketDataPoller = None):
+        self.poller = poller or MarketDataPoller()
+        self.active_workers = set()
     def start_worker(self, ticker: str):
-        """Start a new worker for a ticker"""
+        """Start receiving updates for a ticker"""
+        ticker = ticker.upper()
         if ticker in self.active_workers:
             return
-            
-        worker = StockWorker(ticker)
-        self.active_workers[ticker] = worker
-        self.thread_pool.start(worker)
+        self.active_workers.add(ticker)
+        self.poller.subscribe(ticker)
     def stop_worker(self, ticker: str):
-        """Stop a running worker"""
+        """Stop receiving updates for a ticker"""
+        ticker = ticker.upper()
         if ticker in self.active_workers:
-            worker = self.active_workers.pop(ticker)
-            worker.stop()
\ No newline at end of file
+            self.active_workers.discard(ticker)
+            self.poller.unsubscribe(ticker)